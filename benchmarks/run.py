@@ -0,0 +1,167 @@
+"""
+Benchmark frame time GameScene headless untuk skenario tetap (lihat scenarios.py).
+
+    python benchmarks/run.py                      # semua skenario, bandingkan dengan baseline
+    python benchmarks/run.py orcs_3000 forest     # skenario tertentu
+    python benchmarks/run.py --update-baseline    # simpan hasil sebagai baseline
+
+Baseline bergantung mesin, jadi tidak di-commit: buat di mesin yang sama sebelum mengukur optimasi.
+Exit code 1 jika p50/p95 update/draw lebih lambat dari baseline melebihi --tolerance.
+"""
+import sys
+import os
+import json
+import time
+import random
+import argparse
+import tracemalloc
+
+# Root workspace di python path (src/ dan benchmarks/)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+METRICS = ('update', 'draw')
+
+def percentiles(values):
+    ordered = sorted(values)
+    if not ordered:
+        return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0}
+    pick = lambda q: ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+    return {'p50': pick(0.50), 'p95': pick(0.95), 'p99': pick(0.99)}
+
+def run_scenario(game, scenario, args):
+    import numpy as np
+    from src.core.input import InputManager
+
+    # Seed sebelum on_enter agar dunia, spawn, dan RNG skenario identik antar run
+    random.seed(args.seed)
+    np.random.seed(args.seed)
+    game.selected_character = scenario.character
+    scene = game.start_headless(scenario.input_source(game.scenes['game']))
+    scenario.setup(game, scene)
+
+    def frame():
+        scenario.step(scene)
+        update = game.step_headless(scene, args.dt)
+        start = time.perf_counter()
+        scene.draw()
+        return update, time.perf_counter() - start
+
+    try:
+        for _ in range(args.warmup):
+            frame()
+
+        timings = {metric: [] for metric in METRICS}
+        for _ in range(args.frames):
+            update, draw = frame()
+            timings['update'].append(update * 1000)
+            timings['draw'].append(draw * 1000)
+
+        # Alokasi diukur terpisah: tracemalloc memperlambat setiap alokasi dan merusak timing
+        transient = []
+        tracemalloc.start()
+        start_current, _ = tracemalloc.get_traced_memory()
+        for _ in range(args.alloc_frames):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            frame()
+            _, peak = tracemalloc.get_traced_memory()
+            transient.append((peak - before) / 1024)
+        end_current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        scenario.teardown(game, scene)
+        InputManager.set_source(None)
+
+    result = {metric: percentiles(values) for metric, values in timings.items()}
+    result['alloc_kb'] = percentiles(transient)
+    result['retained_kb'] = (end_current - start_current) / 1024
+    result['enemies'] = len(scene.horde)
+    return result
+
+def compare(results, baseline, tolerance):
+    """Baris regresi: p50/p95 update/draw yang lebih lambat dari baseline * (1 + tolerance)."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for metric in METRICS:
+            for q in ('p50', 'p95'):
+                old, new = base[metric][q], result[metric][q]
+                if old > 0 and new > old * (1 + tolerance):
+                    regressions.append(f"{name} {metric} {q}: {old:.2f}ms -> {new:.2f}ms (+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+def report(results, baseline):
+    header = f"{'scenario':<12} {'update p50/p95/p99 ms':>24} {'draw p50/p95/p99 ms':>24} {'alloc p50/p95 KB':>18} {'enemies':>8}"
+    print(header)
+    print('-' * len(header))
+    for name, r in results.items():
+        update = '{p50:.2f}/{p95:.2f}/{p99:.2f}'.format(**r['update'])
+        draw = '{p50:.2f}/{p95:.2f}/{p99:.2f}'.format(**r['draw'])
+        alloc = '{p50:.0f}/{p95:.0f}'.format(**r['alloc_kb'])
+        line = f"{name:<12} {update:>24} {draw:>24} {alloc:>18} {r['enemies']:>8}"
+        base = baseline.get(name)
+        if base:
+            delta = (r['update']['p50'] / base['update']['p50'] - 1) * 100 if base['update']['p50'] else 0.0
+            line += f"   update p50 {delta:+.0f}% vs baseline"
+        print(line)
+
+def main():
+    from benchmarks.scenarios import SCENARIOS
+
+    parser = argparse.ArgumentParser(description="Survivors frame-time benchmarks (headless GameScene)")
+    parser.add_argument('scenarios', nargs='*', help=f"Scenarios to run (default: all). Available: {', '.join(SCENARIOS)}")
+    parser.add_argument('--frames', type=int, default=600, help="Measured frames per scenario")
+    parser.add_argument('--warmup', type=int, default=60, help="Unmeasured frames before measuring")
+    parser.add_argument('--alloc-frames', type=int, default=60, help="Frames measured with tracemalloc after the timing pass")
+    parser.add_argument('--dt', type=float, default=1 / 60, help="Simulation step (seconds)")
+    parser.add_argument('--seed', type=int, default=1234, help="RNG seed")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline JSON path")
+    parser.add_argument('--update-baseline', action='store_true', help="Write these results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.15, help="Allowed slowdown vs baseline before failing (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario: {', '.join(unknown)}")
+
+    # Driver dummy harus diset sebelum pygame.init()
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    os.chdir(ROOT) # Path aset relatif terhadap root
+    from src.main import GameManager
+    game = GameManager(headless=True)
+
+    results = {}
+    for name in args.scenarios or SCENARIOS:
+        print(f"[BENCH] {name}: {SCENARIOS[name].description}")
+        results[name] = run_scenario(game, SCENARIOS[name], args)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print()
+    report(results, baseline)
+
+    if args.update_baseline:
+        baseline.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"\nBaseline updated: {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\nREGRESSIONS:")
+        for line in regressions:
+            print("  " + line)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+import random
+import threading
+import time
+import math
+
+from src.core.input import ScriptedInput
+from src.settings import BIOME_SCALE
+
+class Scenario:
+    """
+    Skenario benchmark: setup dunia sebelum pengukuran, step dipanggil tiap frame
+    sebelum simulasi, teardown setelah selesai. RNG global sudah diseed oleh runner.
+    """
+    name = ''
+    description = ''
+    character = 'adventurer'
+    enemies = 0
+
+    def input_source(self, scene):
+        # Default: pemain diam di tempat
+        return ScriptedInput([])
+
+    def setup(self, game, scene):
+        make_immortal(scene.player)
+        preload_chunks(scene)
+        spawn_ring(scene, self.enemies)
+
+    def step(self, scene):
+        pass
+
+    def teardown(self, game, scene):
+        pass
+
+# --- Helper -----------------------------------------------------------
+
+def make_immortal(player):
+    # Pemain tidak boleh mati (reset kematian membunuh semua musuh dan merusak pengukuran)
+    player.max_health = player.health = 10 ** 9
+
+def preload_chunks(scene):
+    # Muat semua chunk di sekitar pemain sekarang, bukan satu per frame selama pengukuran
+    manager = scene.chunk_manager
+    manager.update(scene.player.pos)
+    manager.load_pending()
+
+def spawn_ring(scene, count, inner=400, outer=1200):
+    center = scene.player.hitbox.center
+    for _ in range(count):
+        angle = random.uniform(0, 2 * math.pi)
+        distance = random.uniform(inner, outer)
+        pos = (center[0] + math.cos(angle) * distance, center[1] + math.sin(angle) * distance)
+        scene.horde.spawn(pos, 'orc', 1.0)
+
+def teleport(player, center):
+    player.hitbox.center = center
+    player._sync_pos_with_hitbox()
+    player._sync_visuals()
+
+# --- Skenario ---------------------------------------------------------
+
+class OrcSwarm(Scenario):
+    description = "orc mengejar pemain yang diam"
+
+    def __init__(self, enemies):
+        self.enemies = enemies
+        self.name = f'orcs_{enemies}'
+
+class FireballBuild(Scenario):
+    name = 'fireball'
+    description = "build fireball penuh (8 proyektil, cooldown pendek) melawan 1000 orc"
+    character = 'female'
+    enemies = 1000
+
+    def setup(self, game, scene):
+        fireball = scene.player.weapons['fireball']
+        fireball['projectile_count'] = 8
+        fireball['cooldown'] = 150
+        super().setup(game, scene)
+
+class DenseForest(Scenario):
+    name = 'forest'
+    description = "pemain berputar di region hutan lebat dengan 300 orc"
+    enemies = 300
+
+    def input_source(self, scene):
+        return ScriptedInput([(60, {'RIGHT'}), (60, {'DOWN'}), (60, {'LEFT'}), (60, {'UP'})])
+
+    def setup(self, game, scene):
+        teleport(scene.player, self.forest_center(scene.chunk_manager))
+        super().setup(game, scene)
+
+    @staticmethod
+    def forest_center(chunk_manager, search=16):
+        # Region hutan dengan tetangga hutan terbanyak (deterministik, terdekat ke origin jika seri)
+        def forest(bx, by):
+            return chunk_manager.is_forest(bx * BIOME_SCALE, by * BIOME_SCALE)
+
+        best = None
+        for bx in range(-search, search + 1):
+            for by in range(-search, search + 1):
+                if not forest(bx, by):
+                    continue
+                neighbours = sum(forest(bx + dx, by + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1))
+                score = (-neighbours, abs(bx) + abs(by), bx, by)
+                if best is None or score < best:
+                    best = score
+        bx, by = best[2:] if best else (0, 0)
+        return ((bx + 0.5) * BIOME_SCALE * chunk_manager.tile_size, (by + 0.5) * BIOME_SCALE * chunk_manager.tile_size)
+
+class NetworkSession(Scenario):
+    name = 'network_4'
+    description = "sesi 4 client lewat server loopback (1 host + 3 bot), 300 orc"
+    enemies = 300
+    bots = 3
+
+    def setup(self, game, scene):
+        from src.network.server import Server
+        from src.network.client import NetworkClient
+
+        self.server = Server(host='127.0.0.1', port=0)
+        threading.Thread(target=self.server.start, daemon=True).start()
+
+        # Scene terhubung pertama agar menjadi host (yang menjalankan spawn)
+        self.clients = []
+        for _ in range(1 + self.bots):
+            client = NetworkClient('127.0.0.1', self.server.port)
+            if not client.connect():
+                raise RuntimeError("network_4: gagal terhubung ke server loopback")
+            self.clients.append(client)
+        game.network_client = self.clients[0]
+        self.frame = 0
+
+        # Tunggu sampai semua bot terlihat oleh host
+        deadline = time.perf_counter() + 5.0
+        while len(game.network_client.other_players) < self.bots and time.perf_counter() < deadline:
+            self.step(scene)
+            time.sleep(1 / 30)
+        super().setup(game, scene)
+
+    def step(self, scene):
+        # Bot mengitari pemain host
+        self.frame += 1
+        center = scene.player.pos
+        for n, client in enumerate(self.clients[1:]):
+            angle = self.frame * 0.02 + n * 2 * math.pi / self.bots
+            pos = (center.x + math.cos(angle) * 250, center.y + math.sin(angle) * 250)
+            client.send_state({'pos': pos, 'status': 'run_down', 'char_type': 'adventurer'})
+            with client.lock:
+                client.events.clear()
+
+    def teardown(self, game, scene):
+        for client in self.clients:
+            client.disconnect()
+        self.server.stop()
+        game.network_client = None
+
+SCENARIOS = {scenario.name: scenario for scenario in (
+    OrcSwarm(300),
+    OrcSwarm(1000),
+    OrcSwarm(3000),
+    FireballBuild(),
+    DenseForest(),
+    NetworkSession(),
+)}
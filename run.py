@@ -1,11 +1,53 @@
 import sys
 import os
+import argparse
 
 # Ensure the workspace root is in the python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from src.main import GameManager
+def run_headless(args):
+    # Driver dummy harus diset sebelum pygame.init()
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+    import random
+    from src.main import GameManager
+    from src.core.input import BotInput, ScriptedInput
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    game = GameManager(headless=True)
+    game.selected_character = args.character
+    scene = game.scenes['game']
+    if args.input == 'idle':
+        source = ScriptedInput([])
+    elif args.input == 'circle':
+        source = ScriptedInput([(60, {'RIGHT'}), (60, {'DOWN'}), (60, {'LEFT'}), (60, {'UP'})])
+    else:
+        source = BotInput(scene, seed=args.seed)
+
+    times = sorted(game.run_headless(args.frames, input_source=source, realtime=args.realtime))
+    if times:
+        p50 = times[len(times) // 2] * 1000
+        p95 = times[min(len(times) - 1, int(len(times) * 0.95))] * 1000
+        player = scene.player
+        print(f"frames {len(times)}  update p50 {p50:.2f}ms p95 {p95:.2f}ms  "
+              f"enemies {len(scene.horde)}  level {player.level}  hp {player.health:.0f}")
 
 if __name__ == "__main__":
-    game = GameManager()
-    game.run()
+    parser = argparse.ArgumentParser(description="Survivors")
+    parser.add_argument('--headless', action='store_true', help="Simulate GameScene without a window, OpenGL or rendering")
+    parser.add_argument('--frames', type=int, default=3600, help="Headless: number of simulation frames")
+    parser.add_argument('--input', choices=('bot', 'idle', 'circle'), default='bot', help="Headless: input source")
+    parser.add_argument('--character', default='adventurer', help="Headless: character id")
+    parser.add_argument('--realtime', action='store_true', help="Headless: pace frames to wall clock instead of running as fast as possible")
+    parser.add_argument('--seed', type=int, default=None, help="Headless: RNG seed")
+    args = parser.parse_args()
+
+    if args.headless:
+        run_headless(args)
+    else:
+        from src.main import GameManager
+        game = GameManager()
+        game.run()
@@ -1,6 +1,41 @@
+import bisect
 import pygame
 from .settings import *
 
+# Render flags, computed once per sprite class (see _render_flags)
+CASTS_SHADOW = 1 # Universal shadow under the sprite (characters)
+STATIC = 2 # Never moves: culled through a grid instead of scanned every frame
+BATCH_DRAW = 4 # Draws itself via draw(surface, offset) (particle emitters, chunk floors)
+HITBOX_POINTS = 8 # Debug view draws its hitbox polygon
+DYNAMIC_IMAGE = 16 # image pixels are redrawn in place (a GPU target must re-upload them)
+
+STATIC_CELL = CHUNK_SIZE * TILE_SIZE # Static grid cell (one chunk)
+
+_CLASS_FLAGS = {}
+
+def _render_flags(cls):
+    flags = _CLASS_FLAGS.get(cls)
+    if flags is None:
+        from .entities.player import Player
+        from .entities.enemy import Enemy
+        from .entities.remote_player import RemotePlayer
+        flags = 0
+        if issubclass(cls, (Player, Enemy, RemotePlayer)):
+            flags |= CASTS_SHADOW
+        if getattr(cls, 'render_static', False):
+            flags |= STATIC
+        if callable(getattr(cls, 'draw', None)):
+            flags |= BATCH_DRAW
+        if hasattr(cls, 'get_world_hitbox_points'):
+            flags |= HITBOX_POINTS
+        if getattr(cls, 'dynamic_image', False):
+            flags |= DYNAMIC_IMAGE
+        _CLASS_FLAGS[cls] = flags
+    return flags
+
+def _depth(sprite):
+    return (getattr(sprite, 'z_layer', 0), sprite.rect.bottom)
+
 class CameraGroup(pygame.sprite.Group):
     def __init__(self, virtual_surface):
         super().__init__()
@@ -8,6 +43,18 @@ class CameraGroup(pygame.sprite.Group):
         self.half_width = self.virtual_surface.get_size()[0] // 2
         self.half_height = self.virtual_surface.get_size()[1] // 2
         self.offset = pygame.math.Vector2()
+
+        # Render lists: static sprites in per-cell depth-sorted grids (floors separate, never y-sorted),
+        # dynamic sprites in one list kept in last frame's draw order
+        self._floor_cells = {}
+        self._object_cells = {}
+        self._static_cell = {} # sprite -> (grid, cell key)
+        self._static_margin = 0
+        self._pending_static = []
+        self._dynamic = []
+        self._dynamic_set = set()
+        self._dynamic_dirty = False
+        self.visible_count = 0
         
         # Asset Bayangan Universal
         import os
@@ -47,11 +94,88 @@ class CameraGroup(pygame.sprite.Group):
             #    self.offset.x += (target_x - self.offset.x) * 0.1 * dt * 60
             #    self.offset.y += (target_y - self.offset.y) * 0.1 * dt * 60
 
-    def custom_draw(self):
+    # --- Render lists ---------------------------------------------------
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        sprite.render_flags = _render_flags(type(sprite))
+        if sprite.render_flags & STATIC:
+            # Sprites join their groups before setting rect/z_layer: index on the next draw
+            self._pending_static.append(sprite)
+        elif sprite not in self._dynamic_set:
+            self._dynamic.append(sprite)
+            self._dynamic_set.add(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        if sprite.render_flags & STATIC:
+            cell = self._static_cell.pop(sprite, None)
+            if cell is not None:
+                grid, key = cell
+                grid[key].remove(sprite)
+                if not grid[key]:
+                    del grid[key]
+        else:
+            # Dropped from the dynamic list lazily (pooled sprites are often re-added right away)
+            self._dynamic_dirty = True
+
+    def _index_static(self):
+        for sprite in self._pending_static:
+            if sprite not in self.spritedict or sprite in self._static_cell:
+                continue
+            rect = sprite.rect
+            grid = self._floor_cells if getattr(sprite, 'z_layer', 0) < 0 else self._object_cells
+            key = (rect.left // STATIC_CELL, rect.top // STATIC_CELL)
+            # Each cell keeps its sprites in depth order (static keys never change)
+            bisect.insort(grid.setdefault(key, []), sprite, key=_depth)
+            self._static_cell[sprite] = (grid, key)
+            self._static_margin = max(self._static_margin, rect.width, rect.height)
+        self._pending_static.clear()
+
+    def _query_static(self, grid, view_rect):
+        # Sprites are filed under the cell of their top-left corner, so widen the query up/left by the largest static size
+        left = (view_rect.left - self._static_margin) // STATIC_CELL
+        top = (view_rect.top - self._static_margin) // STATIC_CELL
+        right = view_rect.right // STATIC_CELL
+        bottom = view_rect.bottom // STATIC_CELL
+        colliderect = view_rect.colliderect
+        visible = []
+        for cy in range(top, bottom + 1):
+            for cx in range(left, right + 1):
+                cell = grid.get((cx, cy))
+                if cell:
+                    visible += [s for s in cell if colliderect(s.rect)]
+        return visible
+
+    def _cull_dynamic(self, view_rect):
+        if self._dynamic_dirty:
+            spritedict = self.spritedict
+            self._dynamic = [s for s in self._dynamic if s in spritedict]
+            self._dynamic_set = set(self._dynamic)
+            self._dynamic_dirty = False
+
+        dynamic = self._dynamic
+        colliderect = view_rect.colliderect
+        slots = [i for i, s in enumerate(dynamic) if colliderect(s.rect)]
+        visible = [dynamic[i] for i in slots]
+        # Nearly sorted from last frame, so timsort runs in ~linear time
+        visible.sort(key=_depth)
+        # Write the sorted order back into the same slots: next frame starts from this order
+        for i, sprite in zip(slots, visible):
+            dynamic[i] = sprite
+        return visible
+
+    def custom_draw(self, render_offsets=None, target=None, overlay=None):
+        # render_offsets: {sprite: (dx, dy)} interpolation between the last two simulation steps
+        # target: where sprites go (default virtual_surface; a SpriteBatch records them for the GPU)
+        # overlay: where debug shapes and the crosshair go (default virtual_surface)
+        render_offsets = render_offsets or {}
+
         # FORCE UPDATE OFFSET HERE to Start Fix
         if hasattr(self, 'target') and self.target:
-             target_x = self.target.rect.centerx - self.half_width
-             target_y = self.target.rect.centery - self.half_height
+             target_dx, target_dy = render_offsets.get(self.target, (0, 0))
+             target_x = self.target.rect.centerx + target_dx - self.half_width
+             target_y = self.target.rect.centery + target_dy - self.half_height
              self.offset.x = target_x
              self.offset.y = target_y
 
@@ -59,70 +183,81 @@ class CameraGroup(pygame.sprite.Group):
         view_rect = pygame.Rect(self.offset.x, self.offset.y, self.virtual_surface.get_width(), self.virtual_surface.get_height())
         
         # 1. Cull & Sort
-        # Only process sprites within or touching the camera view
-        visible_sprites = [s for s in self.sprites() if view_rect.colliderect(s.rect)]
-        
-        sorted_sprites = sorted(
-            visible_sprites, 
-            key=lambda sprite: (getattr(sprite, 'z_layer', 0), sprite.rect.bottom)
-        )
-        
+        self._index_static()
+        floors = self._query_static(self._floor_cells, view_rect)
+        visible_sprites = self._query_static(self._object_cells, view_rect) + self._cull_dynamic(view_rect)
+        # Two sorted runs (static cells are pre-sorted): timsort merges them
+        visible_sprites.sort(key=_depth)
+        self.visible_count = len(floors) + len(visible_sprites)
+
         # 2. Draw
         offset_vec = pygame.math.Vector2(int(self.offset.x), int(self.offset.y))
-        
-        # DEBUG: Print camera state once every 60 frames to avoid spam
-        # import pygame
+        surface = target if target is not None else self.virtual_surface
+        overlay = overlay if overlay is not None else self.virtual_surface
+        refresh = getattr(surface, 'refresh', None)
+
+        # Static floor layer: never y-sorted and never interpolated (chunk floors draw their visible tiles)
+        for sprite in floors:
+            if sprite.render_flags & BATCH_DRAW:
+                sprite.draw(surface, offset_vec)
+            else:
+                surface.blit(sprite.image, (sprite.rect.left - offset_vec.x, sprite.rect.top - offset_vec.y))
+
+        import __main__
+        is_debug = getattr(__main__, 'game', None) and __main__.game.debug_mode
+
+        for sprite in visible_sprites:
+            render_dx, render_dy = render_offsets.get(sprite, (0, 0))
+            offset_pos = (sprite.rect.left + render_dx - offset_vec.x, sprite.rect.top + render_dy - offset_vec.y)
+            flags = sprite.render_flags
 
-        for sprite in sorted_sprites:
-            offset_pos = sprite.rect.topleft - offset_vec
-            
             # 3. Draw Universal Shadow for Characters
-            # We identify characters by common attributes (health, status, etc.) 
-            # or class names if imported (but we avoid circular imports)
-            from .entities.player import Player
-            from .entities.enemy import Enemy
-            from .entities.remote_player import RemotePlayer
-            
-            if self.universal_shadow and isinstance(sprite, (Player, Enemy, RemotePlayer)):
-                # Skip if it's already an Orc and has its own shadow? 
-                # Actually, the user wants it for "every character".
-                
+            if flags & CASTS_SHADOW and self.universal_shadow:
                 # Posisi bayangan: Tengah bawah hitbox
                 sh_rect = self.universal_shadow.get_rect()
                 
                 # Gunakan hitbox jika ada, jika tidak rect
                 char_hitbox = getattr(sprite, 'hitbox', sprite.rect)
-                sh_rect.centerx = char_hitbox.centerx - offset_vec.x
+                sh_rect.centerx = char_hitbox.centerx + render_dx - offset_vec.x
                 # Sesuaikan Y agar pas di bawah kaki (User report: ga pas, kurang atas)
                 # char_hitbox.bottom adalah titik pijak, kita kurangi agar 'overlap' kaki
-                sh_rect.centery = char_hitbox.bottom - offset_vec.y - 16 
+                sh_rect.centery = char_hitbox.bottom + render_dy - offset_vec.y - 16 
                 
-                self.virtual_surface.blit(self.universal_shadow, sh_rect)
-
-            self.virtual_surface.blit(sprite.image, offset_pos)
-
-            # Debug Drawing
-            import __main__
-            is_debug = getattr(__main__, 'game', None) and __main__.game.debug_mode
-            if is_debug:
-                # Draw Rect (Blue)
-                pygame.draw.rect(self.virtual_surface, (0, 0, 255), (sprite.rect.topleft - offset_vec, sprite.rect.size), 1)
-                # Draw Hitbox (Yellow/Green)
-                if hasattr(sprite, 'get_world_hitbox_points'):
-                    points = sprite.get_world_hitbox_points()
-                    screen_points = [(p[0] - offset_vec.x, p[1] - offset_vec.y) for p in points]
-                    if len(screen_points) > 2:
-                        pygame.draw.polygon(self.virtual_surface, (255, 255, 0), screen_points, 1)
-                    for sp in screen_points:
-                        pygame.draw.circle(self.virtual_surface, (255, 0, 0), sp, 2)
-                elif hasattr(sprite, 'hitbox'):
-                    pygame.draw.rect(self.virtual_surface, (0, 255, 0), (sprite.hitbox.topleft - offset_vec, sprite.hitbox.size), 2)
-                # Draw Attack Hitbox (Red) if exists
-                if hasattr(sprite, 'attack_hitbox') and sprite.attack_hitbox:
-                    pygame.draw.rect(self.virtual_surface, (255, 0, 0), (sprite.attack_hitbox.topleft - offset_vec, sprite.attack_hitbox.size), 2)
-            
-            # Draw Mouse World Crosshair
-            mouse_pos = pygame.math.Vector2(pygame.mouse.get_pos())
-            # Simple crosshair at mouse screen pos
-            pygame.draw.line(self.virtual_surface, (255, 0, 255), (mouse_pos.x - 10, mouse_pos.y), (mouse_pos.x + 10, mouse_pos.y), 1)
-            pygame.draw.line(self.virtual_surface, (255, 0, 255), (mouse_pos.x, mouse_pos.y - 10), (mouse_pos.x, mouse_pos.y + 10), 1)
+                surface.blit(self.universal_shadow, sh_rect)
+
+            if flags & DYNAMIC_IMAGE and refresh:
+                refresh(sprite.image)
+
+            # Particle emitters draw their whole batch themselves
+            if flags & BATCH_DRAW:
+                sprite.draw(surface, offset_vec)
+            else:
+                surface.blit(sprite.image, offset_pos)
+
+        # Debug Drawing
+        if is_debug:
+            for sprite in floors + visible_sprites:
+                self._draw_debug(overlay, sprite, offset_vec)
+
+        # Draw Mouse World Crosshair
+        mouse_pos = pygame.math.Vector2(pygame.mouse.get_pos())
+        # Simple crosshair at mouse screen pos
+        pygame.draw.line(overlay, (255, 0, 255), (mouse_pos.x - 10, mouse_pos.y), (mouse_pos.x + 10, mouse_pos.y), 1)
+        pygame.draw.line(overlay, (255, 0, 255), (mouse_pos.x, mouse_pos.y - 10), (mouse_pos.x, mouse_pos.y + 10), 1)
+
+    def _draw_debug(self, surface, sprite, offset_vec):
+        # Draw Rect (Blue)
+        pygame.draw.rect(surface, (0, 0, 255), (sprite.rect.topleft - offset_vec, sprite.rect.size), 1)
+        # Draw Hitbox (Yellow/Green)
+        if sprite.render_flags & HITBOX_POINTS:
+            points = sprite.get_world_hitbox_points()
+            screen_points = [(p[0] - offset_vec.x, p[1] - offset_vec.y) for p in points]
+            if len(screen_points) > 2:
+                pygame.draw.polygon(surface, (255, 255, 0), screen_points, 1)
+            for sp in screen_points:
+                pygame.draw.circle(surface, (255, 0, 0), sp, 2)
+        elif hasattr(sprite, 'hitbox'):
+            pygame.draw.rect(surface, (0, 255, 0), (sprite.hitbox.topleft - offset_vec, sprite.hitbox.size), 2)
+        # Draw Attack Hitbox (Red) if exists
+        if hasattr(sprite, 'attack_hitbox') and sprite.attack_hitbox:
+            pygame.draw.rect(surface, (255, 0, 0), (sprite.attack_hitbox.topleft - offset_vec, sprite.attack_hitbox.size), 2)
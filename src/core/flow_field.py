@@ -0,0 +1,194 @@
+import numpy as np
+from ..settings import FLOW_FIELD_RADIUS
+
+# 8 tetangga: offset (dx, dy) dan arah satuan menuju tetangga tersebut
+_NEIGHBORS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+_NEIGHBOR_OFFSETS = np.array(_NEIGHBORS, dtype=np.int64)
+_NEIGHBOR_DIRS = _NEIGHBOR_OFFSETS / np.linalg.norm(_NEIGHBOR_OFFSETS, axis=1, keepdims=True)
+
+def _shift(grid, dx, dy, fill):
+    """out[x, y] = grid[x - dx, y - dy], di luar grid diisi fill."""
+    out = np.full_like(grid, fill)
+    w, h = grid.shape
+    out[max(dx, 0):w + min(dx, 0), max(dy, 0):h + min(dy, 0)] = \
+        grid[max(-dx, 0):w - max(dx, 0), max(-dy, 0):h - max(dy, 0)]
+    return out
+
+class FlowField:
+    """
+    Integration field (jarak BFS 8 arah dalam tile) menuju satu target di atas window chunk yang dimuat,
+    plus langkah per tile ke tetangga dengan jarak terkecil (musuh diarahkan ke pusat tile itu).
+    Dihitung ulang hanya saat target pindah tile atau rintangan/window chunk berubah.
+    """
+
+    def __init__(self, obstacle_index, tile_size):
+        self.obstacle_index = obstacle_index
+        self.tile_size = tile_size
+        self.key = None
+        self.origin = (0, 0)
+        self.target_tile = (0, 0)
+        self.blocked = None
+        self.dist = np.zeros((0, 0))
+        self.flow = np.zeros((0, 0, 2), dtype=np.int64)
+        self.has_path = np.zeros((0, 0), dtype=bool)
+
+    def update(self, target_center, bounds):
+        """bounds: (tile_x, tile_y, width, height) dari chunk yang dimuat."""
+        target_tile = (int(target_center[0] // self.tile_size), int(target_center[1] // self.tile_size))
+
+        # Field hanya sejauh FLOW_FIELD_RADIUS dari target, dipotong ke area chunk yang dimuat
+        x0 = max(bounds[0], target_tile[0] - FLOW_FIELD_RADIUS)
+        y0 = max(bounds[1], target_tile[1] - FLOW_FIELD_RADIUS)
+        x1 = min(bounds[0] + bounds[2], target_tile[0] + FLOW_FIELD_RADIUS + 1)
+        y1 = min(bounds[1] + bounds[3], target_tile[1] + FLOW_FIELD_RADIUS + 1)
+        window = (x0, y0, max(x1 - x0, 0), max(y1 - y0, 0))
+
+        self.obstacle_index.window()
+        key = (target_tile, window, self.obstacle_index.version)
+        if key == self.key:
+            return
+        self.key = key
+
+        # Chunk baru di luar window tidak mengubah field
+        blocked = self._blocked(window)
+        if (target_tile == self.target_tile and window[:2] == self.origin and
+                self.blocked is not None and np.array_equal(blocked, self.blocked)):
+            return
+        self.origin = window[:2]
+        self.target_tile = target_tile
+        self.blocked = blocked
+        self._integrate(blocked, (target_tile[0] - x0, target_tile[1] - y0))
+
+    def _blocked(self, bounds):
+        # Tile yang menjadi rumah hitbox rintangan statis (bitmap okupansi indeks)
+        x0, y0, w, h = bounds
+        blocked = np.zeros((w, h), dtype=bool)
+        _, occupancy, origin = self.obstacle_index.window()
+        ox, oy = x0 - origin[0], y0 - origin[1]
+        sx0, sy0 = max(ox, 0), max(oy, 0)
+        sx1, sy1 = min(ox + w, occupancy.shape[0]), min(oy + h, occupancy.shape[1])
+        if sx1 > sx0 and sy1 > sy0:
+            blocked[sx0 - ox:sx1 - ox, sy0 - oy:sy1 - oy] = occupancy[sx0:sx1, sy0:sy1] > 0
+        return blocked
+
+    def _integrate(self, blocked, target):
+        w, h = blocked.shape
+        dist = np.full((w, h), np.inf)
+        self.dist = dist
+        self.flow = np.zeros((w, h, 2), dtype=np.int64)
+        self.has_path = np.zeros((w, h), dtype=bool)
+        tx, ty = target
+        if not (0 <= tx < w and 0 <= ty < h):
+            return
+
+        free = ~blocked
+        free[tx, ty] = True
+        # Diagonal hanya boleh jika kedua sisi ortogonal kosong (tidak memotong sudut rintangan)
+        moves = []
+        for dx, dy in _NEIGHBORS:
+            allowed = free.copy()
+            if dx and dy:
+                allowed &= _shift(free, dx, 0, False) & _shift(free, 0, dy, False)
+            moves.append((dx, dy, allowed))
+
+        # Wavefront BFS: setiap langkah memperluas frontier satu tile (biaya seragam).
+        # Frontier disimpan dengan padding 1 tile agar pergeseran cukup berupa view (tanpa alokasi).
+        padded = np.zeros((w + 2, h + 2), dtype=bool)
+        padded[tx + 1, ty + 1] = True
+        frontier = padded[1:-1, 1:-1]
+        views = [(padded[1 - dx:w + 1 - dx, 1 - dy:h + 1 - dy], allowed) for dx, dy, allowed in moves]
+        unreached = np.ones((w, h), dtype=bool)
+        unreached[tx, ty] = False
+        dist[tx, ty] = 0
+        grow = np.empty((w, h), dtype=bool)
+        scratch = np.empty((w, h), dtype=bool)
+        step = 0
+        while True:
+            step += 1
+            grow.fill(False)
+            for view, allowed in views:
+                np.logical_and(view, allowed, out=scratch)
+                grow |= scratch
+            grow &= unreached
+            if not grow.any():
+                break
+            dist[grow] = step
+            unreached &= ~grow
+            frontier[...] = grow
+
+        # Arah per tile: tetangga terjangkau dengan jarak terkecil,
+        # seri dipecah dengan arah yang paling searah ke target
+        xs, ys = np.meshgrid(np.arange(w), np.arange(h), indexing='ij')
+        to_target = np.stack((tx - xs, ty - ys), axis=2).astype(np.float64)
+        norm = np.linalg.norm(to_target, axis=2, keepdims=True)
+        to_target = np.divide(to_target, norm, out=np.zeros_like(to_target), where=norm > 0)
+
+        scores = np.empty((len(_NEIGHBORS), w, h))
+        for n, (dx, dy, allowed) in enumerate(moves):
+            # Dari tile (x, y) ke (x + dx, y + dy): gerakan terbalik dari wavefront
+            neighbor_dist = _shift(dist, -dx, -dy, np.inf)
+            neighbor_ok = _shift(allowed, -dx, -dy, False)
+            align = to_target @ _NEIGHBOR_DIRS[n]
+            scores[n] = np.where(neighbor_ok, neighbor_dist - 0.1 * align, np.inf)
+
+        best = scores.argmin(axis=0)
+        has_path = np.isfinite(scores.min(axis=0)) & (scores.min(axis=0) < dist + 0.5)
+        has_path[tx, ty] = False
+        self.has_path = has_path
+        self.flow = np.where(has_path[:, :, None], _NEIGHBOR_OFFSETS[best], 0)
+
+    def sample(self, centers, target_center):
+        """
+        Arah kemudi untuk N titik (pusat hitbox musuh).
+        Jika jalur field sama panjang dengan garis lurus (tidak ada rintangan yang harus diputari)
+        atau titik di luar field, dipakai vektor langsung ke target.
+        """
+        direct = np.asarray(target_center, dtype=np.float64) - centers
+        norm = np.linalg.norm(direct, axis=1, keepdims=True)
+        steer = np.divide(direct, norm, out=np.zeros_like(direct), where=norm > 0)
+        w, h = self.dist.shape
+        if not w or not h:
+            return steer
+
+        tiles = np.floor(centers / self.tile_size).astype(np.int64)
+        local = tiles - self.origin
+        inside = (local[:, 0] >= 0) & (local[:, 0] < w) & (local[:, 1] >= 0) & (local[:, 1] < h)
+        rows = np.flatnonzero(inside)
+        lx, ly = local[rows, 0], local[rows, 1]
+        chebyshev = np.maximum(np.abs(tiles[rows, 0] - self.target_tile[0]), np.abs(tiles[rows, 1] - self.target_tile[1]))
+        detour = (self.dist[lx, ly] > chebyshev) & self.has_path[lx, ly]
+        rows = rows[detour]
+        if rows.size:
+            # Menuju pusat tile berikutnya di jalur (bukan sekadar arah offset) agar tidak tersangkut di sudut
+            waypoint = (tiles[rows] + self.flow[lx[detour], ly[detour]] + 0.5) * self.tile_size
+            to_waypoint = waypoint - centers[rows]
+            norm = np.linalg.norm(to_waypoint, axis=1, keepdims=True)
+            steer[rows] = np.divide(to_waypoint, norm, out=np.zeros_like(to_waypoint), where=norm > 0)
+        return steer
+
+class FlowFields:
+    """Satu FlowField per pemain (lokal + remote), dikelola per frame oleh GameScene."""
+
+    def __init__(self, chunk_manager):
+        self.chunk_manager = chunk_manager
+        self.fields = {}
+
+    def update(self, targets):
+        bounds = self.chunk_manager.tile_bounds()
+        fields = {}
+        for target in targets:
+            field = self.fields.get(target) or FlowField(self.chunk_manager.obstacle_index, self.chunk_manager.tile_size)
+            if bounds is not None:
+                field.update(getattr(target, 'hitbox', target.rect).center, bounds)
+            fields[target] = field
+        self.fields = fields
+
+    def steer(self, target, centers):
+        center = getattr(target, 'hitbox', target.rect).center
+        field = self.fields.get(target)
+        if field is None:
+            field = FlowField(self.chunk_manager.obstacle_index, self.chunk_manager.tile_size)
+        return field.sample(centers, center)
+
+    def clear(self):
+        self.fields.clear()
@@ -1,10 +1,27 @@
 
 import pygame
-from ..settings import INPUT_MAP
+import random
+from ..settings import INPUT_MAP, SCREEN_WIDTH, SCREEN_HEIGHT
 
 class InputManager:
+    # Sumber input alternatif (bot/skrip, mode headless). None = keyboard & mouse
+    source = None
+
+    @staticmethod
+    def set_source(source):
+        InputManager.source = source
+
+    @staticmethod
+    def update():
+        # Dipanggil sekali per frame sebelum scene.update
+        if InputManager.source is not None:
+            InputManager.source.update()
+
     @staticmethod
     def is_action_pressed(action):
+        if InputManager.source is not None:
+            return InputManager.source.is_action_pressed(action)
+
         keys = pygame.key.get_pressed()
         mouse = pygame.mouse.get_pressed()
         
@@ -22,6 +39,12 @@ class InputManager:
             
         return False
 
+    @staticmethod
+    def get_mouse_pos():
+        if InputManager.source is not None:
+            return InputManager.source.get_mouse_pos()
+        return pygame.mouse.get_pos()
+
     @staticmethod
     def get_movement_vector():
         direction = pygame.math.Vector2()
@@ -33,3 +56,88 @@ class InputManager:
         if direction.magnitude() > 0:
             direction = direction.normalize()
         return direction
+
+class ScriptedInput:
+    """Input dari skrip: daftar (jumlah_frame, {aksi, ...}) yang diputar berurutan lalu diulang."""
+
+    def __init__(self, script, loop=True):
+        self.script = list(script)
+        self.loop = loop
+        self.frame = -1
+
+    def update(self):
+        self.frame += 1
+
+    def current_actions(self):
+        total = sum(frames for frames, _ in self.script)
+        if not total:
+            return set()
+        frame = self.frame % total if self.loop else self.frame
+        for frames, actions in self.script:
+            if frame < frames:
+                return actions
+            frame -= frames
+        return set()
+
+    def is_action_pressed(self, action):
+        return action in self.current_actions()
+
+    def get_mouse_pos(self):
+        return (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+
+    def choose_upgrade(self, options):
+        return options[0]
+
+class BotInput:
+    """
+    Bot sederhana untuk simulasi headless: menjauh dari kerumunan musuh terdekat,
+    berkeliaran jika aman, dash saat terkepung, dan memilih upgrade acak (seeded).
+    """
+
+    FLEE_RADIUS = 300
+    CROWD_RADIUS = 120
+    CROWD_DASH = 8
+    WANDER_FRAMES = 120
+
+    def __init__(self, scene, seed=None):
+        self.scene = scene
+        self.rng = random.Random(seed)
+        self.actions = set()
+        self.frame = 0
+        self.wander = pygame.math.Vector2(1, 0)
+
+    def update(self):
+        self.frame += 1
+        if self.frame % self.WANDER_FRAMES == 1:
+            self.wander = pygame.math.Vector2(1, 0).rotate(self.rng.uniform(0, 360))
+
+        player = self.scene.player
+        center = pygame.math.Vector2(player.hitbox.center)
+        nearby = self.scene.horde.living_near(center, self.FLEE_RADIUS)
+
+        # Arah menjauh dari musuh (bobot lebih besar untuk yang dekat)
+        flee = pygame.math.Vector2()
+        for enemy in nearby:
+            away = center - pygame.math.Vector2(enemy.hitbox.center)
+            if away.magnitude() > 0:
+                flee += away.normalize() * (self.FLEE_RADIUS - away.magnitude()) / self.FLEE_RADIUS
+        direction = flee if flee.magnitude() > 0.2 else self.wander
+
+        self.actions = set()
+        if direction.x > 0.38 * direction.magnitude(): self.actions.add('RIGHT')
+        elif direction.x < -0.38 * direction.magnitude(): self.actions.add('LEFT')
+        if direction.y > 0.38 * direction.magnitude(): self.actions.add('DOWN')
+        elif direction.y < -0.38 * direction.magnitude(): self.actions.add('UP')
+
+        crowd = sum(1 for e in nearby if center.distance_to(e.hitbox.center) < self.CROWD_RADIUS)
+        if crowd >= self.CROWD_DASH:
+            self.actions.add('DASH')
+
+    def is_action_pressed(self, action):
+        return action in self.actions
+
+    def get_mouse_pos(self):
+        return (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+
+    def choose_upgrade(self, options):
+        return self.rng.choice(options)
@@ -0,0 +1,145 @@
+import numpy as np
+import pygame
+
+class ObstacleIndex:
+    """
+    Indeks collision statis untuk obstacle dunia (pohon, batu).
+
+    Tiap chunk mendaftarkan hitbox-nya saat dimuat dan membuangnya saat di-unload.
+    Hitbox dikelompokkan per tile asal (tile tempat pusat hitbox berada); semua chunk yang
+    dimuat digabung (lazy) menjadi satu window:
+        boxes[tile_x, tile_y, slot] -> (left, top, right, bottom), NaN jika kosong
+        occupancy[tile_x, tile_y]   -> jumlah hitbox yang berasal dari tile itu
+    jadi query cukup lookup array berukuran tetap, bukan scan seluruh sprite obstacle.
+    """
+
+    def __init__(self, tile_size):
+        self.tile_size = tile_size
+        self.chunks = {} # {(cx, cy): array (M, 4)}
+        self.max_half = 0.0 # Setengah ukuran hitbox terbesar yang terdaftar
+        self.origin = (0, 0) # Koordinat tile dari window[0, 0]
+        self.boxes = np.full((0, 0, 1, 4), np.nan)
+        self.occupancy = np.zeros((0, 0), dtype=np.int32)
+        self._dirty = False
+        self.version = 0 # Naik setiap composite agar yang bergantung (flow field) bisa refresh
+        self._near_cache = {} # {reach: occupancy yang dilebarkan reach tile}
+
+    def __len__(self):
+        return sum(len(boxes) for boxes in self.chunks.values())
+
+    def add_chunk(self, coord, hitboxes):
+        boxes = np.array([(r.left, r.top, r.right, r.bottom) for r in hitboxes], dtype=np.float64).reshape(-1, 4)
+        self.chunks[coord] = boxes
+        if len(boxes):
+            self.max_half = max(self.max_half, float((boxes[:, 2:] - boxes[:, :2]).max()) / 2)
+        self._dirty = True
+
+    def remove_chunk(self, coord):
+        if self.chunks.pop(coord, None) is not None:
+            self._dirty = True
+
+    def clear(self):
+        self.chunks.clear()
+        self._dirty = True
+
+    def _composite(self):
+        self._dirty = False
+        self.version += 1
+        self._near_cache.clear()
+        parts = [boxes for boxes in self.chunks.values() if len(boxes)]
+        if not parts:
+            self.origin = (0, 0)
+            self.boxes = np.full((0, 0, 1, 4), np.nan)
+            self.occupancy = np.zeros((0, 0), dtype=np.int32)
+            return
+
+        boxes = np.concatenate(parts)
+        home = np.floor((boxes[:, :2] + boxes[:, 2:]) / 2 / self.tile_size).astype(np.int64)
+        origin = home.min(axis=0)
+        home -= origin
+        width, height = (home.max(axis=0) + 1).tolist()
+
+        # Peringkat tiap hitbox di dalam bucket tile-nya
+        key = home[:, 0] * height + home[:, 1]
+        order = np.argsort(key, kind='stable')
+        key = key[order]
+        first = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+        rank = np.arange(len(key)) - np.repeat(first, np.diff(np.r_[first, len(key)]))
+
+        tx, ty = home[order, 0], home[order, 1]
+        self.boxes = np.full((width, height, int(rank.max()) + 1, 4), np.nan)
+        self.boxes[tx, ty, rank] = boxes[order]
+        self.occupancy = np.zeros((width, height), dtype=np.int32)
+        np.add.at(self.occupancy, (tx, ty), 1)
+        self.origin = (int(origin[0]), int(origin[1]))
+
+    def window(self):
+        """(boxes, occupancy, origin) hasil composite, dibangun ulang hanya setelah chunk berubah."""
+        if self._dirty:
+            self._composite()
+        return self.boxes, self.occupancy, self.origin
+
+    def _near(self, reach):
+        # Tile yang punya hitbox berasal dalam jarak reach tile, diberi padding reach di tiap sisi
+        if reach not in self._near_cache:
+            occupied = np.pad(self.occupancy > 0, 2 * reach)
+            width = self.occupancy.shape[0] + 2 * reach
+            height = self.occupancy.shape[1] + 2 * reach
+            near = np.zeros((width, height), dtype=bool)
+            for ox in range(2 * reach + 1):
+                for oy in range(2 * reach + 1):
+                    near |= occupied[ox:ox + width, oy:oy + height]
+            self._near_cache[reach] = near
+        return self._near_cache[reach]
+
+    def candidates(self, centers, half):
+        """
+        Kandidat hitbox untuk N kotak query (pusat/setengah ukuran sebagai array (N, 2)).
+        Mengembalikan (rows, boxes): rows = indeks query yang punya obstacle di dekatnya,
+        boxes = (len(rows), C, 4) dengan NaN di slot kosong agar setiap perbandingan gagal.
+        """
+        boxes, _, origin = self.window()
+        if not boxes.size or not len(centers):
+            return np.zeros(0, dtype=np.int64), np.zeros((0, 0, 4))
+
+        # Hitbox yang overlap pasti berpusat dalam jarak reach tile dari pusat query
+        reach = int(np.ceil((float(np.max(half)) + self.max_half) / self.tile_size))
+        width, height = boxes.shape[:2]
+        tiles = np.floor(centers / self.tile_size).astype(np.int64) - origin
+        near = self._near(reach)
+        padded = tiles + reach
+        inside = ((padded[:, 0] >= 0) & (padded[:, 0] < near.shape[0]) &
+                  (padded[:, 1] >= 0) & (padded[:, 1] < near.shape[1]))
+        rows = np.flatnonzero(inside)
+        rows = rows[near[padded[rows, 0], padded[rows, 1]]]
+        if not rows.size:
+            return rows, np.zeros((0, 0, 4))
+
+        span = np.arange(-reach, reach + 1)
+        dx, dy = np.meshgrid(span, span, indexing='ij')
+        tx = tiles[rows, 0, None] + dx.ravel()
+        ty = tiles[rows, 1, None] + dy.ravel()
+        inside = (tx >= 0) & (tx < width) & (ty >= 0) & (ty < height)
+        found = boxes[np.clip(tx, 0, width - 1), np.clip(ty, 0, height - 1)]
+        found[~inside] = np.nan
+        return rows, found.reshape(rows.size, -1, 4)
+
+    def query(self, rect):
+        """Hitbox statis (pygame.Rect) yang overlap dengan rect."""
+        boxes, occupancy, origin = self.window()
+        if not boxes.size:
+            return []
+
+        # Tolak cepat lewat bitmap occupancy
+        reach = int(np.ceil(self.max_half / self.tile_size))
+        x0 = max(rect.left // self.tile_size - reach - origin[0], 0)
+        y0 = max(rect.top // self.tile_size - reach - origin[1], 0)
+        x1 = rect.right // self.tile_size + reach + 1 - origin[0]
+        y1 = rect.bottom // self.tile_size + reach + 1 - origin[1]
+        if x1 <= x0 or y1 <= y0 or not occupancy[x0:x1, y0:y1].any():
+            return []
+
+        found = boxes[x0:x1, y0:y1].reshape(-1, 4)
+        hit = ((found[:, 0] < rect.right) & (rect.left < found[:, 2]) &
+               (found[:, 1] < rect.bottom) & (rect.top < found[:, 3]))
+        return [pygame.Rect(l, t, r - l, b - t) for l, t, r, b in found[hit].tolist()]
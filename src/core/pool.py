@@ -0,0 +1,79 @@
+from abc import ABC, abstractmethod
+
+import pygame
+from ..settings import POOL_SIZES, DEFAULT_POOL_SIZE
+
+class Pool:
+    """
+    Free-list instance sprite untuk satu class PooledSprite.
+    Sprite yang di-kill() kembali ke sini (hingga size) dan dipakai ulang oleh spawn berikutnya.
+    """
+
+    def __init__(self, cls, size):
+        self.cls = cls
+        self.size = size
+        self.free = []
+        self.active = 0
+        self.high_water = 0 # Jumlah aktif tertinggi sejak start
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            sprite = self.free.pop()
+            sprite.reset(*args, **kwargs)
+            self.reused += 1
+        else:
+            sprite = self.cls(*args, **kwargs)
+            sprite._pool = self
+            self.created += 1
+        sprite._pooled = False
+        self.active += 1
+        if self.active > self.high_water:
+            self.high_water = self.active
+        return sprite
+
+    def release(self, sprite):
+        self.active -= 1
+        sprite._pooled = True
+        if len(self.free) < self.size:
+            self.free.append(sprite)
+
+_POOLS = {}
+
+def pool_for(cls):
+    pool = _POOLS.get(cls)
+    if pool is None:
+        pool = _POOLS[cls] = Pool(cls, POOL_SIZES.get(cls.__name__, DEFAULT_POOL_SIZE))
+    return pool
+
+def stats():
+    """[(nama class, pool)] untuk debug overlay."""
+    return [(cls.__name__, pool) for cls, pool in _POOLS.items()]
+
+class PooledSprite(pygame.sprite.Sprite, ABC):
+    """
+    Sprite berumur pendek yang didaur ulang.
+    Subclass menaruh semua inisialisasi di reset() (signature sama dengan konstruktor, termasuk groups);
+    pakai Class.spawn(...) sebagai pengganti Class(...) agar instance diambil dari pool.
+    """
+    _pool = None
+    _pooled = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.reset(*args, **kwargs)
+
+    @abstractmethod
+    def reset(self, *args, **kwargs):
+        """Inisialisasi ulang instance (dipanggil konstruktor dan saat diambil dari pool)."""
+
+    @classmethod
+    def spawn(cls, *args, **kwargs):
+        return pool_for(cls).acquire(*args, **kwargs)
+
+    def kill(self):
+        super().kill()
+        # Hanya sekali per spawn (kill ganda tidak boleh memasukkan instance dua kali)
+        if self._pool is not None and not self._pooled:
+            self._pool.release(self)
@@ -0,0 +1,81 @@
+import time
+from collections import deque
+from ..settings import PROFILER_WINDOW
+
+# Profiler frame per subsistem. Aktif hanya saat debug mode; saat mati scope()
+# mengembalikan context kosong bersama sehingga biayanya hanya satu pemanggilan fungsi.
+# Waktu scope bersifat eksklusif (dikurangi scope anak) agar bisa ditumpuk di grafik.
+
+enabled = False
+history = deque(maxlen=PROFILER_WINDOW) # Per frame: {scope: ms}, plus 'frame' = total frame
+frame_count = 0 # Bertambah setiap end_frame (dipakai grafik untuk tahu kolom baru)
+
+_frame = {}
+_stack = []
+_last_frame = None
+
+class _Scope:
+    __slots__ = ('name', 'start', 'child')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.child = 0.0
+        _stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = (time.perf_counter() - self.start) * 1000
+        _stack.pop()
+        if _stack:
+            _stack[-1].child += elapsed
+        _frame[self.name] = _frame.get(self.name, 0.0) + elapsed - self.child
+
+class _NullScope:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+_NULL_SCOPE = _NullScope()
+
+def scope(name):
+    return _Scope(name) if enabled else _NULL_SCOPE
+
+def set_enabled(value):
+    global enabled, _last_frame
+    if value == enabled:
+        return
+    enabled = value
+    _frame.clear()
+    _stack.clear()
+    history.clear()
+    _last_frame = None
+
+def end_frame():
+    """Tutup frame: simpan waktu semua scope ke jendela bergulir."""
+    global _frame, _last_frame, frame_count
+    if not enabled:
+        return
+    now = time.perf_counter()
+    if _last_frame is not None:
+        _frame['frame'] = (now - _last_frame) * 1000
+        history.append(_frame)
+        frame_count += 1
+    _last_frame = now
+    _frame = {}
+
+def averages():
+    """Rata-rata ms per scope di jendela (scope yang tidak muncul di suatu frame dihitung 0)."""
+    if not history:
+        return {}
+    totals = {}
+    for frame in history:
+        for name, ms in frame.items():
+            totals[name] = totals.get(name, 0.0) + ms
+    return {name: total / len(history) for name, total in totals.items()}
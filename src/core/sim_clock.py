@@ -0,0 +1,10 @@
+# Jam simulasi (ms). Hanya maju saat GameScene melangkah, jadi timer gameplay
+# (cooldown, stun, spawn, umur proyektil) tidak tergantung FPS render maupun waktu pause.
+_ticks = 0.0
+
+def get_ticks():
+    return int(_ticks)
+
+def advance(dt):
+    global _ticks
+    _ticks += dt * 1000.0
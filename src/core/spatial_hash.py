@@ -0,0 +1,131 @@
+import numpy as np
+
+# Packing koordinat cell (cx, cy) ke satu kunci int64
+_CELL_OFFSET = 1 << 20
+_CELL_STRIDE = 1 << 21
+
+class SpatialHashGrid:
+    """
+    Grid hash uniform untuk query tetangga (radius & k-nearest).
+    Dibangun ulang sekali per frame dari array titik: titik diurutkan berdasarkan
+    kunci cell sehingga isi satu cell adalah potongan kontigu di array terurut.
+    Urutan dalam cell mengikuti urutan input (sort stabil), jadi hasil query deterministik.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = float(cell_size)
+        self.points = np.zeros((0, 2))
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.sorted_keys = np.zeros(0, dtype=np.int64)
+        self.order = np.zeros(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _cells(self, points):
+        return np.floor(points / self.cell_size).astype(np.int64)
+
+    @staticmethod
+    def _keys(cx, cy):
+        return (cx + _CELL_OFFSET) * _CELL_STRIDE + (cy + _CELL_OFFSET)
+
+    def rebuild(self, points, ids=None):
+        """points: array (N, 2). ids: id per titik (default 0..N-1)."""
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self.ids = np.arange(len(self.points)) if ids is None else np.asarray(ids, dtype=np.int64)
+        cells = self._cells(self.points)
+        keys = self._keys(cells[:, 0], cells[:, 1])
+        self.order = np.argsort(keys, kind='stable')
+        self.sorted_keys = keys[self.order]
+
+    def _gather(self, keys):
+        """Index titik (posisi di self.points) untuk setiap kunci, plus owner (index kunci asal)."""
+        starts = np.searchsorted(self.sorted_keys, keys, side='left')
+        ends = np.searchsorted(self.sorted_keys, keys, side='right')
+        counts = ends - starts
+        total = int(counts.sum())
+        if not total:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        owner = np.repeat(np.arange(len(keys)), counts)
+        run_start = np.repeat(np.cumsum(counts) - counts, counts)
+        sorted_pos = np.arange(total) - run_start + np.repeat(starts, counts)
+        return self.order[sorted_pos], owner
+
+    def _ring(self, radius):
+        reach = int(np.ceil(radius / self.cell_size))
+        span = np.arange(-reach, reach + 1)
+        dx, dy = np.meshgrid(span, span, indexing='ij')
+        return dx.ravel(), dy.ravel()
+
+    def _candidates(self, point, radius):
+        if not len(self.ids):
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        cx, cy = self._cells(np.asarray(point, dtype=np.float64).reshape(1, 2))[0]
+        dx, dy = self._ring(radius)
+        found, _ = self._gather(self._keys(cx + dx, cy + dy))
+        dist = np.linalg.norm(self.points[found] - point, axis=1)
+        inside = dist < radius
+        return found[inside], dist[inside]
+
+    def query_radius(self, point, radius):
+        """Id semua titik dalam radius dari point (urutan deterministik, belum diurut jarak)."""
+        found, _ = self._candidates(point, radius)
+        return self.ids[np.sort(found)]
+
+    def query_knn(self, point, k, radius):
+        """Hingga k id terdekat dalam radius, urut dari yang terdekat (seri dipecah berdasarkan id)."""
+        found, dist = self._candidates(point, radius)
+        order = np.lexsort((self.ids[found], dist))[:k]
+        return self.ids[found[order]]
+
+    def neighbor_pairs(self, radius, k=None):
+        """
+        Semua pasangan (i, j) dengan jarak < radius untuk setiap titik i di grid,
+        dibatasi k tetangga terdekat per titik jika k diberikan.
+        Return (i, j, diff, dist) dengan i/j berupa posisi di array points (bukan id)
+        dan diff = points[i] - points[j].
+        """
+        n = len(self.points)
+        empty = np.zeros(0, dtype=np.int64)
+        if n < 2:
+            return empty, empty, np.zeros((0, 2)), np.zeros(0)
+
+        # Pasangan dibentuk per cell terisi (bukan per titik): kerumunan padat = sedikit cell
+        cell_keys, cell_start, cell_count = np.unique(self.sorted_keys, return_index=True, return_counts=True)
+        cell_x = cell_keys // _CELL_STRIDE
+        cell_y = cell_keys % _CELL_STRIDE
+        dx, dy = self._ring(radius)
+        near_keys = (cell_x[:, None] + dx) * _CELL_STRIDE + (cell_y[:, None] + dy)
+        slot = np.minimum(np.searchsorted(cell_keys, near_keys), len(cell_keys) - 1)
+        cell_a, ring = np.nonzero(cell_keys[slot] == near_keys)
+        cell_b = slot[cell_a, ring]
+
+        # Semua kombinasi titik di cell A x cell B
+        count_a = cell_count[cell_a]
+        count_b = cell_count[cell_b]
+        sizes = count_a * count_b
+        total = int(sizes.sum())
+        pair = np.repeat(np.arange(len(sizes)), sizes)
+        local = np.arange(total) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        width = count_b[pair]
+        i = self.order[cell_start[cell_a][pair] + local // width]
+        j = self.order[cell_start[cell_b][pair] + local % width]
+
+        px = self.points[:, 0]
+        py = self.points[:, 1]
+        diff_x = px[i] - px[j]
+        diff_y = py[i] - py[j]
+        dist = np.sqrt(diff_x * diff_x + diff_y * diff_y)
+        keep = (i != j) & (dist < radius)
+        i, j, diff_x, diff_y, dist = i[keep], j[keep], diff_x[keep], diff_y[keep], dist[keep]
+
+        if k is not None and len(i) and np.bincount(i).max() > k:
+            # Urutkan per titik berdasarkan jarak (dist < radius, jadi i + dist/radius tetap dalam grup i)
+            order = np.argsort(i + dist / radius, kind='stable')
+            i, j, diff_x, diff_y, dist = i[order], j[order], diff_x[order], diff_y[order], dist[order]
+            group_start = np.flatnonzero(np.r_[True, i[1:] != i[:-1]])
+            rank = np.arange(len(i)) - np.repeat(group_start, np.diff(np.r_[group_start, len(i)]))
+            keep = rank < k
+            i, j, diff_x, diff_y, dist = i[keep], j[keep], diff_x[keep], diff_y[keep], dist[keep]
+
+        return i, j, np.stack((diff_x, diff_y), axis=1), dist
@@ -3,9 +3,39 @@ import pygame
 from ..settings import *
 from ..utils import load_sprite_sheet
 from ..core.collision import SAT
+from ..core import profiler
 import json
 import os
 
+def load_custom_hitbox(entity_id):
+    """
+    Cari poligon hitbox dari collision editor untuk entity_id.
+    Return (points, ref_size) atau (None, None) jika tidak ada.
+    """
+    path = "assets/data/collisions.json"
+    if not os.path.exists(path):
+        return None, None
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except:
+        return None, None
+
+    # Match exact or prefix (e.g., orc_captain matches orc)
+    found_key = None
+    if entity_id in data:
+        found_key = entity_id
+    else:
+        # Try prefix matching for variants
+        for key in data.keys():
+            if entity_id.startswith(key):
+                found_key = key
+                break
+
+    if not found_key:
+        return None, None
+    return data[found_key]["points"], data[found_key].get("ref_size")
+
 class Entity(pygame.sprite.Sprite):
     def __init__(self, pos, groups, z_layer=1):
         super().__init__(groups)
@@ -42,28 +72,10 @@ class Entity(pygame.sprite.Sprite):
         entity_id = getattr(self, 'enemy_type', None) or getattr(self, 'char_config', {}).get('name', '').lower()
         if not entity_id: return
         
-        path = "assets/data/collisions.json"
-        if os.path.exists(path):
-            try:
-                with open(path, "r") as f:
-                    data = json.load(f)
-                    
-                    # Match exact or prefix (e.g., orc_captain matches orc)
-                    found_key = None
-                    if entity_id in data:
-                        found_key = entity_id
-                    else:
-                        # Try prefix matching for variants
-                        for key in data.keys():
-                            if entity_id.startswith(key):
-                                found_key = key
-                                break
-                    
-                    if found_key:
-                        self.custom_hitbox = data[found_key]["points"]
-                        self.hitbox_ref_size = data[found_key].get("ref_size")
-            except:
-                pass
+        points, ref_size = load_custom_hitbox(entity_id)
+        if points:
+            self.custom_hitbox = points
+            self.hitbox_ref_size = ref_size
 
     def get_world_hitbox_points(self):
         if not self.custom_hitbox:
@@ -119,12 +131,14 @@ class Entity(pygame.sprite.Sprite):
                 # 1. Horizontal
                 self.pos.x += step_vel.x
                 self._sync_hitbox_with_pos()
-                self.collision('horizontal', step_vel.x, obstacle_sprites, enemy_sprites)
+                with profiler.scope('collision'):
+                    self.collision('horizontal', step_vel.x, obstacle_sprites, enemy_sprites)
                 
                 # 2. Vertical
                 self.pos.y += step_vel.y
                 self._sync_hitbox_with_pos()
-                self.collision('vertical', step_vel.y, obstacle_sprites, enemy_sprites)
+                with profiler.scope('collision'):
+                    self.collision('vertical', step_vel.y, obstacle_sprites, enemy_sprites)
 
         # Sync visual rect
         self.rect.centerx = self.hitbox.centerx
@@ -0,0 +1,672 @@
+import pygame
+import random
+import os
+import numpy as np
+from ..settings import *
+from ..utils import load_sprite_sheet, animation_variants, FLIPPED, FADED
+from ..core.collision import SAT
+from ..vfx import DeathEffect, HitSpark
+from ..items import ExperienceGem
+from .interactables import HealthPotion
+from .entity import load_custom_hitbox
+from ..core import sim_clock, profiler
+from ..network import protocol
+
+# Kode status musuh (juga index kolom tabel panjang animasi)
+STATUS_NAMES = ('idle', 'walk', 'attack', 'hurt', 'death')
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+IDLE, WALK, ATTACK, HURT, DEATH = range(len(STATUS_NAMES))
+
+ENEMY_ATTACK_COOLDOWN = 1500 # ms
+HURT_STUN_DURATION = 400 # ms
+FLASH_DURATION = 150 # ms
+SEPARATION_RADIUS = 50
+SEPARATION_SAMPLES = 16
+DESPAWN_DIST_SQ = 5000 ** 2
+DORMANT_DIST_SQ = 3000 ** 2
+COLLISION_STEP = 16
+
+class EnemyType:
+    """Data statis per tipe musuh (aset, ukuran rect/hitbox) yang dibagi semua instance."""
+
+    def __init__(self, type_id, key):
+        self.type_id = type_id
+        self.key = key
+        self.data = ENEMY_DATA.get(key, ENEMY_DATA['orc'])
+
+        base_path = self.data['asset_path']
+        scale = self.data.get('scale', 2.0)
+        self.animations = {name: [] for name in STATUS_NAMES}
+        if key.startswith('orc'):
+            self.animations['idle'] = load_sprite_sheet(os.path.join(base_path, "Orc-Idle.png"), 100, 100, scale=scale, trim=True)
+            self.animations['walk'] = load_sprite_sheet(os.path.join(base_path, "Orc-Walk.png"), 100, 100, scale=scale, trim=True)
+            self.animations['attack'] = load_sprite_sheet(os.path.join(base_path, "Orc-Attack01.png"), 100, 100, scale=scale, trim=True)
+            self.animations['hurt'] = load_sprite_sheet(os.path.join(base_path, "Orc-Hurt.png"), 100, 100, scale=scale, trim=True)
+            self.animations['death'] = load_sprite_sheet(os.path.join(base_path, "Orc-Death.png"), 100, 100, scale=scale, trim=True)
+        self.frames = [self.animations[name] for name in STATUS_NAMES]
+        # Varian (cermin, kedip transparan) dibangun sekali: variants[bit varian][status] -> frames
+        clips = [animation_variants(frames, FLIPPED | FADED) for frames in self.frames]
+        self.variants = [[clip[bits] for clip in clips] for bits in range((FLIPPED | FADED) + 1)]
+
+        # Ukuran rect diambil dari frame idle pertama (sama seperti Enemy lama)
+        self.rect_size = self.frames[IDLE][0].get_size()
+        rect_w, rect_h = self.rect_size
+        if key.startswith('orc'):
+            # Hitbox khusus Orc - pas di kaki
+            self.hitbox_size = (int(rect_w * 0.4), 20)
+            self.hitbox_offset_y = 15
+        else:
+            self.hitbox_size = (int(rect_w * 0.7), 15)
+            self.hitbox_offset_y = 0
+
+        self.custom_hitbox, self.hitbox_ref_size = load_custom_hitbox(key)
+
+class Horde:
+    """
+    Penyimpanan musuh berbasis struct-of-arrays.
+    Semua state simulasi (posisi, knockback, HP, timer, animasi) ada di array NumPy
+    dan di-update secara vektor. Sprite Enemy hanya view tipis untuk render.
+    """
+
+    def __init__(self, scene, capacity=256):
+        self.scene = scene
+        self.types = []
+        self.type_ids = {}
+        self.sprites = []
+        self.free_slots = []
+        self.by_uid = {}
+        self.capacity = 0
+        self._grow(capacity)
+
+    # --- Alokasi -------------------------------------------------------
+
+    def _grow(self, new_capacity):
+        old = self.capacity
+
+        def resize(name, shape_tail=(), dtype=np.float64, fill=0):
+            arr = np.full((new_capacity,) + shape_tail, fill, dtype=dtype)
+            if old:
+                arr[:old] = getattr(self, name)
+            setattr(self, name, arr)
+
+        resize('alive', dtype=bool, fill=False)
+        resize('type_id', dtype=np.int16)
+        resize('pos', (2,))
+        resize('prev_pos', (2,)) # Posisi sebelum langkah simulasi (interpolasi render)
+        resize('direction', (2,))
+        resize('knockback', (2,))
+        resize('health')
+        resize('speed')
+        resize('damage')
+        resize('difficulty', fill=1.0)
+        resize('status', dtype=np.int8)
+        resize('frame_index')
+        resize('is_dead', dtype=bool, fill=False)
+        resize('is_hurting', dtype=bool, fill=False)
+        resize('is_flashing', dtype=bool, fill=False)
+        resize('facing_right', dtype=bool, fill=True)
+        resize('hurt_time', dtype=np.int64)
+        resize('flash_time', dtype=np.int64)
+        resize('last_attack_time', dtype=np.int64)
+        resize('report_cell', (2,), dtype=np.int64) # Sel interest terakhir yang dilaporkan ke server
+
+        self.sprites.extend([None] * (new_capacity - old))
+        # Slot kecil dipakai duluan agar data tetap padat
+        self.free_slots.extend(range(new_capacity - 1, old - 1, -1))
+        self.free_slots.sort(reverse=True)
+        self.capacity = new_capacity
+
+    def _acquire_slot(self):
+        if not self.free_slots:
+            self._grow(self.capacity * 2)
+        return self.free_slots.pop()
+
+    def get_type(self, key):
+        if key not in ENEMY_DATA:
+            key = 'orc'
+        if key not in self.type_ids:
+            self.type_ids[key] = len(self.types)
+            self.types.append(EnemyType(len(self.types), key))
+            self._build_type_tables()
+        return self.types[self.type_ids[key]]
+
+    def _build_type_tables(self):
+        # Tabel lookup per tipe untuk dipakai secara vektor
+        self.t_rect_size = np.array([t.rect_size for t in self.types], dtype=np.float64)
+        self.t_hitbox_size = np.array([t.hitbox_size for t in self.types], dtype=np.float64)
+        self.t_hitbox_offset_y = np.array([t.hitbox_offset_y for t in self.types], dtype=np.float64)
+        self.t_chase_range = np.array([t.data['chase_range'] for t in self.types], dtype=np.float64)
+        self.t_attack_range = np.array([t.data['attack_range'] for t in self.types], dtype=np.float64)
+        self.t_anim_len = np.array([[max(1, len(f)) for f in t.frames] for t in self.types], dtype=np.float64)
+        self.t_has_custom_hitbox = np.array([bool(t.custom_hitbox) for t in self.types])
+
+    # --- Spawn / Despawn ----------------------------------------------
+
+    def spawn(self, pos, enemy_type='orc', difficulty=1.0, uid=None):
+        etype = self.get_type(enemy_type)
+        slot = self._acquire_slot()
+        data = etype.data
+
+        self.alive[slot] = True
+        self.type_id[slot] = etype.type_id
+        self.pos[slot] = pos
+        self.prev_pos[slot] = pos
+        self.direction[slot] = 0
+        self.knockback[slot] = 0
+        self.difficulty[slot] = difficulty
+        self.health[slot] = data['health'] * difficulty
+        self.speed[slot] = data['speed'] * (1.0 + (difficulty - 1.0) * 0.3)
+        self.damage[slot] = data['damage'] * difficulty
+        self.status[slot] = IDLE
+        self.frame_index[slot] = 0
+        self.is_dead[slot] = False
+        self.is_hurting[slot] = False
+        self.is_flashing[slot] = False
+        self.facing_right[slot] = True
+        self.hurt_time[slot] = 0
+        self.flash_time[slot] = 0
+        self.last_attack_time[slot] = 0
+        self.report_cell[slot] = np.floor_divide(pos, protocol.INTEREST_CELL)
+
+        from .enemy import Enemy
+        sprite = Enemy(self, slot, etype, uid, [self.scene.camera_group, self.scene.enemy_sprites])
+        self.sprites[slot] = sprite
+        if uid is not None:
+            self.by_uid[uid] = sprite
+        return sprite
+
+    def release(self, sprite):
+        slot = sprite.slot
+        if self.sprites[slot] is not sprite:
+            return
+        self.alive[slot] = False
+        self.sprites[slot] = None
+        self.free_slots.append(slot)
+        if sprite.uid is not None and self.by_uid.get(sprite.uid) is sprite:
+            del self.by_uid[sprite.uid]
+
+    def moved_enemies(self):
+        """
+        [(uid, (x, y))] musuh yang pindah sel interest sejak laporan terakhir. Semua musuh ber-uid ikut
+        (termasuk yang diwarisi lewat migrasi host); server hanya memakai laporan dari owner-nya.
+        """
+        idx = np.flatnonzero(self.alive)
+        cells = np.floor_divide(self.pos[idx], protocol.INTEREST_CELL).astype(np.int64)
+        changed = (cells != self.report_cell[idx]).any(axis=1)
+        idx = idx[changed]
+        self.report_cell[idx] = cells[changed]
+        moves = []
+        for slot in idx.tolist():
+            uid = self.sprites[slot].uid
+            if uid is not None:
+                x, y = self.pos[slot]
+                moves.append((uid, (float(x), float(y))))
+        return moves
+
+    def despawn(self, sprite):
+        """Hapus musuh tanpa loot (bukan kill); server diberi tahu agar tidak lagi mengirimnya ke peer lain."""
+        client = getattr(self.scene.manager, 'network_client', None)
+        if client and sprite.uid is not None:
+            client.send_event('despawn_enemy', {'uid': sprite.uid})
+        sprite.kill()
+
+    def clear(self):
+        for sprite in [s for s in self.sprites if s is not None]:
+            self.despawn(sprite)
+        self.by_uid.clear()
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive))
+
+    # --- Geometri turunan ---------------------------------------------
+
+    def hitbox_centers(self, idx):
+        tid = self.type_id[idx]
+        center = self.pos[idx] + self.t_rect_size[tid] / 2
+        center[:, 1] += self.t_hitbox_offset_y[tid]
+        return center
+
+    def rect_centers(self, idx):
+        return self.pos[idx] + self.t_rect_size[self.type_id[idx]] / 2
+
+    def rebuild_grid(self, grid):
+        """Isi ulang grid spasial dengan pusat hitbox semua slot hidup (id = slot)."""
+        idx = np.flatnonzero(self.alive)
+        grid.rebuild(self.hitbox_centers(idx) if idx.size else np.zeros((0, 2)), idx)
+
+    def living_near(self, center, max_range):
+        """Musuh hidup dalam jarak max_range dari center, urut dari yang terdekat."""
+        grid = self.scene.enemy_grid
+        idx = grid.query_radius((center[0], center[1]), max_range)
+        idx = idx[self.alive[idx] & ~self.is_dead[idx]]
+        if not idx.size:
+            return []
+        # Jarak dihitung ulang dari posisi terkini (grid dibangun di awal frame)
+        dist = np.linalg.norm(self.hitbox_centers(idx) - (center[0], center[1]), axis=1)
+        inside = dist < max_range
+        order = np.lexsort((idx[inside], dist[inside]))
+        return [self.sprites[slot] for slot in idx[inside][order].tolist()]
+
+    # --- Simulasi --------------------------------------------------------
+
+    def update(self, dt):
+        idx = np.flatnonzero(self.alive)
+        if not idx.size:
+            return
+
+        scene = self.scene
+        player = scene.player
+        now = sim_clock.get_ticks()
+        player_pos = np.array((player.pos.x, player.pos.y))
+
+        # Despawn jika terlalu jauh untuk jaga performa
+        dist_sq = ((self.pos[idx] - player_pos) ** 2).sum(axis=1)
+        far = dist_sq > DESPAWN_DIST_SQ
+        if far.any():
+            for slot in idx[far].tolist():
+                self.despawn(self.sprites[slot])
+            idx = idx[~far]
+            dist_sq = dist_sq[~far]
+            if not idx.size:
+                return
+
+        obstacles = self._gather_obstacles()
+
+        # Musuh jauh (>3000px) hanya proses fisika knockback
+        dormant = dist_sq > DORMANT_DIST_SQ
+        dead = self.is_dead[idx] & ~dormant
+        live = ~self.is_dead[idx] & ~dormant
+
+        self._apply_knockback(idx[dormant], dt, obstacles)
+
+        if dead.any():
+            self._update_dead(idx[dead], dt)
+
+        live_idx = idx[live]
+        if live_idx.size:
+            live_idx = self._update_status(live_idx, now)
+            self._check_player_attacks(live_idx, now)
+            self._ai_logic(live_idx, dt, now, obstacles)
+            self._apply_knockback(live_idx, dt, obstacles)
+            self._animate(live_idx, dt)
+
+            dir_x = self.direction[live_idx, 0]
+            self.facing_right[live_idx[dir_x > 0]] = True
+            self.facing_right[live_idx[dir_x < 0]] = False
+
+        # Terapkan knockback selalu (hanya yang masih hidup sebagai slot)
+        active = idx[~dormant & self.alive[idx]]
+        self._apply_knockback(active, dt, obstacles)
+
+        # Reset flash setelah 150ms
+        flashing = idx[self.is_flashing[idx]]
+        self.is_flashing[flashing[now - self.flash_time[flashing] > FLASH_DURATION]] = False
+
+        self._sync_sprites(now)
+
+    def _update_dead(self, idx, dt):
+        tid = self.type_id[idx]
+        last_frame = self.t_anim_len[tid, DEATH] - 1
+        finished = self.frame_index[idx] >= last_frame
+
+        # Animasi kematian (berhenti di frame terakhir)
+        playing = idx[~finished]
+        self.status[playing] = DEATH
+        self.frame_index[playing] = np.minimum(
+            self.frame_index[playing] + ANIMATION_SPEED * dt * 60,
+            self.t_anim_len[self.type_id[playing], DEATH] - 1)
+
+        for slot in idx[finished].tolist():
+            self._drop_loot(self.sprites[slot])
+
+    def _drop_loot(self, sprite):
+        scene = self.scene
+        visual_groups = [scene.camera_group]
+        DeathEffect.spawn(sprite.rect.center, visual_groups)
+        for _ in range(6): ExperienceGem.spawn(sprite.rect.center, visual_groups, scene.player)
+
+        # Drop Health Potion (10% chance)
+        if random.random() < 0.10:
+            HealthPotion(sprite.rect.center, visual_groups, scene.player)
+
+        # Beri tahu Network (Jika Host)
+        client = getattr(scene.manager, 'network_client', None)
+        if client and client.is_host:
+            client.send_event('kill_enemy', {'uid': sprite.uid})
+
+        sprite.kill()
+
+    def _update_status(self, idx, now):
+        # Prioritas 1: Mati
+        dying = self.health[idx] <= 0
+        if dying.any():
+            newly_dead = idx[dying]
+            self.is_dead[newly_dead] = True
+            self.status[newly_dead] = DEATH
+            idx = idx[~dying]
+
+        # Prioritas 2: Kena Hit (Stun)
+        hurting = self.is_hurting[idx]
+        hurt_idx = idx[hurting]
+        self.status[hurt_idx] = HURT
+        self.is_hurting[hurt_idx[now - self.hurt_time[hurt_idx] > HURT_STUN_DURATION]] = False
+
+        # Prioritas 3: Serang (Kunci animasi), Prioritas 4: Gerak
+        free = idx[~hurting & (self.status[idx] != ATTACK)]
+        moving = np.any(self.direction[free] != 0, axis=1)
+        self.status[free] = np.where(moving, WALK, IDLE)
+        return idx
+
+    def _check_player_attacks(self, idx, now):
+        player = self.scene.player
+        # Gaya Survivors: Cek daftar hitbox atau satu hitbox
+        hitboxes = getattr(player, 'attack_hitboxes', [])
+        if not hitboxes and getattr(player, 'attack_hitbox', None):
+            hitboxes = [player.attack_hitbox]
+        if not hitboxes:
+            return
+
+        idx = idx[~self.is_hurting[idx]]
+        if not idx.size:
+            return
+
+        # Broad phase AABB secara vektor, SAT hanya untuk kandidat
+        tid = self.type_id[idx]
+        center = self.hitbox_centers(idx)
+        half = self.t_hitbox_size[tid] / 2
+        lo = center - half
+        hi = center + half
+        hit = np.zeros(idx.size, dtype=bool)
+        for hb in hitboxes:
+            hit |= ((lo[:, 0] <= hb.right) & (hb.left <= hi[:, 0]) &
+                    (lo[:, 1] <= hb.bottom) & (hb.top <= hi[:, 1]))
+        if not hit.any():
+            return
+
+        game = self.scene.manager
+        kb_strength = player.weapon_data.get('knockback', 10)
+        player_center = pygame.math.Vector2(player.rect.center)
+        for slot in idx[hit].tolist():
+            sprite = self.sprites[slot]
+            if self.t_has_custom_hitbox[self.type_id[slot]]:
+                points = sprite.get_world_hitbox_points()
+                if not any(SAT.collides(points, hb) for hb in hitboxes):
+                    continue
+
+            # Deal damage
+            damage_dealt = player.damage
+            self.health[slot] -= damage_dealt
+
+            # Lifesteal logic
+            if getattr(player, 'lifesteal', 0) > 0:
+                hp_gain = damage_dealt * player.lifesteal
+                player.health = min(player.max_health, player.health + hp_gain)
+
+            HitSpark.spawn(sprite.hitbox.center, [self.scene.camera_group])
+
+            kb_direction = pygame.math.Vector2(sprite.rect.center) - player_center
+            if kb_direction.magnitude() > 0:
+                self.knockback[slot] = kb_direction.normalize() * kb_strength
+
+            # Efek Hit Stop
+            if not game.is_hit_stopped:
+                game.is_hit_stopped = True
+                game.hit_stop_timer = now
+
+            if self.health[slot] <= 0:
+                self.is_dead[slot] = True
+            else:
+                self.is_hurting[slot] = True
+                self.hurt_time[slot] = now
+            self.frame_index[slot] = 0
+
+    def _targets(self):
+        # Pemain lokal + remote player (target terdekat dipilih per musuh)
+        targets = [self.scene.player]
+        targets.extend(self.scene.remote_players.sprites())
+        positions = np.array([(t.pos.x, t.pos.y) for t in targets], dtype=np.float64)
+        return targets, positions
+
+    def _ai_logic(self, idx, dt, now, obstacles):
+        # Kunci Prioritas: Jika menyerang, jangan update gerakan
+        attacking = self.status[idx] == ATTACK
+        self.direction[idx[attacking]] = 0
+        idx = idx[~attacking]
+        if not idx.size:
+            return
+
+        # 1. Kejar target terdekat (lokal atau remote)
+        targets, target_pos = self._targets()
+        pos = self.pos[idx]
+        deltas = target_pos[None, :, :] - pos[:, None, :]
+        dists_sq = (deltas ** 2).sum(axis=2)
+        nearest = dists_sq.argmin(axis=1)
+        distance = np.sqrt(dists_sq[np.arange(idx.size), nearest])
+
+        tid = self.type_id[idx]
+        in_chase = distance < self.t_chase_range[tid]
+        approach = in_chase & (distance > self.t_attack_range[tid] * 0.8)
+
+        # Arah dari flow field target (memutari rintangan), satu lookup per musuh
+        direction = np.zeros((idx.size, 2))
+        flow_fields = self.scene.flow_fields
+        centers = self.hitbox_centers(idx)
+        for target_no in np.unique(nearest[approach]).tolist():
+            rows = np.flatnonzero(approach & (nearest == target_no))
+            direction[rows] = flow_fields.steer(targets[target_no], centers[rows])
+        self.direction[idx] = direction
+
+        # 2. Logika Serang
+        in_range = in_chase & ~approach
+        if in_range.any():
+            ready = in_range & (now - self.last_attack_time[idx] > ENEMY_ATTACK_COOLDOWN)
+            for row in np.flatnonzero(ready).tolist():
+                slot = idx[row]
+                self.status[slot] = ATTACK
+                self.frame_index[slot] = 0
+                self.last_attack_time[slot] = now
+                target = targets[nearest[row]]
+                if hasattr(target, 'take_damage'):
+                    target.take_damage(self.damage[slot], pygame.math.Vector2(self.pos[slot].tolist()))
+
+        # 3. Separasi (Hindari Penumpukan)
+        separation = self._separation(idx)
+
+        # Campur semua perilaku
+        # Kejar (bobot 1.0) + Separasi (bobot 2.0)
+        final_dir = direction + separation * 2.0
+        norm = np.linalg.norm(final_dir, axis=1, keepdims=True)
+        final_dir = np.divide(final_dir, norm, out=np.zeros_like(final_dir), where=norm > 0)
+
+        velocity = final_dir * (self.speed[idx] * dt * 60)[:, None]
+        self._move(idx, velocity, obstacles)
+
+    def _separation(self, idx):
+        # Tetangga nyata dalam SEPARATION_RADIUS dari grid, maksimal k terdekat per musuh
+        grid = self.scene.enemy_grid
+        separation = np.zeros((idx.size, 2))
+        i, j, diff, dist = grid.neighbor_pairs(SEPARATION_RADIUS, k=SEPARATION_SAMPLES)
+        if not i.size:
+            return separation
+
+        me = grid.ids[i]
+        other = grid.ids[j]
+        valid = self.alive[other]
+        me, other, diff, dist = me[valid], other[valid], diff[valid], dist[valid]
+
+        # Posisi identik: arah dorong deterministik dari pasangan slot, berlawanan untuk masing-masing
+        overlap = dist == 0
+        if overlap.any():
+            lo = np.minimum(me[overlap], other[overlap])
+            hi = np.maximum(me[overlap], other[overlap])
+            angle = ((lo * 73856093) ^ (hi * 19349663)) % 360 * (np.pi / 180)
+            sign = np.where(me[overlap] < other[overlap], 1.0, -1.0)
+            diff[overlap] = np.stack((np.cos(angle), np.sin(angle)), axis=1) * sign[:, None]
+            dist[overlap] = 1.0
+
+        # Soft-force: strength decreases linearly with distance
+        weight = (SEPARATION_RADIUS - dist) / SEPARATION_RADIUS / dist
+        push_x = np.bincount(me, weights=diff[:, 0] * weight, minlength=self.capacity)
+        push_y = np.bincount(me, weights=diff[:, 1] * weight, minlength=self.capacity)
+        separation = np.stack((push_x[idx], push_y[idx]), axis=1)
+        norm = np.linalg.norm(separation, axis=1, keepdims=True)
+        return np.divide(separation, norm, out=np.zeros_like(separation), where=norm > 0)
+
+    def _gather_obstacles(self):
+        # Rintangan statis (pohon/batu) lewat indeks chunk, dinamis (peti) dari obstacle_sprites
+        index = self.scene.obstacle_index
+        sprites = self.scene.obstacle_sprites.sprites()
+        if not sprites and not len(index.chunks):
+            return None
+        hit = [getattr(s, 'hitbox', s.rect) for s in sprites]
+        return {
+            'index': index,
+            'dynamic': np.array([(r.left, r.top, r.right, r.bottom) for r in hit], dtype=np.float64).reshape(-1, 4),
+        }
+
+    def _nearby_boxes(self, center, half, obstacles):
+        """
+        Kandidat hitbox rintangan per musuh: (rows, boxes) dengan boxes array (len(rows), C, 4).
+        Hanya baris yang punya rintangan di dekatnya; slot kosong berisi NaN.
+        """
+        rows, boxes = obstacles['index'].candidates(center, half)
+        dynamic = obstacles['dynamic']
+        if len(dynamic):
+            # Rintangan dinamis sedikit: cek ke semua baris
+            static = np.full((len(center), boxes.shape[1], 4), np.nan)
+            static[rows] = boxes
+            rows = np.arange(len(center))
+            boxes = np.concatenate((static, np.broadcast_to(dynamic, (len(center),) + dynamic.shape)), axis=1)
+        return rows, boxes
+
+    @staticmethod
+    def _overlaps(center, half, boxes):
+        # AABB (center +- half) vs kandidat per baris; NaN selalu False
+        return ((center[:, None, 0] - half[:, None, 0] < boxes[:, :, 2]) &
+                (boxes[:, :, 0] < center[:, None, 0] + half[:, None, 0]) &
+                (center[:, None, 1] - half[:, None, 1] < boxes[:, :, 3]) &
+                (boxes[:, :, 1] < center[:, None, 1] + half[:, None, 1]))
+
+    def _move(self, idx, velocity, obstacles):
+        if obstacles is None:
+            self.pos[idx] += velocity
+            return
+
+        # Step velocity untuk cegah phasing
+        magnitude = np.linalg.norm(velocity, axis=1)
+        num_steps = (magnitude / COLLISION_STEP).astype(np.int64) + 1
+        step_vel = velocity / num_steps[:, None]
+        for step in range(int(num_steps.max())):
+            active = num_steps > step
+            sub_idx = idx[active]
+            sub_vel = step_vel[active]
+            for axis in (0, 1):
+                self.pos[sub_idx, axis] += sub_vel[:, axis]
+                with profiler.scope('collision'):
+                    self._resolve_axis(sub_idx, sub_vel[:, axis], axis, obstacles)
+
+    def _resolve_axis(self, idx, vel, axis, obstacles):
+        moving = vel != 0
+        if not moving.any():
+            return
+        idx = idx[moving]
+        vel = vel[moving]
+
+        tid = self.type_id[idx]
+        center = self.hitbox_centers(idx)
+        half = self.t_hitbox_size[tid] / 2
+        near, boxes = self._nearby_boxes(center, half, obstacles)
+        if not near.size:
+            return
+        idx, vel, center, half = idx[near], vel[near], center[near], half[near]
+        overlap = self._overlaps(center, half, boxes)
+        hit = overlap.any(axis=1)
+        if not hit.any():
+            return
+
+        overlap = overlap[hit]
+        boxes = boxes[hit]
+        near_edge = np.where(overlap, boxes[:, :, axis], np.inf).min(axis=1)
+        far_edge = np.where(overlap, boxes[:, :, axis + 2], -np.inf).max(axis=1)
+        half_axis = half[hit, axis]
+        new_center = np.where(vel[hit] > 0, near_edge - half_axis, far_edge + half_axis)
+        self.pos[idx[hit], axis] += new_center - center[hit, axis]
+
+    def _apply_knockback(self, idx, dt, obstacles):
+        if not idx.size:
+            return
+        strong = np.linalg.norm(self.knockback[idx], axis=1) > 0.1
+        self.knockback[idx[~strong]] = 0
+        kb_idx = idx[strong]
+        if not kb_idx.size:
+            return
+        self._move(kb_idx, self.knockback[kb_idx] * dt * 60, obstacles)
+        # Smooth decay (Softened for better feel)
+        self.knockback[kb_idx] *= pow(0.85, dt * 60)
+
+    def _animate(self, idx, dt):
+        status = self.status[idx]
+        speed = np.where(status == ATTACK, ATTACK_ANIMATION_SPEED, ANIMATION_SPEED)
+        frame = self.frame_index[idx] + speed * dt * 60
+        length = self.t_anim_len[self.type_id[idx], status]
+        done = frame >= length
+
+        # Serang/Luka selesai -> kembali idle, mati berhenti di frame terakhir, lainnya loop
+        reset_idle = done & ((status == ATTACK) | (status == HURT))
+        self.is_hurting[idx[done & (status == HURT)]] = False
+        frame = np.where(done & (status == DEATH), length - 1, frame)
+        frame = np.where(done & (status != DEATH), 0, frame)
+        status = np.where(reset_idle, IDLE, status)
+
+        self.frame_index[idx] = frame
+        self.status[idx] = status
+
+    # --- View Sprite ----------------------------------------------------
+
+    def begin_step(self):
+        self.prev_pos[:] = self.pos
+
+    def _visible(self, idx, margin=200):
+        # Musuh di dalam (atau dekat) layar kamera
+        cam = self.scene.camera_group
+        view_w, view_h = cam.virtual_surface.get_size()
+        size = self.t_rect_size[self.type_id[idx]]
+        pos = self.pos[idx]
+        return idx[(pos[:, 0] + size[:, 0] > cam.offset.x - margin) & (pos[:, 0] < cam.offset.x + view_w + margin) &
+                   (pos[:, 1] + size[:, 1] > cam.offset.y - margin) & (pos[:, 1] < cam.offset.y + view_h + margin)]
+
+    def render_offsets(self, alpha, offsets):
+        """Tambahkan offset interpolasi (prev -> pos) untuk musuh yang terlihat ke dict offsets."""
+        idx = np.flatnonzero(self.alive)
+        if not idx.size:
+            return
+        vis = self._visible(idx)
+        delta = np.rint((self.prev_pos[vis] - self.pos[vis]) * (1 - alpha)).astype(np.int64)
+        moved = np.any(delta != 0, axis=1)
+        sprites = self.sprites
+        for slot, dx, dy in zip(vis[moved].tolist(), delta[moved, 0].tolist(), delta[moved, 1].tolist()):
+            offsets[sprites[slot]] = (dx, dy)
+
+    def _sync_sprites(self, now):
+        idx = np.flatnonzero(self.alive)
+        if not idx.size:
+            return
+
+        top_left = self.pos[idx].astype(np.int64)
+        sprites = self.sprites
+        for slot, x, y in zip(idx.tolist(), top_left[:, 0].tolist(), top_left[:, 1].tolist()):
+            sprites[slot].rect.topleft = (x, y)
+
+        # Gambar hanya di-update untuk musuh yang dekat layar
+        blink = (now // 50) % 2 == 0
+        vis = self._visible(idx)
+        hidden = self.is_hurting[vis] | self.is_flashing[vis] if blink else np.zeros(vis.size, dtype=bool)
+        # Varian: cermin jika menghadap kiri, transparan saat berkedip (Hurt atau Flash dari Aura)
+        bits = np.where(self.facing_right[vis], 0, FLIPPED) | np.where(hidden, FADED, 0)
+        rows = zip(vis.tolist(), self.type_id[vis].tolist(), bits.tolist(), self.status[vis].tolist(),
+                   self.frame_index[vis].astype(np.int64).tolist())
+        types = self.types
+        for slot, tid, variant, status, frame in rows:
+            frames = types[tid].variants[variant][status]
+            if frames:
+                sprites[slot].image = frames[min(frame, len(frames) - 1)]
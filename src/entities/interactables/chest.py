@@ -1,7 +1,7 @@
 import pygame
 from ...utils import load_sprite_sheet
 from .interactable import Interactable
-from ...vfx.particles import LootParticle # Will need to update this import later
+from ...vfx.particles import active_particles
 
 class Chest(Interactable):
     def __init__(self, pos, groups):
@@ -10,13 +10,6 @@ class Chest(Interactable):
         if not groups:
             print("WARNING: Chest initialized with empty groups!")
         
-        # Identify visual group for VFX
-        self.vfx_group = None
-        for g in groups:
-            if hasattr(g, 'custom_draw'):
-                self.vfx_group = g
-                break
-        
         # Load Assets
         try:
             full_sheet = load_sprite_sheet("assets/Animated Chests/Chests.png", 48, 32, scale=2.0)
@@ -75,8 +68,8 @@ class Chest(Interactable):
                 print("Chest Opened!")
                 
                 # Spawn Loot Particles
-                if hasattr(self, 'vfx_group') and self.vfx_group:
-                    for _ in range(15):
-                        LootParticle(self.rect.center, [self.vfx_group])
+                particles = active_particles()
+                if particles is not None:
+                    particles.loot.spawn(self.rect.center, count=15)
             
             self.image = self.animations['open'][int(self.frame_index)]
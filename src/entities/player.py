@@ -4,15 +4,17 @@ import os
 import math
 from .entity import Entity
 from ..settings import *
-from ..utils import load_sprite_sheet
-from ..vfx import GhostSprite, WalkParticle, SlashEffect
+from ..utils import load_sprite_sheet, animation_variants, FADED
+from ..vfx import SlashEffect, active_particles
 from ..core.input import InputManager
+from ..core import sim_clock
 
 class Player(Entity):
-    def __init__(self, pos, groups, obstacle_sprites, enemy_sprites, char_type='adventurer'):
+    def __init__(self, pos, groups, obstacle_sprites, enemy_sprites, char_type='adventurer', obstacle_index=None):
         super().__init__(pos, groups)
         self.char_config = CHARACTER_DATA.get(char_type, CHARACTER_DATA['adventurer'])
         self.obstacle_sprites = obstacle_sprites
+        self.obstacle_index = obstacle_index # Rintangan statis (pohon/batu) per chunk
         self.enemy_sprites = enemy_sprites
         
         # Stats dari config
@@ -150,10 +152,14 @@ class Player(Entity):
                 self.animations[f'attack_{d}'] = load_sprite_sheet(os.path.join(base_path, "ATTACK 1", f"attack1_{d}.png"), 96, 80, scale=scale, trim=True)
                 self.animations[f'hurt_{d}'] = self.animations[f'idle_{d}']
                 self.animations['death'] = self.animations[f'idle_down']
+
+        # Varian transparan untuk kedipan luka (frame cache dibagi, jangan di-set_alpha langsung)
+        self.blink_animations = {status: animation_variants(frames, FADED, faded_alpha=100)[FADED]
+                                 for status, frames in self.animations.items()}
         
 
     def input(self):
-        current_time = pygame.time.get_ticks()
+        current_time = sim_clock.get_ticks()
         self.direction = InputManager.get_movement_vector()
         
         if self.direction.magnitude() > 0:
@@ -167,7 +173,7 @@ class Player(Entity):
 
         if not auto_attack:
             # Manual Aiming & Attack
-            mouse_pos = pygame.math.Vector2(pygame.mouse.get_pos())
+            mouse_pos = pygame.math.Vector2(InputManager.get_mouse_pos())
             rel_pos = mouse_pos - pygame.math.Vector2(SCREEN_WIDTH//2, SCREEN_HEIGHT//2)
             aim_angle = 0
             if rel_pos.magnitude() > 0:
@@ -195,7 +201,7 @@ class Player(Entity):
                 self.dash_direction = self.direction.copy() if self.direction.magnitude() > 0 else self._get_facing_direction_vec()
 
     def auto_attack_logic(self):
-        current_time = pygame.time.get_ticks()
+        current_time = sim_clock.get_ticks()
         
         # Cek Setting
         if not getattr(self.game.active_scene, 'auto_attack', True):
@@ -214,24 +220,27 @@ class Player(Entity):
             if not self.enemy_sprites:
                 continue
 
-            # Filter musuh valid
-            candidates = [e for e in self.enemy_sprites if not (hasattr(e, 'is_dead') and e.is_dead)]
-            
             # Urutkan berdasarkan jarak
             player_center = pygame.math.Vector2(self.hitbox.center)
             MAX_AUTO_AIM_RANGE = w_data.get('range', 500) if w_id == 'fireball' else 500
             
-            valid_targets = []
-            for enemy in candidates:
-                dist = player_center.distance_to(pygame.math.Vector2(enemy.hitbox.center))
-                if dist < MAX_AUTO_AIM_RANGE:
-                    valid_targets.append((dist, enemy))
+            horde = getattr(self.game.active_scene, 'horde', None) if self.game else None
+            if horde is not None:
+                # Query vektor langsung ke array Horde
+                sorted_enemies = horde.living_near(player_center, MAX_AUTO_AIM_RANGE)
+            else:
+                # Filter musuh valid
+                candidates = [e for e in self.enemy_sprites if not (hasattr(e, 'is_dead') and e.is_dead)]
+                valid_targets = []
+                for enemy in candidates:
+                    dist = player_center.distance_to(pygame.math.Vector2(enemy.hitbox.center))
+                    if dist < MAX_AUTO_AIM_RANGE:
+                        valid_targets.append((dist, enemy))
+                valid_targets.sort(key=lambda x: x[0]) # Ascending
+                sorted_enemies = [x[1] for x in valid_targets]
             
-            if not valid_targets:
+            if not sorted_enemies:
                 continue
-                
-            valid_targets.sort(key=lambda x: x[0]) # Ascending
-            sorted_enemies = [x[1] for x in valid_targets]
             
             # Logika Serang
             proj_count = w_data.get('projectile_count', 1)
@@ -307,8 +316,8 @@ class Player(Entity):
                  rad = math.radians(shot_angle)
                  dir_vec = pygame.math.Vector2(math.cos(rad), math.sin(rad))
                  # Kirim stats
-                 Fireball(self.rect.center, groups, dir_vec, self, self.obstacle_sprites, self.enemy_sprites, damage=w_data['damage'], speed=w_data['speed'])
-                 Fireball(self.rect.center, groups, dir_vec, self, self.obstacle_sprites, self.enemy_sprites, damage=w_data['damage'], speed=w_data['speed'])
+                 Fireball(self.rect.center, groups, dir_vec, self, self.obstacle_sprites, self.enemy_sprites, damage=w_data['damage'], speed=w_data['speed'], obstacle_index=self.obstacle_index)
+                 Fireball(self.rect.center, groups, dir_vec, self, self.obstacle_sprites, self.enemy_sprites, damage=w_data['damage'], speed=w_data['speed'], obstacle_index=self.obstacle_index)
             
             if self.game and hasattr(self.game, 'network_client') and self.game.network_client:
                  self.game.network_client.send_event('attack', {'weapon': weapon_id, 'angles': angles})
@@ -344,23 +353,27 @@ class Player(Entity):
         if self.game and hasattr(self.game, 'network_client') and self.game.network_client:
              self.game.network_client.send_event('attack', {'weapon': weapon_id, 'angles': angles})
 
-        self.attack_active_time = pygame.time.get_ticks() 
+        self.attack_active_time = sim_clock.get_ticks() 
 
     def update_aura(self):
         if 'aura' not in self.weapons:
             return
             
         data = self.weapons['aura']
-        current_time = pygame.time.get_ticks()
+        current_time = sim_clock.get_ticks()
         
         if current_time - self.aura_tick_timer > data['cooldown']:
             # Logika Tick
-            targets = [e for e in self.enemy_sprites if not (hasattr(e, 'is_dead') and e.is_dead)]
             radius = data['range']
             damage = data['damage']
             
             hit_any = False
             player_center = pygame.math.Vector2(self.hitbox.center)
+            horde = getattr(self.game.active_scene, 'horde', None) if self.game else None
+            if horde is not None:
+                targets = horde.living_near(player_center, radius)
+            else:
+                targets = [e for e in self.enemy_sprites if not (hasattr(e, 'is_dead') and e.is_dead)]
             for enemy in targets:
                 # Fix: Pastikan musuh punya hitbox
                 if not hasattr(enemy, 'hitbox'): continue
@@ -378,7 +391,7 @@ class Player(Entity):
                         from ..vfx import HitSpark
                         visual_groups = [g for g in self.groups() if hasattr(g, 'custom_draw')]
                         if not visual_groups and self.groups(): visual_groups = [self.groups()[0]]
-                        HitSpark(enemy.hitbox.center, visual_groups)
+                        HitSpark.spawn(enemy.hitbox.center, visual_groups)
                         
                         hit_any = True
                 
@@ -410,7 +423,7 @@ class Player(Entity):
             self.knockback_vector = pygame.math.Vector2()
 
     def update(self, dt):
-        current_time = pygame.time.get_ticks()
+        current_time = sim_clock.get_ticks()
         
         # Regen Stamina
         if not self.is_dashing:
@@ -433,13 +446,17 @@ class Player(Entity):
             
             self.ghost_timer += dt * 1000
             if self.ghost_timer > 30: # tiap 30ms
-                GhostSprite(self.rect.topleft, self.image, self.groups())
+                particles = active_particles()
+                if particles is not None:
+                    particles.ghost.spawn(self.rect.topleft, self.image)
                 self.ghost_timer = 0
                 
         if self.direction.magnitude() > 0 and not self.is_dashing:
             self.walk_particle_timer += dt * 1000
             if self.walk_particle_timer > 100: # tiap 100ms
-                WalkParticle(self.hitbox.center, self.groups())
+                particles = active_particles()
+                if particles is not None:
+                    particles.walk.spawn(self.hitbox.center)
                 self.walk_particle_timer = 0
                 
         # Hapus hitbox serangan setelah durasi singkat (150ms)
@@ -449,15 +466,14 @@ class Player(Entity):
                 self.attack_hitboxes = []
             
         # Kedipan Luka
-        if self.is_hurting:
-            alpha = 100 if (pygame.time.get_ticks() // 50) % 2 == 0 else 255
-            self.image.set_alpha(alpha)
-        else:
-            self.image.set_alpha(255)
+        if self.is_hurting and (sim_clock.get_ticks() // 50) % 2 == 0:
+            frames = self.blink_animations.get(self.status)
+            if frames:
+                self.image = frames[min(int(self.frame_index), len(frames) - 1)]
 
     def get_status(self):
         # 1. Cek Pemulihan Luka
-        if self.is_hurting and pygame.time.get_ticks() - self.hurt_time > 300:
+        if self.is_hurting and sim_clock.get_ticks() - self.hurt_time > 300:
             self.is_hurting = False
 
         # 2. Cegah status gerak menimpa animasi aktif
@@ -486,19 +502,21 @@ class Player(Entity):
         dummy = pygame.sprite.Sprite()
         dummy.rect = broad_rect
         
-        # Ambil kandidat (C-optimized)
-        nearby_obstacles = pygame.sprite.spritecollide(dummy, obstacle_sprites, False)
+        # Rintangan statis dari indeks chunk (lookup tile, bukan scan semua pohon)
+        hitboxes = self.obstacle_index.query(broad_rect) if self.obstacle_index is not None else []
         
-        targets = list(nearby_obstacles)
+        # Rintangan dinamis (peti, dll) - C-optimized
+        if obstacle_sprites:
+            nearby_obstacles = pygame.sprite.spritecollide(dummy, obstacle_sprites, False)
+            hitboxes += [getattr(sprite, 'hitbox', sprite.rect) for sprite in nearby_obstacles]
         
         # Hanya tabrak musuh jika TIDAK dashing (Phasing)
         if enemy_sprites and not self.is_dashing:
             # Filter musuh juga? Biasanya lebih sedikit dari rintangan
             nearby_enemies = pygame.sprite.spritecollide(dummy, enemy_sprites, False)
-            targets += [e for e in nearby_enemies if hasattr(e, 'is_dead') and not e.is_dead]
+            hitboxes += [e.hitbox for e in nearby_enemies if hasattr(e, 'is_dead') and not e.is_dead]
         
-        for sprite in targets:
-            target_hitbox = getattr(sprite, 'hitbox', sprite.rect)
+        for target_hitbox in hitboxes:
             if target_hitbox.colliderect(self.hitbox):
                 if direction == 'horizontal':
                     if vel > 0: self.hitbox.right = target_hitbox.left
@@ -520,7 +538,7 @@ class Player(Entity):
         
         self.health -= amount
         self.is_hurting = True
-        self.hurt_time = pygame.time.get_ticks()
+        self.hurt_time = sim_clock.get_ticks()
         self.status = f'hurt_{self.facing_direction}'
         self.frame_index = 0
         
@@ -5,6 +5,10 @@ from ..settings import TILE_SIZE
 from ..utils import load_sprite_sheet
 
 class Tree(pygame.sprite.Sprite):
+    # Baked frames (tree + shadow) shared by every tree of the same variant
+    _FRAME_CACHE = {}
+    render_static = True # Never moves (CameraGroup culls it through its static grid)
+
     def __init__(self, pos, groups, obstacles_group, variant='big'):
         super().__init__(groups)
         self.z_layer = 1 # Above floor
@@ -39,6 +43,28 @@ class Tree(pygame.sprite.Sprite):
         }
         
         cfg = configs.get(variant, configs['big'])
+        if variant not in Tree._FRAME_CACHE:
+            Tree._FRAME_CACHE[variant] = self._bake_frames(cfg)
+        self.frames = Tree._FRAME_CACHE[variant]
+
+        # Animation State
+        self.frame_index = random.randint(0, len(self.frames) - 1) 
+        self.animation_speed = random.uniform(1.5, 2.5) 
+        
+        self.image = self.frames[int(self.frame_index)]
+        self.rect = self.image.get_rect(topleft=pos)
+        
+        # Hitbox
+        hw, hh = cfg['hitbox']
+        self.hitbox = pygame.Rect(0, 0, hw, hh)
+        self.hitbox.midbottom = self.rect.midbottom
+        self.hitbox.y += cfg['hitbox_offset']
+        
+        if obstacles_group is not None:
+            obstacles_group.add(self)
+
+    @staticmethod
+    def _bake_frames(cfg):
         w, h = cfg['size']
         
         # Load Frames
@@ -55,7 +81,7 @@ class Tree(pygame.sprite.Sprite):
             shadow_surf = pygame.image.load(cfg['shadow_path']).convert_alpha()
         
         # Bake Shadows into Frames
-        self.frames = []
+        frames = []
         for frame in raw_frames:
             # We create a final surface to catch shadows if the frame is too small
             # (Though usually trees are tall enough)
@@ -68,23 +94,8 @@ class Tree(pygame.sprite.Sprite):
                 final_surf.blit(shadow_surf, (sh_x, sh_y))
                 # Blit the tree AGAIN on top of shadow to ensure trunk is over it
                 final_surf.blit(frame, (0, 0))
-            self.frames.append(final_surf)
-
-        # Animation State
-        self.frame_index = random.randint(0, len(self.frames) - 1) 
-        self.animation_speed = random.uniform(1.5, 2.5) 
-        
-        self.image = self.frames[int(self.frame_index)]
-        self.rect = self.image.get_rect(topleft=pos)
-        
-        # Hitbox
-        hw, hh = cfg['hitbox']
-        self.hitbox = pygame.Rect(0, 0, hw, hh)
-        self.hitbox.midbottom = self.rect.midbottom
-        self.hitbox.y += cfg['hitbox_offset']
-        
-        if obstacles_group is not None:
-            obstacles_group.add(self)
+            frames.append(final_surf)
+        return frames
 
     def animate(self, dt):
         if len(self.frames) > 1:
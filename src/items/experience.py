@@ -1,11 +1,12 @@
 import pygame
 import random
+from ..core.pool import PooledSprite
 
-class ExperienceGem(pygame.sprite.Sprite):
+class ExperienceGem(PooledSprite):
     _CACHED_IAMGE = None
 
-    def __init__(self, pos, groups, player):
-        super().__init__(groups)
+    def reset(self, pos, groups, player):
+        self.add(groups)
         self.player = player
         self.z_layer = 0
         self.size = 12
@@ -1,14 +1,18 @@
 import pygame
 import sys
+import time
 from .settings import *
-from .shaders import ShaderPipeline
-from .utils import debug_log
+from .utils import debug_log, load_atlas
 from .scenes.menu import MenuScene
 from .scenes.char_select import CharacterSelectionScene
 from .scenes.game import GameScene
+from .core.input import InputManager, BotInput
+from .core import profiler
 
 class GameManager:
-    def __init__(self):
+    def __init__(self, headless=False):
+        # Headless: tanpa window/OpenGL/shader, hanya simulasi (benchmark, server)
+        self.headless = headless
         pygame.init()
         # State Layar
         self.res_index = 0
@@ -17,6 +21,9 @@ class GameManager:
         
         # Setup Window Awal
         self.apply_display_settings()
+        # Atlas tekstur (opsional, tools/atlas_builder.py): butuh display untuk convert_alpha
+        atlas_sheets = load_atlas()
+        debug_log(f"Atlas: {atlas_sheets} sheet")
         
         pygame.display.set_caption(TITLE)
         self.clock = pygame.time.Clock()
@@ -43,6 +50,16 @@ class GameManager:
         self.debug_mode = DEBUG_MODE
         
     def apply_display_settings(self):
+        if self.headless:
+            # Display 1x1 (driver dummy) hanya agar convert_alpha() bisa dipakai loader aset
+            self.screen = pygame.display.set_mode((1, 1))
+            self.render_surface = pygame.Surface(self.resolution)
+            self.ui_surface = pygame.Surface(self.resolution, pygame.SRCALPHA)
+            self.sprite_batch = None
+            debug_log(f"Headless Display: {self.resolution}")
+            return
+
+        from .shaders import ShaderPipeline
         flags = pygame.OPENGL | pygame.DOUBLEBUF
         if self.fullscreen:
             flags |= pygame.FULLSCREEN
@@ -54,7 +71,9 @@ class GameManager:
         if hasattr(self, 'shaders'):
             self.shaders.resize(self.resolution)
         else:
-            self.shaders = ShaderPipeline(self.resolution)
+            self.shaders = ShaderPipeline(self.resolution, sprite_batch=GPU_SPRITES)
+        # Batcher sprite GPU (None jika GPU_SPRITES mati): GameScene merekam dunia ke sini
+        self.sprite_batch = self.shaders.sprite_batch
             
         debug_log(f"Display Settings Applied: {self.resolution}, Fullscreen: {self.fullscreen}")
 
@@ -66,14 +85,16 @@ class GameManager:
             self.clock.tick(FPS) 
         
     def run(self):
+        # Simulasi langkah tetap (SIM_RATE Hz) + akumulator; render bebas dan menginterpolasi sisanya
+        sim_dt = 1.0 / SIM_RATE
+        accumulator = 0.0
         while self.running:
-            # Hitung Delta Time sekali per frame
-            dt = self.clock.tick(FPS) / 1000.0
-            # Cap keamanan: Jangan pernah lompat lebih dari 1/15 detik untuk cegah tunneling
-            dt = min(dt, 0.066) 
+            # Waktu frame render. Dibatasi agar lag panjang tidak menumpuk langkah simulasi
+            frame_time = min(self.clock.tick(FPS) / 1000.0, MAX_SIM_STEPS * sim_dt)
+            accumulator += frame_time
             
-            # Logika Hit Stop
-            can_update = True
+            # Profiler hanya berjalan saat debug mode (backquote)
+            profiler.set_enabled(self.debug_mode)
             
             events = pygame.event.get()
             for event in events:
@@ -83,9 +104,15 @@ class GameManager:
                 # Oper event ke scene aktif
                 self.active_scene.handle_events([event])
                 
-            # Update Scene Aktif dengan dt yang di-cap
-            if can_update:
-                self.active_scene.update(dt)
+            # Update Scene Aktif dengan dt tetap (biaya CPU simulasi konstan terhadap FPS render)
+            steps = 0
+            while accumulator >= sim_dt and steps < MAX_SIM_STEPS:
+                self.active_scene.begin_step()
+                self.active_scene.update(sim_dt)
+                accumulator -= sim_dt
+                steps += 1
+            accumulator = min(accumulator, sim_dt)
+            self.active_scene.render_alpha = accumulator / sim_dt
             
             # Tentukan posisi pemain di layar untuk shader lighting
             player_screen_pos = (0.5, 0.5)
@@ -160,22 +187,66 @@ class GameManager:
                             shadows.append((sx, sy, 0.05)) # Radius diperbesar
                 
             # Render via Pipeline Shader (Kirim world, UI, dan Shadows)
-            self.shaders.render(
-                self.render_surface, 
-                ui_surface=self.ui_surface, 
-                player_pos=player_screen_pos, 
-                render_mode=render_mode, 
-                lights=lights, 
-                shadows=shadows,
-                bar_data=bar_data
-            )
+            with profiler.scope('shader'):
+                self.shaders.render(
+                    self.render_surface, 
+                    ui_surface=self.ui_surface, 
+                    player_pos=player_screen_pos, 
+                    render_mode=render_mode, 
+                    lights=lights, 
+                    shadows=shadows,
+                    bar_data=bar_data
+                )
             
-            pygame.display.flip()
+            with profiler.scope('present'):
+                pygame.display.flip()
+            profiler.end_frame()
             # JANGAN tick lagi di sini! Baris 42 sudah menanganinya.
             
         pygame.quit()
         sys.exit()
 
+    def run_headless(self, frames, dt=1/60, input_source=None, realtime=False):
+        """
+        Jalankan GameScene tanpa render: dt tetap, tanpa draw()/shaders.render.
+        Input dari bot/skrip (default BotInput). Return list waktu update per frame (detik).
+        realtime=True menahan loop ke kecepatan dt (jam dinding), mis. saat terhubung ke sesi network.
+        """
+        scene = self.start_headless(input_source)
+
+        update_times = []
+        for _ in range(frames):
+            if not self.running:
+                break
+            elapsed = self.step_headless(scene, dt)
+            update_times.append(elapsed)
+            if realtime and elapsed < dt:
+                time.sleep(dt - elapsed)
+
+        InputManager.set_source(None)
+        return update_times
+
+    def start_headless(self, input_source=None):
+        """Masuk ke GameScene dengan sumber input bot/skrip. Return scene."""
+        scene = self.scenes['game']
+        self.active_scene = scene
+        scene.on_enter()
+        InputManager.set_source(input_source or BotInput(scene))
+        return scene
+
+    def step_headless(self, scene, dt):
+        """Satu langkah simulasi headless. Return waktu scene.update (detik)."""
+        pygame.event.pump()
+        InputManager.update()
+
+        # Menu level up memblokir simulasi: pilih upgrade lewat sumber input
+        if scene.level_up_active and scene.upgrade_options:
+            scene.apply_upgrade(InputManager.source.choose_upgrade(scene.upgrade_options))
+
+        start = time.perf_counter()
+        scene.update(dt)
+        return time.perf_counter() - start
+
 if __name__ == "__main__":
     game = GameManager()
     game.run()
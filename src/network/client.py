@@ -1,29 +1,40 @@
 import socket
 import threading
-import json
 import time
+from collections import OrderedDict
+from . import protocol
 
 class NetworkClient:
     def __init__(self, host='localhost', port=5555):
         self.client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.host = host
         self.port = port
-        self.addr = None
+        self.addr = None # ID pemain (integer dari server)
         self.other_players = {} # {id: {pos: [x,y], status: '...'}}
+        self.snapshots = OrderedDict() # {seq: {id: state}}: base untuk delta dari server
+        self.acked = 0 # Seq snapshot terakhir yang diterapkan (dikirim balik bersama state)
         self.events = [] # List event yang diterima
         self.connected = False
         self.lock = threading.Lock()
+        self.reader = protocol.FrameReader()
 
     def connect(self):
         try:
             self.client.connect((self.host, self.port))
-            # Handshake Awal
-            data = self.client.recv(2048).decode()
-            msg = json.loads(data)
+            # Handshake Awal: frame pertama selalu welcome; frame lain di recv yang sama diproses setelahnya
+            payloads = []
+            while not payloads:
+                data = self.client.recv(4096)
+                if not data:
+                    raise ConnectionError("server menutup koneksi saat handshake")
+                payloads = self.reader.feed(data)
+            msg = protocol.decode(payloads[0])
             self.addr = msg.get('id')
             self.is_host = msg.get('is_host', False) # Simpan Status Host
             self.connected = True
             print(f"[NETWORK] Terhubung sebagai {self.addr} (Host: {self.is_host})")
+            for payload in payloads[1:]:
+                self.handle_payload(payload)
             
             # Mulai thread listener
             self.thread = threading.Thread(target=self.listen)
@@ -37,50 +48,64 @@ class NetworkClient:
     def listen(self):
         while self.connected:
             try:
-                # Terima buffer
-                data = self.client.recv(4096).decode('utf-8')
+                # Terima buffer (frame boleh terpotong antar recv, reader menyambungnya)
+                data = self.client.recv(65536)
                 if not data:
                     break
                 
-                packets = data.split('\n')
-                for packet in packets:
-                    if not packet: continue
-                    try:
-                        msg = json.loads(packet)
-                        
-                        # Handle Update State
-                        if 'players' in msg:
-                            with self.lock:
-                                # Update player lain, kecuali diri sendiri
-                                raw_players = msg['players']
-                                if self.addr in raw_players:
-                                    del raw_players[self.addr]
-                                self.other_players = raw_players
-                                
-                        # Handle Event (Broadcast dari server)
-                        elif 'event' in msg:
-                             evt_type = msg.get('event')
-                             
-                             # Migrasi Host
-                             if evt_type == 'host_migration':
-                                 new_host = msg.get('new_host')
-                                 if new_host == self.addr:
-                                     self.is_host = True
-                                     print(f"[NETWORK] Anda sekarang adalah HOST.")
-                             
-                             # Jangan proses event sendiri jika dipantulkan balik
-                             if msg.get('sender') != self.addr:
-                                 with self.lock:
-                                     self.events.append(msg)
-                                     
-                    except json.JSONDecodeError:
-                        pass
+                for payload in self.reader.feed(data):
+                    self.handle_payload(payload)
                         
             except Exception as e:
                 print(f"[NETWORK] Error receiving: {e}")
                 self.connected = False
                 break
 
+    def handle_payload(self, payload):
+        # Payload rusak hanya dilewati; koneksi cuma diputus oleh error socket / stream (FrameReader)
+        try:
+            msg = protocol.decode(payload)
+        except protocol.ProtocolError as e:
+            print(f"[NETWORK] Frame dilewati: {e}")
+            return
+        self.handle_message(msg)
+
+    def handle_message(self, msg):
+        # Handle Update State: delta terhadap snapshot base (base 0 = keyframe)
+        if 'snapshot' in msg:
+            base = self.snapshots.get(msg['base']) if msg['base'] else {}
+            if base is None:
+                self.acked = 0 # Base sudah dibuang: minta keyframe
+                return
+            players = dict(base)
+            for pid, fields in msg['changed'].items():
+                players[pid] = {**players.get(pid, {}), **fields}
+            for pid in msg['removed']:
+                players.pop(pid, None)
+            self.snapshots[msg['snapshot']] = players
+            if len(self.snapshots) > protocol.SNAPSHOT_HISTORY:
+                self.snapshots.popitem(last=False)
+            self.acked = msg['snapshot']
+            with self.lock:
+                # Update player lain, kecuali diri sendiri
+                self.other_players = {pid: state for pid, state in players.items() if pid != self.addr}
+                
+        # Handle Event (Broadcast dari server)
+        elif 'event' in msg:
+             evt_type = msg.get('event')
+             
+             # Migrasi Host
+             if evt_type == 'host_migration':
+                 new_host = msg.get('new_host')
+                 if new_host == self.addr:
+                     self.is_host = True
+                     print(f"[NETWORK] Anda sekarang adalah HOST.")
+             
+             # Jangan proses event sendiri jika dipantulkan balik
+             if msg.get('sender') != self.addr:
+                 with self.lock:
+                     self.events.append(msg)
+
     def send_state(self, state):
         """
         Kirim dict state: {'pos': (x, y), 'status': 'run_down', 'char_type': 'adventurer'}
@@ -88,8 +113,9 @@ class NetworkClient:
         if not self.connected: return
         
         try:
-            data = json.dumps(state) + '\n'
-            self.client.send(data.encode('utf-8'))
+            self.client.sendall(protocol.encode_state(state, self.acked))
+        except protocol.ProtocolError as e:
+            print(f"[NETWORK] Tidak terkirim: {e}")
         except socket.error as e:
             print(f"[NETWORK] Error Kirim: {e}")
             self.connected = False
@@ -103,15 +129,21 @@ class NetworkClient:
         
         payload = {
             'event': event_type,
-            'sender': self.addr,
             **data
         }
         try:
-            msg = json.dumps(payload) + '\n'
-            self.client.send(msg.encode('utf-8'))
+            # Pengirim distempel server (ID koneksi)
+            self.client.sendall(protocol.encode_event(payload, self.addr))
+        except protocol.ProtocolError as e:
+            print(f"[NETWORK] Tidak terkirim: {e}")
         except:
             self.connected = False
 
     def disconnect(self):
         self.connected = False
+        try:
+            # shutdown dulu: close() saja tidak mengirim FIN selama thread listener masih menunggu di recv()
+            self.client.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
         self.client.close()
@@ -0,0 +1,346 @@
+"""
+Protokol jaringan biner: frame dengan prefix panjang + payload struct-packed.
+
+    frame   = <I panjang payload> payload
+    payload = <B tipe pesan> isi
+
+Pesan tetap berupa dict (bentuk sama seperti protokol JSON lama), jadi client/server/game hanya
+memanggil encode_* dan FrameReader.feed(). ID pemain adalah integer kecil dari server, uid musuh
+integer 64-bit, posisi fixed-point (1/POS_SCALE px). Nama (status, karakter, senjata, tipe musuh)
+dikirim sebagai indeks tabel; nama di luar tabel tetap terkirim sebagai string pendek.
+
+State pemain dikirim server sebagai snapshot delta: hanya field yang berubah sejak snapshot `base`
+yang sudah di-ack client (ack ikut di setiap MSG_STATE). base = 0 berarti keyframe (delta dari kosong).
+"""
+import json
+import struct
+from ..settings import CHARACTER_DATA, ENEMY_DATA, WEAPON_DATA, CHUNK_SIZE, TILE_SIZE
+
+class ProtocolError(Exception):
+    """Frame/payload rusak: koneksi sebaiknya diputus."""
+
+FRAME_HEADER = struct.Struct('<I')
+MAX_FRAME = 1 << 20 # Frame lebih besar dari ini dianggap stream rusak
+
+# Tipe pesan
+MSG_WELCOME = 1
+MSG_STATE = 2 # client -> server: state pemain sendiri
+MSG_SNAPSHOT = 3 # server -> client: delta state semua pemain terhadap snapshot base
+MSG_ATTACK = 4
+MSG_SPAWN_ENEMY = 5
+MSG_KILL_ENEMY = 6
+MSG_HOST_MIGRATION = 7
+MSG_EVENT_JSON = 8 # Event tanpa layout biner (fallback)
+MSG_DESPAWN_ENEMY = 9 # server -> client: musuh keluar area of interest (hapus tanpa loot)
+MSG_ENEMY_MOVES = 10 # owner -> server: posisi musuh miliknya yang pindah sel interest (tidak diteruskan)
+MSG_SPAWN_WAVE = 11 # Gelombang ter-seed, dikembangkan tiap peer (lihat waves.py)
+
+EVENT_TYPES = {
+    'attack': MSG_ATTACK,
+    'spawn_enemy': MSG_SPAWN_ENEMY,
+    'kill_enemy': MSG_KILL_ENEMY,
+    'host_migration': MSG_HOST_MIGRATION,
+    'despawn_enemy': MSG_DESPAWN_ENEMY,
+    'enemy_moves': MSG_ENEMY_MOVES,
+    'spawn_wave': MSG_SPAWN_WAVE,
+}
+
+POS_SCALE = 4 # Posisi dikirim sebagai int32 kelipatan 1/4 px
+ANGLE_SCALE = 100 # Sudut serangan: uint16 kelipatan 0.01 derajat
+DIFF_SCALE = 1000 # Difficulty musuh: uint32 kelipatan 0.001 (host memakai nilai yang sama, lihat quantize_difficulty)
+MAX_PLAYER_ID = 0xFFFF # ID pemain uint16; 0 = server (sender event buatan server)
+SNAPSHOT_HISTORY = 32 # Snapshot terakhir yang disimpan server dan client sebagai base delta
+INTEREST_CELL = CHUNK_SIZE * TILE_SIZE # Sel grid area of interest (px), sama dengan chunk ChunkManager
+
+# Field state pemain (bit mask di record delta); state disimpan server sebagai tuple bytes per field
+FIELD_POS = 1
+FIELD_STATUS = 2
+FIELD_CHAR = 4
+FIELD_BITS = (FIELD_POS, FIELD_STATUS, FIELD_CHAR)
+
+_WELCOME = struct.Struct('<BHB') # tipe, id, is_host
+_STATE_HEAD = struct.Struct('<BI') # tipe, ack (seq snapshot terakhir yang diterapkan client)
+_STATE = struct.Struct('<ii') # x, y (lalu status, char_type sebagai nama)
+_SNAPSHOT = struct.Struct('<BIIH') # tipe, seq, base, jumlah record
+_DELTA = struct.Struct('<HB') # id pemain, mask field (lalu field yang berubah, urut FIELD_BITS)
+_COUNT = struct.Struct('<H')
+_PLAYER_ID = struct.Struct('<H')
+_EVENT = struct.Struct('<BH') # tipe, sender (diisi server saat relay)
+_SPAWN = struct.Struct('<QiiI') # uid, x, y, difficulty (lalu tipe musuh sebagai nama)
+_WAVE = struct.Struct('<QIiiIBB') # uid pertama, seed, x, y, difficulty, jumlah musuh, jumlah tipe (lalu nama + bobot B per tipe)
+_UID = struct.Struct('<Q')
+_MOVE = struct.Struct('<Qii') # uid, x, y
+_ANGLE = struct.Struct('<H')
+
+# Tabel nama: indeks 1 byte, NAME_LITERAL = string utf-8 ber-prefix panjang menyusul
+NAME_LITERAL = 255
+_DIRECTIONS = ('down', 'up', 'left', 'right')
+STATUSES = ('idle', 'death') + tuple(f'{action}_{direction}' for action in ('idle', 'run', 'dash', 'attack', 'hurt', 'death') for direction in _DIRECTIONS)
+CHARACTERS = tuple(CHARACTER_DATA)
+ENEMY_TYPES = tuple(ENEMY_DATA)
+WEAPONS = tuple(WEAPON_DATA)
+_NAME_INDEX = {table: {name: i for i, name in enumerate(table)} for table in (STATUSES, CHARACTERS, ENEMY_TYPES, WEAPONS)}
+
+def _pack_name(table, name):
+    index = _NAME_INDEX[table].get(name)
+    if index is not None:
+        return bytes((index,))
+    raw = str(name).encode('utf-8')[:255]
+    return bytes((NAME_LITERAL, len(raw))) + raw
+
+def _skip_name(data, offset):
+    return offset + 1 if data[offset] != NAME_LITERAL else offset + 2 + data[offset + 1]
+
+def _unpack_name(table, data, offset):
+    """(nama, offset berikutnya)"""
+    index = data[offset]
+    if index != NAME_LITERAL:
+        return table[index], offset + 1
+    length = data[offset + 1]
+    return bytes(data[offset + 2:offset + 2 + length]).decode('utf-8'), offset + 2 + length
+
+def _quantize(value):
+    return round(value * POS_SCALE)
+
+def quantize_difficulty(diff):
+    """Difficulty yang terkirim persis: host spawn dengan nilai ini agar musuh identik di semua peer."""
+    return round(diff * DIFF_SCALE) / DIFF_SCALE
+
+def frame(payload):
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+# --- Encode -----------------------------------------------------------
+
+def encode_welcome(player_id, is_host):
+    try:
+        return frame(_WELCOME.pack(MSG_WELCOME, player_id, is_host))
+    except struct.error as e:
+        raise ProtocolError(f"Welcome tidak bisa di-encode (id {player_id}): {e}") from e
+
+def encode_state_fields(state):
+    """State satu pemain -> tuple bytes (pos, status, char_type), urut FIELD_BITS."""
+    x, y = state.get('pos', (0, 0))
+    return (_STATE.pack(_quantize(x), _quantize(y)),
+            _pack_name(STATUSES, state.get('status', 'idle_down')),
+            _pack_name(CHARACTERS, state.get('char_type', 'adventurer')))
+
+def encode_state(state, ack=0):
+    try:
+        return frame(_STATE_HEAD.pack(MSG_STATE, ack) + b''.join(encode_state_fields(state)))
+    except struct.error as e:
+        raise ProtocolError(f"State tidak bisa di-encode: {e}") from e
+
+def split_state(payload):
+    """
+    Payload MSG_STATE -> (ack, tuple bytes per field) untuk server. Field diteruskan apa adanya ke client
+    lain, jadi nilainya divalidasi dulu (decode) agar state rusak memutus pengirimnya saja.
+    """
+    try:
+        _, ack = _STATE_HEAD.unpack_from(payload)
+        decode_state_record(payload, _STATE_HEAD.size)
+        pos_end = _STATE_HEAD.size + _STATE.size
+        status_end = _skip_name(payload, pos_end)
+        char_end = _skip_name(payload, status_end)
+    except (struct.error, IndexError, ValueError) as e:
+        raise ProtocolError(f"State rusak: {e}") from e
+    if char_end > len(payload):
+        raise ProtocolError("State terpotong")
+    return ack, (bytes(payload[_STATE_HEAD.size:pos_end]), bytes(payload[pos_end:status_end]), bytes(payload[status_end:char_end]))
+
+def encode_snapshot(seq, players, base_seq=0, base=None):
+    """
+    players/base: {player_id: tuple field dari encode_state_fields}. Hanya field yang berbeda dari base
+    yang dikirim, pemain yang hilang dari base dikirim sebagai daftar removed. base_seq = 0: keyframe.
+    """
+    base = base or {}
+    parts = []
+    count = 0
+    for player_id, fields in players.items():
+        previous = base.get(player_id)
+        if previous is fields:
+            continue # Tuple yang sama (pemain diam): tidak ada yang berubah
+        mask = 0
+        changed = []
+        for bit, value, old in zip(FIELD_BITS, fields, previous or (None, None, None)):
+            if value != old:
+                mask |= bit
+                changed.append(value)
+        if mask:
+            parts.append(_DELTA.pack(player_id, mask))
+            parts += changed
+            count += 1
+    removed = [player_id for player_id in base if player_id not in players]
+    parts.append(_COUNT.pack(len(removed)))
+    parts += [_PLAYER_ID.pack(player_id) for player_id in removed]
+    return frame(_SNAPSHOT.pack(MSG_SNAPSHOT, seq, base_seq, count) + b''.join(parts))
+
+def encode_event(msg, sender=0):
+    """
+    msg: {'event': nama, ...}; sender ditimpa server dengan ID koneksi pengirim.
+    Nilai di luar rentang field (uid, jumlah, koordinat) -> ProtocolError, event tidak terkirim.
+    """
+    kind = EVENT_TYPES.get(msg['event'], MSG_EVENT_JSON)
+    try:
+        return frame(_EVENT.pack(kind, sender) + _encode_event_body(kind, msg))
+    except (struct.error, ValueError) as e: # ValueError: jumlah > 255 di field 1 byte
+        raise ProtocolError(f"Event {msg['event']} tidak bisa di-encode: {e}") from e
+
+def _encode_event_body(kind, msg):
+    if kind == MSG_ATTACK:
+        angles = msg.get('angles', ())
+        body = (_pack_name(WEAPONS, msg['weapon']) + bytes((len(angles),))
+                + b''.join(_ANGLE.pack(round((angle % 360) * ANGLE_SCALE) % (360 * ANGLE_SCALE)) for angle in angles))
+    elif kind == MSG_SPAWN_ENEMY:
+        x, y = msg['pos']
+        body = _SPAWN.pack(msg['uid'], _quantize(x), _quantize(y), round(msg['diff'] * DIFF_SCALE)) + _pack_name(ENEMY_TYPES, msg['type'])
+    elif kind == MSG_SPAWN_WAVE:
+        x, y = msg['pos']
+        mix = msg['mix']
+        body = (_WAVE.pack(msg['uid'], msg['seed'], _quantize(x), _quantize(y), round(msg['diff'] * DIFF_SCALE), msg['count'], len(mix))
+                + b''.join(_pack_name(ENEMY_TYPES, enemy_type) + bytes((weight,)) for enemy_type, weight in mix))
+    elif kind == MSG_ENEMY_MOVES:
+        moves = msg['moves']
+        body = _COUNT.pack(len(moves)) + b''.join(_MOVE.pack(uid, _quantize(x), _quantize(y)) for uid, (x, y) in moves)
+    elif kind in (MSG_KILL_ENEMY, MSG_DESPAWN_ENEMY):
+        body = _UID.pack(msg['uid'])
+    elif kind == MSG_HOST_MIGRATION:
+        body = _PLAYER_ID.pack(msg['new_host'])
+    else:
+        body = json.dumps({k: v for k, v in msg.items() if k != 'sender'}).encode('utf-8')
+    return body
+
+def set_sender(payload, sender):
+    """Stempel ID pengirim ke payload event (bytearray) tanpa decode penuh."""
+    if len(payload) < _EVENT.size:
+        raise ProtocolError(f"Event terpotong ({len(payload)} byte)")
+    _PLAYER_ID.pack_into(payload, 1, sender)
+
+def is_event(payload):
+    return payload[0] in (MSG_ATTACK, MSG_SPAWN_ENEMY, MSG_KILL_ENEMY, MSG_HOST_MIGRATION, MSG_EVENT_JSON, MSG_DESPAWN_ENEMY, MSG_ENEMY_MOVES,
+                          MSG_SPAWN_WAVE)
+
+# Intip payload tanpa decode penuh (routing area of interest di server)
+
+def state_position(pos_field):
+    """Field pos dari split_state -> (x, y) px."""
+    x, y = _STATE.unpack(pos_field)
+    return x / POS_SCALE, y / POS_SCALE
+
+def move_spawn(packet, pos):
+    """Frame MSG_SPAWN_ENEMY dengan posisi diganti (untuk replay enter di posisi terakhir musuh)."""
+    packet = bytearray(packet)
+    _STATE.pack_into(packet, FRAME_HEADER.size + _EVENT.size + _UID.size, _quantize(pos[0]), _quantize(pos[1]))
+    return bytes(packet)
+
+# --- Decode -----------------------------------------------------------
+
+def decode_state_record(data, offset):
+    """(state dict, offset berikutnya)"""
+    x, y = _STATE.unpack_from(data, offset)
+    status, offset = _unpack_name(STATUSES, data, offset + _STATE.size)
+    char_type, offset = _unpack_name(CHARACTERS, data, offset)
+    return {'pos': (x / POS_SCALE, y / POS_SCALE), 'status': status, 'char_type': char_type}, offset
+
+def decode(payload):
+    """Payload satu frame -> dict pesan (bentuk sama seperti protokol JSON lama)."""
+    try:
+        kind = payload[0]
+        if kind == MSG_WELCOME:
+            _, player_id, is_host = _WELCOME.unpack_from(payload)
+            return {'message': 'Welcome', 'id': player_id, 'is_host': bool(is_host)}
+        if kind == MSG_STATE:
+            state = decode_state_record(payload, _STATE_HEAD.size)[0]
+            state['ack'] = _STATE_HEAD.unpack_from(payload)[1]
+            return state
+        if kind == MSG_SNAPSHOT:
+            _, seq, base_seq, count = _SNAPSHOT.unpack_from(payload)
+            offset = _SNAPSHOT.size
+            changed = {}
+            for _ in range(count):
+                player_id, mask = _DELTA.unpack_from(payload, offset)
+                offset += _DELTA.size
+                fields = changed[player_id] = {}
+                if mask & FIELD_POS:
+                    x, y = _STATE.unpack_from(payload, offset)
+                    fields['pos'] = (x / POS_SCALE, y / POS_SCALE)
+                    offset += _STATE.size
+                if mask & FIELD_STATUS:
+                    fields['status'], offset = _unpack_name(STATUSES, payload, offset)
+                if mask & FIELD_CHAR:
+                    fields['char_type'], offset = _unpack_name(CHARACTERS, payload, offset)
+            (removed_count,) = _COUNT.unpack_from(payload, offset)
+            removed = [_PLAYER_ID.unpack_from(payload, offset + _COUNT.size + i * _PLAYER_ID.size)[0] for i in range(removed_count)]
+            return {'snapshot': seq, 'base': base_seq, 'changed': changed, 'removed': removed}
+
+        _, sender = _EVENT.unpack_from(payload)
+        offset = _EVENT.size
+        if kind == MSG_ATTACK:
+            weapon, offset = _unpack_name(WEAPONS, payload, offset)
+            count = payload[offset]
+            angles = [_ANGLE.unpack_from(payload, offset + 1 + i * _ANGLE.size)[0] / ANGLE_SCALE for i in range(count)]
+            return {'event': 'attack', 'sender': sender, 'weapon': weapon, 'angles': angles}
+        if kind == MSG_SPAWN_ENEMY:
+            uid, x, y, diff = _SPAWN.unpack_from(payload, offset)
+            enemy_type, _ = _unpack_name(ENEMY_TYPES, payload, offset + _SPAWN.size)
+            return {'event': 'spawn_enemy', 'sender': sender, 'uid': uid, 'type': enemy_type,
+                    'pos': (x / POS_SCALE, y / POS_SCALE), 'diff': diff / DIFF_SCALE}
+        if kind == MSG_SPAWN_WAVE:
+            uid, seed, x, y, diff, count, type_count = _WAVE.unpack_from(payload, offset)
+            offset += _WAVE.size
+            mix = []
+            for _ in range(type_count):
+                enemy_type, offset = _unpack_name(ENEMY_TYPES, payload, offset)
+                mix.append((enemy_type, payload[offset]))
+                offset += 1
+            if count == 0 or sum(weight for _, weight in mix) == 0:
+                raise ProtocolError(f"Gelombang kosong (jumlah {count}, bobot {mix})")
+            return {'event': 'spawn_wave', 'sender': sender, 'uid': uid, 'seed': seed, 'pos': (x / POS_SCALE, y / POS_SCALE),
+                    'count': count, 'mix': mix, 'diff': diff / DIFF_SCALE}
+        if kind == MSG_ENEMY_MOVES:
+            (count,) = _COUNT.unpack_from(payload, offset)
+            offset += _COUNT.size
+            moves = []
+            for _ in range(count):
+                uid, x, y = _MOVE.unpack_from(payload, offset)
+                moves.append((uid, (x / POS_SCALE, y / POS_SCALE)))
+                offset += _MOVE.size
+            return {'event': 'enemy_moves', 'sender': sender, 'moves': moves}
+        if kind in (MSG_KILL_ENEMY, MSG_DESPAWN_ENEMY):
+            event = 'kill_enemy' if kind == MSG_KILL_ENEMY else 'despawn_enemy'
+            return {'event': event, 'sender': sender, 'uid': _UID.unpack_from(payload, offset)[0]}
+        if kind == MSG_HOST_MIGRATION:
+            return {'event': 'host_migration', 'sender': sender, 'new_host': _PLAYER_ID.unpack_from(payload, offset)[0]}
+        if kind == MSG_EVENT_JSON:
+            msg = json.loads(bytes(payload[offset:]).decode('utf-8'))
+            msg['sender'] = sender
+            return msg
+    except (struct.error, IndexError, ValueError) as e:
+        raise ProtocolError(f"Payload rusak (tipe {payload[0] if payload else '?'}): {e}") from e
+    raise ProtocolError(f"Tipe pesan tidak dikenal: {kind}")
+
+class FrameReader:
+    """
+    Buffer reassembly stream TCP: feed() menerima potongan recv() sembarang dan mengembalikan
+    payload frame yang sudah lengkap; sisa frame terpotong disimpan untuk recv berikutnya.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def feed(self, data):
+        self.buffer += data
+        payloads = []
+        offset = 0
+        buffer = self.buffer
+        while len(buffer) - offset >= FRAME_HEADER.size:
+            (length,) = FRAME_HEADER.unpack_from(buffer, offset)
+            if length == 0 or length > MAX_FRAME:
+                raise ProtocolError(f"Panjang frame tidak valid: {length}")
+            end = offset + FRAME_HEADER.size + length
+            if end > len(buffer):
+                break
+            payloads.append(buffer[offset + FRAME_HEADER.size:end])
+            offset = end
+        if offset:
+            del buffer[:offset]
+        return payloads
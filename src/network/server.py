@@ -1,139 +1,400 @@
 import socket
-import threading
-import json
-import time
+import asyncio
+from collections import deque, OrderedDict
+from . import protocol, waves
+from ..settings import LOAD_RADIUS
 
 # Konfigurasi
 HOST = '0.0.0.0'
 PORT = 5555
+TICK_RATE = 30 # Broadcast state per detik
+OUTBOUND_LIMIT = 256 * 1024 # Byte event tertunda per client sebelum client lambat di-kick
+KEYFRAME_INTERVAL = 90 # Snapshot delta berturut-turut sebelum client dikirimi keyframe penuh
+INTEREST_CELL = protocol.INTEREST_CELL
+INTEREST_RADIUS = LOAD_RADIUS # Sel (Chebyshev) di sekitar pemain yang dikirimi state/event
+LEAVE_RADIUS = INTEREST_RADIUS + 1 # Histeresis: musuh baru "leave" setelah lewat radius ini
+
+def interest_cell(pos):
+    return (int(pos[0] // INTEREST_CELL), int(pos[1] // INTEREST_CELL))
+
+def cell_distance(a, b):
+    return max(abs(a[0] - b[0]), abs(a[1] - b[1]))
+
+class Connection:
+    """
+    Satu client: antrian keluar dikuras oleh task writer sendiri, jadi broadcast tidak pernah menunggu socket.
+    State pemain hanya disimpan yang terbaru (snapshot lama yang belum terkirim dibuang), event diantrikan
+    dan dibatasi OUTBOUND_LIMIT byte.
+    """
+
+    def __init__(self, player_id, writer):
+        self.player_id = player_id
+        self.writer = writer
+        self.events = deque()
+        self.event_bytes = 0
+        self.latest_state = None
+        self.wakeup = asyncio.Event()
+        self.dropped_states = 0
+        self.closed = False
+        self.acked = 0 # Seq snapshot terakhir yang sudah diterapkan client (0: belum ada)
+        self.sent_seq = 0
+        self.since_keyframe = 0
+        self.visible = OrderedDict() # {seq: frozenset id pemain yang dikirim di snapshot itu}
+
+    def push_state(self, packet):
+        if self.latest_state is not None:
+            self.dropped_states += 1 # Client belum sempat menerima snapshot sebelumnya
+        self.latest_state = packet
+        self.wakeup.set()
+
+    def push_event(self, packet):
+        """False jika client terlalu lambat (buffer penuh): harus di-kick."""
+        buffered = self.event_bytes + self.writer.transport.get_write_buffer_size()
+        if buffered + len(packet) > OUTBOUND_LIMIT:
+            return False
+        self.events.append(packet)
+        self.event_bytes += len(packet)
+        self.wakeup.set()
+        return True
+
+    async def run_writer(self):
+        writer = self.writer
+        try:
+            while not self.closed:
+                await self.wakeup.wait()
+                self.wakeup.clear()
+                # Event dulu (urutan terjaga), lalu snapshot state terbaru
+                while self.events and not writer.is_closing():
+                    packet = self.events.popleft()
+                    self.event_bytes -= len(packet)
+                    writer.write(packet)
+                if writer.is_closing():
+                    break # Koneksi putus: jangan menulis ke transport mati
+                if self.latest_state is not None:
+                    writer.write(self.latest_state)
+                    self.latest_state = None
+                await writer.drain()
+        except ConnectionError:
+            pass # Loop baca koneksi ini yang membereskan disconnect
 
 class Server:
-    def __init__(self):
+    """
+    Server asyncio: satu event loop untuk semua koneksi (tanpa thread per client). State bersama hanya
+    disentuh dari loop, jadi tidak perlu lock. start() memblokir (jalankan di thread untuk benchmark),
+    stop() aman dipanggil dari thread lain.
+    """
+
+    def __init__(self, host=HOST, port=PORT):
         self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.server.bind((HOST, PORT))
-        self.server.listen()
-        self.clients = {} # {addr: conn}
-        self.player_states = {} # {addr: state_dict}
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind((host, port))
+        self.port = self.server.getsockname()[1] # port=0: dipilih OS (benchmark)
+        self.server.listen(512)
+        self.clients = {} # {player_id: Connection}
+        self.player_states = {} # {player_id: tuple field biner (protocol.encode_state_fields)}
+        self.states_dirty = False
+        self.snapshot_seq = 0
+        self.snapshots = OrderedDict() # {seq: salinan player_states} untuk base delta
+        # Area of interest: sel grid tiap pemain dan sel terakhir tiap musuh
+        self.player_cells = {} # {player_id: sel}
+        self.enemies = {} # {uid: [sel terakhir, paket spawn (posisi terakhir), owner, set player_id yang mengenalnya]}
+        self.next_id = 1
         self.running = True
-        
-        print(f"[SERVER] Jalan di {HOST}:{PORT}")
+        self.loop = None
+        self.stopped = None
+        self.handlers = set() # Task handle_client yang masih jalan
+
+        print(f"[SERVER] Jalan di {host}:{self.port}")
 
-    def broadcast_state(self):
+    async def broadcast_state(self):
         """Kirim state pemain ke semua client secara berkala"""
         while self.running:
-            if not self.clients:
-                time.sleep(0.1)
-                continue
-                
-            # Siapkan paket state
-            # Format: {'players': {addr_str: {x, y, status, ...}}}
-            state_packet = json.dumps({'players': self.player_states}).encode('utf-8')
-            
-            # Broadcast
-            disconnected = []
-            for addr, conn in self.clients.items():
-                try:
-                    # Protokol sederhana: kirim JSON mentah dengan delimiter baris baru
-                    conn.sendall(state_packet + b'\n')
-                except:
-                    disconnected.append(addr)
-            
-            # Bersihkan koneksi yang putus
-            for addr in disconnected:
-                self.handle_disconnect(addr)
-                
-            time.sleep(1/30) # 30 Tick Rate
-
-    def handle_client(self, conn, addr):
+            if self.clients:
+                self.send_snapshots()
+            await asyncio.sleep(1 / TICK_RATE)
+
+    def send_snapshots(self):
+        """
+        Snapshot baru hanya dibuat jika ada state yang berubah. Tiap client menerima delta terhadap
+        snapshot terakhir yang di-ack-nya, atau keyframe jika base sudah lewat / interval keyframe habis.
+        """
+        if self.states_dirty:
+            self.states_dirty = False
+            self.snapshot_seq += 1
+            self.snapshots[self.snapshot_seq] = dict(self.player_states)
+            if len(self.snapshots) > protocol.SNAPSHOT_HISTORY:
+                self.snapshots.popitem(last=False)
+        seq = self.snapshot_seq
+        current = self.snapshots.get(seq)
+        if current is None:
+            return
+
+        # Tiap client hanya menerima pemain dalam radius interest-nya: masuk/keluar radius = enter/leave
+        # (record penuh / daftar removed di delta)
+        visible_by_cell = {}
+        packets = {} # Client di area yang sama dengan ack yang sama berbagi hasil encode
+        for player_id, connection in self.clients.items():
+            if connection.sent_seq == seq:
+                continue # Tidak ada perubahan sejak snapshot terakhir yang dikirim
+            cell = self.player_cells.get(player_id)
+            visible = visible_by_cell.get(cell)
+            if visible is None:
+                visible = visible_by_cell[cell] = frozenset(
+                    other for other, other_cell in self.player_cells.items() if cell_distance(cell, other_cell) <= INTEREST_RADIUS)
+            base_seq = connection.acked
+            base_visible = connection.visible.get(base_seq)
+            if base_seq not in self.snapshots or base_visible is None or connection.since_keyframe >= KEYFRAME_INTERVAL:
+                base_seq, base_visible = 0, frozenset()
+            key = (base_seq, visible, base_visible)
+            packet = packets.get(key)
+            if packet is None:
+                players = {pid: current[pid] for pid in visible if pid in current}
+                base = self.snapshots.get(base_seq, {})
+                base = {pid: base[pid] for pid in base_visible if pid in base}
+                packet = packets[key] = protocol.encode_snapshot(seq, players, base_seq, base)
+            connection.since_keyframe = 0 if base_seq == 0 else connection.since_keyframe + 1
+            connection.sent_seq = seq
+            connection.visible[seq] = visible
+            if len(connection.visible) > protocol.SNAPSHOT_HISTORY:
+                connection.visible.popitem(last=False)
+            connection.push_state(packet)
+
+    async def handle_client(self, reader, writer):
+        addr = writer.get_extra_info('peername')
         print(f"[NEW CONNECTION] {addr} terhubung.")
-        
-        # Handshake Awal (Opsional)
-        addr_str = str(addr)
-        self.clients[addr_str] = conn
-        self.player_states[addr_str] = {'pos': (0, 0), 'status': 'idle_down'}
-        
-        # Tentukan Host (Koneksi pertama atau jika tidak ada host)
-        is_host = len(self.clients) == 1
-        
-        # Kirim Handshake
-        conn.send(json.dumps({'message': 'Welcome', 'id': addr_str, 'is_host': is_host}).encode('utf-8'))
-        
-        if is_host: print(f"[HOST] Diberikan ke {addr_str}")
-        
-        while self.running:
-            try:
-                data = conn.recv(1024)
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        # Handshake Awal: ID pemain integer kecil, welcome selalu frame pertama
+        player_id = self.allocate_id()
+        if player_id is None:
+            print(f"[SERVER] ID pemain habis, {addr} ditolak.")
+            writer.close()
+            return
+        is_host = not self.clients # Koneksi pertama atau jika tidak ada host
+        writer.write(protocol.encode_welcome(player_id, is_host))
+
+        connection = Connection(player_id, writer)
+        self.clients[player_id] = connection
+        self.player_states[player_id] = protocol.encode_state_fields({'pos': (0, 0), 'status': 'idle_down'})
+        self.states_dirty = True
+        self.update_interest(player_id, interest_cell((0, 0)))
+        writer_task = asyncio.create_task(connection.run_writer())
+        if is_host: print(f"[HOST] Diberikan ke {player_id}")
+
+        frames = protocol.FrameReader()
+        self.handlers.add(asyncio.current_task())
+        try:
+            while self.running and not connection.closed:
+                data = await reader.read(65536)
                 if not data:
                     break
-                
-                # Parse data yang diterima
-                # Asumsi client kirim json dengan delimiter \n
-                packets = data.decode('utf-8').split('\n')
-                for packet in packets:
-                    if not packet: continue
-                    try:
-                        msg = json.loads(packet)
-                        
-                        # Cek apakah Event atau State
-                        if 'event' in msg:
-                            # Langsung Broadcast Event
-                            self.broadcast_event(msg)
-                        else:
-                            # Update State
-                            self.player_states[addr_str].update(msg)
-                            
-                    except json.JSONDecodeError:
-                        pass
-                        
-            except ConnectionResetError:
-                break
-            except Exception as e:
-                print(f"[ERROR] {addr}: {e}")
-                break
-        
-        self.handle_disconnect(addr_str)
-        conn.close()
-
-    def broadcast_event(self, event_msg):
-        """Kirim event ke semua client segera"""
-        packet = (json.dumps(event_msg) + '\n').encode('utf-8')
-        for conn in self.clients.values():
-            try:
-                conn.sendall(packet)
-            except:
-                pass
-
-    def handle_disconnect(self, addr_str):
+                # Reassembly: frame yang terpotong antar read() disimpan reader
+                for payload in frames.feed(data):
+                    # Cek apakah Event atau State
+                    if protocol.is_event(payload):
+                        # Stempel pengirim, validasi (event rusak memutus pengirimnya, tidak diteruskan ke
+                        # client lain), lalu teruskan ke client yang berkepentingan
+                        protocol.set_sender(payload, player_id)
+                        self.route_event(player_id, payload, protocol.decode(payload))
+                    elif payload[0] == protocol.MSG_STATE:
+                        # Field disimpan apa adanya dari client (sudah divalidasi split_state), ack ikut di header
+                        connection.acked, fields = protocol.split_state(payload)
+                        if connection.acked not in self.snapshots:
+                            connection.sent_seq = 0 # Client minta keyframe / base sudah dibuang: kirim ulang walau tak ada perubahan
+                        if self.player_states.get(player_id) != fields:
+                            self.player_states[player_id] = fields
+                            self.states_dirty = True
+                            cell = interest_cell(protocol.state_position(fields[0]))
+                            if cell != self.player_cells.get(player_id):
+                                self.update_interest(player_id, cell)
+        except (ConnectionError, protocol.ProtocolError) as e:
+            print(f"[ERROR] {addr}: {e}")
+        finally:
+            writer_task.cancel()
+            self.handle_disconnect(player_id)
+            self.handlers.discard(asyncio.current_task())
+
+    def allocate_id(self):
+        """
+        ID pemain berikutnya dalam rentang uint16 protokol (1..MAX_PLAYER_ID), berputar dan melewati ID
+        yang masih terhubung. ID lama baru dipakai ulang setelah satu putaran penuh, jadi uid musuh
+        (ID owner di 32 bit atas) dari pemain yang sudah putus tidak langsung bentrok. None jika penuh.
+        """
+        for _ in range(protocol.MAX_PLAYER_ID):
+            player_id = self.next_id
+            self.next_id = self.next_id % protocol.MAX_PLAYER_ID + 1
+            if player_id not in self.clients:
+                return player_id
+        return None
+
+    def interested(self, cell, exclude=None):
+        """ID pemain yang sel-nya dalam INTEREST_RADIUS dari cell."""
+        return [player_id for player_id, player_cell in self.player_cells.items()
+                if player_id != exclude and cell_distance(cell, player_cell) <= INTEREST_RADIUS]
+
+    def route_event(self, sender, payload, msg):
+        """
+        Event ber-posisi hanya ke client di sekitarnya: attack dari sel pengirim, spawn_enemy dari sel spawn,
+        kill_enemy ke client yang mengenal musuh itu. Event lain (JSON, migrasi host) tetap ke semua.
+        Pengirim tidak menerima pantulan event-nya sendiri. msg: payload yang sudah di-decode (tervalidasi).
+        """
+        packet = protocol.frame(payload)
+        kind = payload[0]
+        if kind == protocol.MSG_ATTACK and sender in self.player_cells:
+            self.broadcast_event(packet, self.interested(self.player_cells[sender], exclude=sender))
+        elif kind == protocol.MSG_SPAWN_ENEMY:
+            uid = msg['uid']
+            cell = interest_cell(msg['pos'])
+            recipients = self.interested(cell, exclude=sender)
+            self.enemies[uid] = [cell, packet, sender, set(recipients)]
+            self.broadcast_event(packet, recipients)
+        elif kind == protocol.MSG_SPAWN_WAVE:
+            # Satu paket gelombang ke client di sekitar pusatnya; server ikut mengembangkan gelombang agar
+            # kill/enter/leave tetap per musuh
+            recipients = self.interested(interest_cell(msg['pos']), exclude=sender)
+            for uid, enemy_type, pos in waves.expand(msg['seed'], msg['pos'], msg['count'], msg['mix'], msg['uid']):
+                spawn = protocol.encode_event({'event': 'spawn_enemy', 'uid': uid, 'type': enemy_type, 'pos': pos, 'diff': msg['diff']}, sender)
+                self.enemies[uid] = [interest_cell(pos), spawn, sender, set(recipients)]
+            self.broadcast_event(packet, recipients)
+        elif kind == protocol.MSG_KILL_ENEMY:
+            entry = self.enemies.pop(msg['uid'], None)
+            # Musuh tak dikenal (mis. owner lama sudah putus): kirim ke semua, client mengabaikan uid asing
+            self.broadcast_event(packet, None if entry is None else [pid for pid in entry[3] if pid != sender])
+        elif kind == protocol.MSG_DESPAWN_ENEMY:
+            uid = msg['uid']
+            entry = self.enemies.get(uid)
+            if entry is None:
+                return
+            if entry[2] == sender:
+                # Owner menghapus musuhnya (terlalu jauh, reset): lupakan dan hapus juga di peer yang mengenalnya
+                del self.enemies[uid]
+                self.broadcast_event(packet, [pid for pid in entry[3] if pid != sender])
+            else:
+                entry[3].discard(sender) # Peer hanya membuang salinannya sendiri
+        elif kind == protocol.MSG_ENEMY_MOVES:
+            # Owner melaporkan musuh yang pindah sel: enter/leave dihitung dari posisi terkini, bukan sel spawn
+            for uid, pos in msg['moves']:
+                entry = self.enemies.get(uid)
+                if entry is None or entry[2] != sender:
+                    continue
+                entry[1] = protocol.move_spawn(entry[1], pos)
+                cell = interest_cell(pos)
+                if cell == entry[0]:
+                    continue
+                entry[0] = cell
+                for player_id in list(self.player_cells):
+                    self.sync_enemy(player_id, uid, entry)
+        else:
+            self.broadcast_event(packet, [pid for pid in self.clients if pid != sender])
+
+    def update_interest(self, player_id, cell):
+        """Pemain pindah sel: kirim spawn musuh yang masuk radius (enter), despawn yang keluar (leave)."""
+        self.player_cells[player_id] = cell
+        for uid, entry in self.enemies.items():
+            if not self.sync_enemy(player_id, uid, entry):
+                return
+
+    def sync_enemy(self, player_id, uid, entry):
+        """Enter/leave satu musuh untuk satu pemain. False jika pemain di-kick (buffer penuh)."""
+        connection = self.clients.get(player_id)
+        cell = self.player_cells.get(player_id)
+        enemy_cell, packet, owner, known = entry
+        if connection is None or cell is None or owner == player_id:
+            return True # Owner mensimulasikan musuhnya sendiri
+        distance = cell_distance(cell, enemy_cell)
+        if player_id in known:
+            if distance <= LEAVE_RADIUS:
+                return True
+            known.discard(player_id)
+            packet = protocol.encode_event({'event': 'despawn_enemy', 'uid': uid})
+        elif distance <= INTEREST_RADIUS:
+            known.add(player_id)
+        else:
+            return True
+        if connection.push_event(packet):
+            return True
+        print(f"[SERVER] Client {player_id} terlalu lambat, di-kick.")
+        self.handle_disconnect(player_id)
+        return False
+
+    def broadcast_event(self, packet, recipients=None):
+        """Antrikan event ke client (default semua); client yang buffernya penuh di-kick."""
+        if recipients is None:
+            recipients = list(self.clients)
+        slow = [player_id for player_id in recipients
+                if player_id in self.clients and not self.clients[player_id].push_event(packet)]
+        for player_id in slow:
+            print(f"[SERVER] Client {player_id} terlalu lambat, di-kick.")
+            self.handle_disconnect(player_id)
+
+    def handle_disconnect(self, player_id):
         # Perlu tahu apakah client ini adalah host untuk migrasi
-        
-        if addr_str in self.clients:
-            print(f"[DISCONNECT] {addr_str} putus.")
-            del self.clients[addr_str]
-        if addr_str in self.player_states:
-            del self.player_states[addr_str]
-            
+        connection = self.clients.pop(player_id, None)
+        if connection is None:
+            return
+        print(f"[DISCONNECT] {player_id} putus.")
+        connection.closed = True
+        connection.wakeup.set()
+        connection.writer.close()
+        self.player_states.pop(player_id, None)
+        self.states_dirty = True
+        self.player_cells.pop(player_id, None)
+        for entry in self.enemies.values():
+            entry[3].discard(player_id)
+
         # Re-assign host jika perlu
         # Jika Host disconnect, ambil client berikutnya sebagai host baru
-        if self.clients:
-             new_host = sorted(self.clients.keys())[0]
+        new_host = min(self.clients) if self.clients else None
+        if new_host is not None:
              print(f"[HOST] Migrasi ke {new_host}")
-             self.broadcast_event({'event': 'host_migration', 'new_host': new_host})
+             self.broadcast_event(protocol.encode_event({'event': 'host_migration', 'new_host': new_host}))
+        self.orphan_enemies(player_id, new_host)
 
-    def start(self):
-        # Mulai thread broadcast
-        broadcast_thread = threading.Thread(target=self.broadcast_state)
-        broadcast_thread.start()
-        
+    def orphan_enemies(self, owner, successor):
+        """
+        Musuh milik pemain yang putus: yang juga disimulasikan successor diserahkan kepadanya, sisanya
+        dilupakan dan di-despawn di peer yang mengenalnya (tidak ada lagi yang akan me-kill-nya).
+        """
+        for uid in [uid for uid, entry in self.enemies.items() if entry[2] == owner]:
+            entry = self.enemies.get(uid)
+            if entry is None:
+                continue
+            if successor is not None and successor in entry[3]:
+                entry[2] = successor
+                entry[3].discard(successor)
+                continue
+            del self.enemies[uid]
+            self.broadcast_event(protocol.encode_event({'event': 'despawn_enemy', 'uid': uid}), list(entry[3]))
+
+    async def serve(self):
+        self.loop = asyncio.get_running_loop()
+        self.stopped = asyncio.Event()
+        server = await asyncio.start_server(self.handle_client, sock=self.server)
+        broadcast = asyncio.create_task(self.broadcast_state())
         print("[SERVER] Menunggu koneksi...")
-        while self.running:
-            try:
-                conn, addr = self.server.accept()
-                thread = threading.Thread(target=self.handle_client, args=(conn, addr))
-                thread.start()
-                print(f"[ACTIVE CONNECTIONS] {threading.active_count() - 2}")
-            except KeyboardInterrupt:
-                self.running = False
-                break
+        async with server:
+            await self.stopped.wait()
+        broadcast.cancel()
+        for player_id in list(self.clients):
+            self.handle_disconnect(player_id)
+        # Koneksi sudah ditutup: tunggu loop baca selesai sendiri (bukan dibatalkan asyncio.run)
+        await asyncio.gather(*self.handlers, return_exceptions=True)
+
+    def start(self):
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            pass
+        self.running = False
+
+    def stop(self):
+        self.running = False
+        if self.loop is not None and self.stopped is not None:
+            self.loop.call_soon_threadsafe(self.stopped.set)
+        else:
+            self.server.close()
 
 if __name__ == "__main__":
     s = Server()
@@ -0,0 +1,24 @@
+"""
+Gelombang musuh ter-seed: host mengirim satu pesan spawn_wave (seed, pusat, jumlah, campuran tipe,
+difficulty, uid pertama) dan setiap peer mengembangkannya sendiri menjadi musuh yang identik.
+"""
+import random
+
+WAVE_SPREAD = 100 # Offset maksimum musuh dari pusat gelombang (px)
+
+def expand(seed, center, count, mix, base_uid):
+    """
+    mix: ((tipe musuh, bobot), ...). Mengembalikan [(uid, tipe, (x, y)), ...] dengan uid berurutan dari base_uid.
+    Hanya bergantung pada argumen (random.Random ber-seed), jadi hasilnya sama di semua peer.
+    """
+    rng = random.Random(seed)
+    types = [enemy_type for enemy_type, _ in mix]
+    weights = [weight for _, weight in mix]
+    cx, cy = center
+    enemies = []
+    for i in range(count):
+        x = cx + rng.uniform(-WAVE_SPREAD, WAVE_SPREAD)
+        y = cy + rng.uniform(-WAVE_SPREAD, WAVE_SPREAD)
+        enemy_type = rng.choices(types, weights)[0]
+        enemies.append((base_uid + i, enemy_type, (x, y)))
+    return enemies
@@ -3,8 +3,12 @@ import random
 from ..settings import *
 from ..items.upgrades import UPGRADE_DATA
 from ..entities.player import Player
-from ..entities.enemy import Enemy
+from ..entities.horde import Horde, SEPARATION_RADIUS
+from ..core.spatial_hash import SpatialHashGrid
+from ..core.flow_field import FlowFields
+from ..core import sim_clock, profiler, pool
 from ..camera import CameraGroup
+from ..network import protocol, waves
 from ..tilemap import ChunkManager
 from .scene import Scene
 
@@ -30,37 +34,56 @@ class GameScene(Scene):
         
         # Manajer Chunk Tak Terbatas (Lantai Prosedural)
         from ..tilemap import ChunkManager
+        # Headless (benchmark/simulasi): chunk dimuat sinkron satu per frame agar hasil run deterministik
         self.chunk_manager = ChunkManager(
             self.camera_group, 
-            self.obstacle_sprites
+            self.obstacle_sprites,
+            workers=0 if self.manager.headless else CHUNK_WORKERS,
+            budget=0 if self.manager.headless else CHUNK_BUILD_BUDGET
         )
+        self.obstacle_index = self.chunk_manager.obstacle_index
         
         # Spawn pemain (Di mana saja)
-        self.player = Player((0, 0), self.camera_group, self.obstacle_sprites, self.enemy_sprites, self.manager.selected_character)
+        self.player = Player((0, 0), self.camera_group, self.obstacle_sprites, self.enemy_sprites, self.manager.selected_character, obstacle_index=self.obstacle_index)
         
         # Link Kamera ke Pemain
         self.camera_group.target = self.player
         
+        # Simulasi Musuh (Struct-of-Arrays, sprite hanya view)
+        self.horde = Horde(self)
+        # Grid spasial musuh (pusat hitbox), dibangun ulang sekali per frame
+        self.enemy_grid = SpatialHashGrid(SEPARATION_RADIUS)
+        # Flow field pathfinding per pemain (dipakai semua musuh)
+        self.flow_fields = FlowFields(self.chunk_manager)
+        
     def on_enter(self):
         # 0. RESET STATE TOTAL
-        # Hapus semua sprite yang ada
+        # Musuh dulu (lewat Horde agar peer lain diberi tahu), lalu semua sprite yang ada
+        self.horde.clear()
         for sprite in self.camera_group: sprite.kill()
         self.camera_group.empty()
         self.obstacle_sprites.empty()
         self.enemy_sprites.empty()
         self.light_sprites.empty()
         if hasattr(self, 'interactable_sprites'): self.interactable_sprites.empty()
+        self.flow_fields.clear()
+        self.enemy_uid_counter = 0 # uid musuh jaringan (lihat new_enemy_uid)
+        self.enemy_report_time = 0
+        
+        # Emitter partikel (array NumPy, satu sprite per jenis partikel)
+        from ..vfx.particles import ParticleSystem
+        self.particles = ParticleSystem([self.camera_group])
         
         # Reset Manajer Chunk (Regenerasi Dunia)
         self.chunk_manager.reset()
         
         # Mulai baru untuk pemain dengan karakter terpilih
         # (Pemain akan menambahkan dirinya sendiri ke camera_group dan grup lain di __init__)
-        self.player = Player((0, 0), self.camera_group, self.obstacle_sprites, self.enemy_sprites, self.manager.selected_character)
+        self.player = Player((0, 0), self.camera_group, self.obstacle_sprites, self.enemy_sprites, self.manager.selected_character, obstacle_index=self.obstacle_index)
         self.camera_group.target = self.player
         
         # Reset difficulty dan timer
-        self.survival_start_time = pygame.time.get_ticks()
+        self.survival_start_time = sim_clock.get_ticks()
         self.difficulty_multiplier = 1.0
         self.difficulty_timer = self.survival_start_time
         self.spawn_timer = 0
@@ -79,6 +102,8 @@ class GameScene(Scene):
         
         # Font Debug (Dicache)
         self.debug_font = pygame.font.SysFont("arial", 16)
+        from ..ui.profiler_graph import ProfilerGraph
+        self.profiler_graph = ProfilerGraph()
         
         # Minimap (Refactor)
         from ..ui.minimap import Minimap
@@ -149,34 +174,46 @@ class GameScene(Scene):
                             break
                             
                 elif evt['event'] == 'spawn_enemy':
-                    # Spawn di sisi Client
+                    # Spawn di sisi Client (cek duplikat lewat uid)
                     uid = evt['uid']
-                    # Cek duplikat
-                    exists = False
-                    for e in self.enemy_sprites:
-                        if hasattr(e, 'uid') and e.uid == uid:
-                             exists = True; break
-                    
-                    if not exists:
-                        Enemy(evt['pos'], [self.camera_group, self.enemy_sprites], self.player, self.obstacle_sprites, evt['type'], evt['diff'], uid=uid)
+                    if uid not in self.horde.by_uid:
+                        self.horde.spawn(evt['pos'], evt['type'], evt['diff'], uid=uid)
+
+                elif evt['event'] == 'spawn_wave':
+                    # Kembangkan gelombang ter-seed: musuh identik dengan host, uid berurutan
+                    for uid, enemy_type, spawn_pos in waves.expand(evt['seed'], evt['pos'], evt['count'], evt['mix'], evt['uid']):
+                        if uid not in self.horde.by_uid:
+                            self.horde.spawn(spawn_pos, enemy_type, evt['diff'], uid=uid)
 
                 elif evt['event'] == 'kill_enemy':
-                    uid = evt['uid']
-                    for e in self.enemy_sprites:
-                        if hasattr(e, 'uid') and e.uid == uid:
-                             # Langsung kill diam-diam atau picu death?
-                             # Picu death memungkinkan animasi
-                             if not e.is_dead:
-                                 e.health = 0
-                                 e.is_dead = True
-                                 e.frame_index = 0
-                                 e.status = 'death'
-                             break
+                    e = self.horde.by_uid.get(evt['uid'])
+                    # Langsung kill diam-diam atau picu death?
+                    # Picu death memungkinkan animasi
+                    if e is not None and not e.is_dead:
+                        e.health = 0
+                        e.is_dead = True
+                        e.frame_index = 0
+                        e.status = 'death'
+
+                elif evt['event'] == 'despawn_enemy':
+                    # Musuh keluar area of interest: hapus diam-diam (tanpa loot/animasi)
+                    enemy = self.horde.by_uid.get(evt['uid'])
+                    if enemy is not None:
+                        enemy.kill()
 
         # 4. Bersihkan yang Terputus
         for rp in self.remote_players:
             if rp.pid not in active_pids:
                 rp.kill()
+
+        # 5. Host melaporkan musuh yang pindah sel (area of interest server dihitung dari posisi terkini).
+        # Client tidak melapor; setelah migrasi, laporan pertama host baru menyusulkan semua perpindahan
+        now = sim_clock.get_ticks()
+        if client.is_host and now - self.enemy_report_time >= ENEMY_REPORT_INTERVAL:
+            self.enemy_report_time = now
+            moves = self.horde.moved_enemies()
+            if moves:
+                client.send_event('enemy_moves', {'moves': moves})
     
     def handle_events(self, events):
         for event in events:
@@ -356,15 +393,43 @@ class GameScene(Scene):
         self.menu_options[2] = f"Fullscreen: {fs_text}"
         self.menu_options[3] = f"Resolution: {res_text}"
 
+    def begin_step(self):
+        # State sebelum langkah simulasi, untuk interpolasi render
+        self.prev_positions = {sprite: sprite.rect.topleft for sprite in [self.player, *self.remote_players]}
+        self.horde.begin_step()
+
+    def render_offsets(self, alpha):
+        """Offset gambar (px) per sprite bergerak agar render berada di antara dua langkah simulasi."""
+        offsets = {}
+        if alpha >= 1.0:
+            return offsets
+        for sprite, (prev_x, prev_y) in getattr(self, 'prev_positions', {}).items():
+            x, y = sprite.rect.topleft
+            if (prev_x, prev_y) != (x, y):
+                offsets[sprite] = (round((prev_x - x) * (1 - alpha)), round((prev_y - y) * (1 - alpha)))
+        self.horde.render_offsets(alpha, offsets)
+        return offsets
+
     def update(self, dt):
         if self.paused:
             return
 
+        # Waktu simulasi hanya maju saat game berjalan (tidak saat pause/level up)
+        sim_clock.advance(dt)
+
+        # Grid tetangga dipakai separasi musuh & query target pemain di frame ini
+        with profiler.scope('enemy_ai'):
+            self.horde.rebuild_grid(self.enemy_grid)
+            self.flow_fields.update([self.player] + self.remote_players.sprites())
+
         # Entity Updates
-        self.camera_group.update(dt) 
+        with profiler.scope('camera_update'):
+            self.camera_group.update(dt)
+        with profiler.scope('enemy_ai'):
+            self.horde.update(dt)
         self.interactable_sprites.update(dt)
 
-        current_time = pygame.time.get_ticks()
+        current_time = sim_clock.get_ticks()
 
         # Update Difficulty
         if current_time - self.difficulty_timer > DIFFICULTY_INTERVAL:
@@ -387,13 +452,12 @@ class GameScene(Scene):
                     self.player.is_dead = False
                     self.player.status = 'idle'
                     self.player.pos = pygame.math.Vector2(0, 0)
-                    for enemy in self.enemy_sprites:
-                        enemy.kill()
+                    self.horde.clear()
                     # Reset difficulty
                     self.difficulty_multiplier = 1.0
                     self.difficulty_timer = current_time
                     self.spawn_cooldown = INITIAL_SPAWN_COOLDOWN
-                    self.survival_start_time = pygame.time.get_ticks() # Reset Timer
+                    self.survival_start_time = sim_clock.get_ticks() # Reset Timer
                     if hasattr(self, 'death_time'): delattr(self, 'death_time')
                     return
     
@@ -403,16 +467,26 @@ class GameScene(Scene):
             self.spawn_timer = current_time
             
         # Update World
-        self.chunk_manager.update(self.player.pos)
+        with profiler.scope('chunks'):
+            self.chunk_manager.update(self.player.pos)
         
         # Network Sync
-        self.update_network()
-        self.remote_players.update(dt)
+        with profiler.scope('network'):
+            self.update_network()
+            self.remote_players.update(dt)
+
+    def new_enemy_uid(self, count=1):
+        # uid 64-bit: ID pemain host di 32 bit atas, agar tetap unik setelah migrasi host
+        # count > 1: pesan blok uid berurutan (gelombang), dikembalikan uid pertama
+        client = getattr(self.manager, 'network_client', None)
+        owner = client.addr if client and client.addr else 0
+        first = self.enemy_uid_counter + 1
+        self.enemy_uid_counter += count
+        return (owner << 32) | first
 
     def spawn_enemy(self, pos=None):
         # Generic Spawning using ENEMY_DATA
         import math
-        import uuid
         
         spawn_x, spawn_y = 0, 0
         
@@ -423,6 +497,9 @@ class GameScene(Scene):
             distance = random.uniform(700, 1200)
             spawn_x = self.player.pos.x + math.cos(angle) * distance
             spawn_y = self.player.pos.y + math.sin(angle) * distance
+        # Posisi (px bulat) dan difficulty dikuantisasi seperti di jaringan: musuh identik di semua peer
+        spawn_x, spawn_y = round(spawn_x), round(spawn_y)
+        difficulty = protocol.quantize_difficulty(self.difficulty_multiplier)
         
         # Determine enemy type
         enemy_type = 'orc'
@@ -430,10 +507,10 @@ class GameScene(Scene):
         if random.random() < min(captain_chance, 0.4): # Cap at 40%
             enemy_type = 'orc_captain'
         
-        uid = str(uuid.uuid4())
+        uid = self.new_enemy_uid()
         
         # Spawn Locally
-        Enemy((spawn_x, spawn_y), [self.camera_group, self.enemy_sprites], self.player, self.obstacle_sprites, enemy_type, self.difficulty_multiplier, uid=uid)
+        self.horde.spawn((spawn_x, spawn_y), enemy_type, difficulty, uid=uid)
 
         # Broadcast if Host
         if hasattr(self.manager, 'network_client') and self.manager.network_client and self.manager.network_client.is_host:
@@ -441,7 +518,7 @@ class GameScene(Scene):
                  'uid': uid,
                  'type': enemy_type,
                  'pos': (spawn_x, spawn_y),
-                 'diff': self.difficulty_multiplier
+                 'diff': difficulty
              })
 
     def spawn_enemy_wave(self, current_time):
@@ -453,7 +530,7 @@ class GameScene(Scene):
         if not is_host: return # Client diam saja
         
         # Hard Cap Jumlah Musuh (Cegah lag)
-        if len(self.enemy_sprites) >= 300:
+        if len(self.enemy_sprites) >= MAX_ENEMIES:
             return
         
         # Hitung Waktu Bertahan
@@ -462,7 +539,6 @@ class GameScene(Scene):
         
         # Tentukan Tipe Spawn
         import math
-        import uuid
         
         # Default: Spawn Tunggal
         count = 1
@@ -486,35 +562,34 @@ class GameScene(Scene):
             # Pilih pusat cluster
             angle = random.uniform(0, 2 * math.pi)
             distance = random.uniform(700, 900)
-            center_x = self.player.pos.x + math.cos(angle) * distance
-            center_y = self.player.pos.y + math.sin(angle) * distance
+            # Pusat dibulatkan ke px agar sama persis setelah lewat jaringan
+            center = (round(self.player.pos.x + math.cos(angle) * distance),
+                      round(self.player.pos.y + math.sin(angle) * distance))
             
-            for _ in range(count):
-                # Spawn di sekitar pusat
-                offset_x = random.uniform(-100, 100)
-                offset_y = random.uniform(-100, 100)
-                spawn_pos = (center_x + offset_x, center_y + offset_y)
+            # Satu gelombang ter-seed: host dan client mengembangkan seed yang sama (uid berurutan)
+            seed = random.getrandbits(32)
+            mix = (('orc', 1),) # Tipe Musuh Dinamis? Untuk sekarang, Orc.
+            difficulty = protocol.quantize_difficulty(self.difficulty_multiplier) # Sama persis dengan yang terkirim
+            base_uid = self.new_enemy_uid(count)
+            for uid, enemy_type, spawn_pos in waves.expand(seed, center, count, mix, base_uid):
+                self.horde.spawn(spawn_pos, enemy_type, difficulty, uid=uid)
                 
-                # Tipe Musuh Dinamis? Untuk sekarang, Orc.
-                enemy_type = 'orc'
-                uid = str(uuid.uuid4())
-                
-                Enemy(spawn_pos, [self.camera_group, self.enemy_sprites], self.player, self.obstacle_sprites, enemy_type, self.difficulty_multiplier, uid=uid)
-                
-                # Broadcast
-                if hasattr(self.manager, 'network_client') and self.manager.network_client:
-                     self.manager.network_client.send_event('spawn_enemy', {
-                         'uid': uid,
-                         'type': enemy_type,
-                         'pos': spawn_pos,
-                         'diff': self.difficulty_multiplier
-                     })
+            # Broadcast: satu pesan per gelombang
+            if hasattr(self.manager, 'network_client') and self.manager.network_client:
+                 self.manager.network_client.send_event('spawn_wave', {
+                     'uid': base_uid,
+                     'seed': seed,
+                     'pos': center,
+                     'count': count,
+                     'mix': mix,
+                     'diff': difficulty
+                 })
         else:
              # Spawn tersebar standar
              self.spawn_enemy()
 
     def get_survival_time_str(self):
-        elapsed_ms = pygame.time.get_ticks() - self.survival_start_time
+        elapsed_ms = sim_clock.get_ticks() - self.survival_start_time
         seconds = (elapsed_ms // 1000) % 60
         minutes = (elapsed_ms // 60000)
         return f"{minutes:02}:{seconds:02}"
@@ -609,7 +684,7 @@ class GameScene(Scene):
     def draw_debug_overlay(self, surf):
         fps = int(self.manager.clock.get_fps())
         sprites_total = len(self.camera_group)
-        sprites_visible = len([s for s in self.camera_group.sprites() if self.camera_group.virtual_surface.get_rect().colliderect(s.rect.move(-self.camera_group.offset.x, -self.camera_group.offset.y))])
+        sprites_visible = self.camera_group.visible_count # Dihitung saat custom_draw (tanpa scan ulang)
 
         # Entity Breakdown
         enemies = len(self.enemy_sprites)
@@ -623,16 +698,21 @@ class GameScene(Scene):
         # But here manager.resolution and virtual_surface usually match or are handled by main.py
         world_mouse = mouse_pos + self.camera_group.offset
         cx, cy = self.chunk_manager.get_chunk_coord(self.player.pos)
+        chunk_cache = self.chunk_manager.cache
         
         info_lines = [
             f"FPS: {fps} | DT: {self.manager.clock.get_time()}ms",
             f"Entities: {sprites_total} (Vis: ~{sprites_visible})",
-            f"  - Enemies: {enemies} | Remote: {remotes} | VFX: {vfx}",
+            f"  - Enemies: {enemies} | Remote: {remotes} | VFX: {vfx} | Particles: {self.particles.count}",
             f"Player Pos: ({int(self.player.pos.x)}, {int(self.player.pos.y)})",
-            f"Chunk: {cx}, {cy} | Queue: {len(self.chunk_manager.load_queue)}",
+            f"Chunk: {cx}, {cy} | Queue: {len(self.chunk_manager.queued)} | Generating: {len(self.chunk_manager.in_flight)} | To visible: max {self.chunk_manager.worst_latency * 1000:.0f} ms",
+            f"Chunk cache: {len(chunk_cache.entries)} chunk | {chunk_cache.bytes // 1024}/{chunk_cache.budget // 1024} KB | hit {chunk_cache.hit_rate:.0%} | evict {chunk_cache.evictions}",
             f"Difficulty: {self.difficulty_multiplier:.2f} | Mouse: ({int(world_mouse.x)}, {int(world_mouse.y)})",
             f"Hit Stop: {self.manager.is_hit_stopped}"
         ]
+        # Pool VFX/loot: aktif sekarang, high-water mark, instance bebas tersimpan
+        for name, sprite_pool in pool.stats():
+            info_lines.append(f"Pool {name}: active {sprite_pool.active} | peak {sprite_pool.high_water} | free {len(sprite_pool.free)}/{sprite_pool.size}")
         
         y = 60
         for line in info_lines:
@@ -641,6 +721,9 @@ class GameScene(Scene):
             surf.blit(text, (15, y))
             y += 22
 
+        # Grafik waktu frame per subsistem (profiler aktif selama debug mode)
+        self.profiler_graph.draw(surf, (10, y + 4))
+
 
     def draw(self):
         # Bersihkan Surface UI (Penting!)
@@ -658,11 +741,19 @@ class GameScene(Scene):
         self.camera_group.half_width = self.virtual_width // 2
         self.camera_group.half_height = self.virtual_height // 2
         
-        self.virtual_surface.fill((30, 30, 45))
-        self.camera_group.custom_draw()
+        with profiler.scope('custom_draw'):
+            batch = self.manager.sprite_batch
+            if batch:
+                # Dunia digambar GPU (quad instanced); debug & crosshair ke layer UI
+                batch.begin((30, 30, 45))
+                self.camera_group.custom_draw(self.render_offsets(self.render_alpha), target=batch, overlay=self.manager.ui_surface)
+            else:
+                self.virtual_surface.fill((30, 30, 45))
+                self.camera_group.custom_draw(self.render_offsets(self.render_alpha))
         
         # Gambar HUD dan Menu ke layer terpisah
-        bar_data = self.draw_ui()
+        with profiler.scope('draw_ui'):
+            bar_data = self.draw_ui()
         
         if self.paused:
             if self.level_up_active:
@@ -2,6 +2,8 @@ class Scene:
     def __init__(self, manager):
         self.manager = manager
         self.display_surface = manager.render_surface
+        # Posisi render di antara dua langkah simulasi terakhir (0..1), diset GameManager
+        self.render_alpha = 1.0
 
     def handle_events(self, events):
         pass
@@ -9,6 +11,10 @@ class Scene:
     def on_enter(self):
         pass
 
+    def begin_step(self):
+        # Dipanggil sebelum setiap langkah simulasi (simpan state untuk interpolasi)
+        pass
+
     def update(self, dt):
         pass
 
@@ -7,8 +7,12 @@ SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 TILE_SIZE = 64
 CAMERA_ZOOM = 2.4
-FPS = 0 # 0 artinya uncapped
+FPS = 0 # 0 artinya uncapped (render)
+SIM_RATE = 60 # Hz langkah simulasi tetap (logika tidak tergantung FPS render)
+MAX_SIM_STEPS = 5 # Batas langkah simulasi per frame render (cegah spiral of death)
 DEBUG_MODE = False
+PROFILER_WINDOW = 120 # Frame di jendela bergulir profiler (debug overlay)
+GPU_SPRITES = False # Eksperimental: gambar dunia sebagai quad instanced di GPU (SpriteBatch) alih-alih blit CPU
 
 # Warna (Premium Palette)
 # Background gelap, aksen Neon
@@ -38,19 +42,40 @@ DASH_COOLDOWN = 600 # ms
 CAMERA_ZOOM = 1.5 
 TILE_SIZE = 64
 CHUNK_SIZE = 16 # Tile per chunk
+BIOME_SCALE = 32 # Tile per sisi region biome makro (hutan)
 LOAD_RADIUS = 3 # Radius chunk yang dimuat di sekitar pemain
+CHUNK_WORKERS = 2 # Thread generator chunk (0 = sinkron di main thread, satu chunk per frame)
+CHUNK_BUILD_BUDGET = 2 # ms per frame untuk memuat chunk (minimal satu chunk per frame)
+CHUNK_PREFETCH_STEPS = 60 # Prediksi posisi pemain sejauh ini (langkah simulasi) untuk prioritas/prefetch chunk
+CHUNK_CACHE_BUDGET = 4 * 1024 * 1024 # Byte (estimasi) chunk yang baru di-unload yang disimpan untuk dipakai lagi (LRU)
+FLOW_FIELD_RADIUS = 32 # Radius flow field pathfinding musuh di sekitar pemain (tile)
 
 # AI Orc
 ORC_SPEED = 2.5
 ORC_CHASE_RANGE = 2500
 ORC_ATTACK_RANGE = 45
 ORC_ANIMATION_SPEED = 0.15
+MAX_ENEMIES = 3000 # Batas horde (simulasi vektor di Horde)
+ENEMY_REPORT_INTERVAL = 200 # ms antar laporan posisi musuh dari host ke server (area of interest)
 
 # Pertarungan
 PLAYER_HEALTH = 100
 PLAYER_ATTACK_COOLDOWN = 300 # ms
 PLAYER_DAMAGE = 20
 
+# Pool Sprite (VFX & loot berumur pendek): jumlah instance bebas maksimum yang disimpan per class
+POOL_SIZES = {
+    'HitSpark': 256,
+    'DeathEffect': 128,
+    'ExperienceGem': 1024,
+}
+DEFAULT_POOL_SIZE = 64
+
+# Cache Aset
+SPRITE_CACHE_DIR = ".cache/sprites" # Frame sprite yang sudah di-trim & di-scale (dibuat ulang otomatis jika PNG berubah)
+ATLAS_DIR = "assets/atlas" # Output tools/atlas_builder.py (halaman atlas + index.json), dimuat saat start jika ada
+ATLAS_PAGE_SIZE = 2048 # Ukuran sisi halaman atlas (px)
+
 # Data Karakter
 CHARACTER_DATA = {
     'adventurer': {
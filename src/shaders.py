@@ -2,9 +2,11 @@ import moderngl
 import pygame
 import numpy as np
 from array import array
+from .core import profiler
+from .sprite_batch import SpriteBatch
 
 class ShaderPipeline:
-    def __init__(self, size):
+    def __init__(self, size, sprite_batch=False):
         self.ctx = moderngl.create_context()
         self.size = size
         
@@ -41,15 +43,24 @@ class ShaderPipeline:
         if 'tex_ui' in self.program:
             self.program['tex_ui'].value = 1
 
+        # Optional GPU world renderer (GameScene records into it instead of blitting render_surface)
+        self.sprite_batch = SpriteBatch(self.ctx, size) if sprite_batch else None
+
     def render(self, surface, ui_surface=None, player_pos=(0.5, 0.5), render_mode=0, lights=[], shadows=[], bar_data=None):
         # Update World Texture
-        self.texture.write(surface.get_view('1'))
-        self.texture.use(0)
-        
+        if self.sprite_batch and self.sprite_batch.pending:
+            # World already recorded as sprites: draw it on the GPU, no full-frame upload
+            self.sprite_batch.flush().use(0)
+        else:
+            with profiler.scope('texture_upload'):
+                self.texture.write(surface.get_view('1'))
+                self.texture.use(0)
+
         # Update UI Texture
-        if ui_surface:
-            self.texture_ui.write(ui_surface.get_view('1'))
-        self.texture_ui.use(1)
+        with profiler.scope('texture_upload'):
+            if ui_surface:
+                self.texture_ui.write(ui_surface.get_view('1'))
+            self.texture_ui.use(1)
         
         # Update uniforms
         if 'time' in self.program:
@@ -107,3 +118,6 @@ class ShaderPipeline:
         self.texture_ui = self.ctx.texture(size, 4)
         self.texture_ui.filter = (moderngl.NEAREST, moderngl.NEAREST)
         self.texture_ui.swizzle = 'BGRA' # Fixed: must match __init__ to prevent color swap
+
+        if self.sprite_batch:
+            self.sprite_batch.resize(size)
@@ -0,0 +1,11 @@
+#version 330 core
+uniform sampler2D tex;
+
+in vec2 v_uv;
+in vec4 v_color;
+out vec4 f_color;
+
+void main() {
+    vec4 color = texture(tex, v_uv);
+    f_color = vec4(color.rgb * v_color.rgb, color.a * v_color.a);
+}
@@ -0,0 +1,21 @@
+#version 330 core
+uniform vec2 u_screen;
+
+in vec2 in_corner; // Quad corner (0..1)
+// Per instance
+in vec4 in_rect;   // x, y, w, h in screen pixels (y down)
+in vec4 in_uv;     // u0, v0, u1, v1 (v0 = top row of the source surface)
+in vec4 in_color;  // Tint rgb, alpha
+in float in_flip;  // 1.0 = mirrored horizontally
+
+out vec2 v_uv;
+out vec4 v_color;
+
+void main() {
+    vec2 pos = in_rect.xy + in_corner * in_rect.zw;
+    // Pixel row 0 maps to texture row 0, the same layout as surfaces uploaded with texture.write
+    gl_Position = vec4(pos / u_screen * 2.0 - 1.0, 0.0, 1.0);
+    float u = mix(in_corner.x, 1.0 - in_corner.x, in_flip);
+    v_uv = mix(in_uv.xy, in_uv.zw, vec2(u, in_corner.y));
+    v_color = in_color;
+}
@@ -0,0 +1,231 @@
+import moderngl
+import pygame
+import numpy as np
+from .core import profiler
+from .utils import FLIP_SOURCES
+
+# Per instance: rect (4), uv (4), warna (4), flip (1)
+INSTANCE_FORMAT = (('in_rect', 4), ('in_uv', 4), ('in_color', 4), ('in_flip', 1))
+INSTANCE_STRIDE = 13 * 4
+
+CACHE_PAGE_SIZE = 2048 # Halaman tekstur bersama tempat region sumber kecil di-pack
+MAX_CACHE_PAGES = 4 # Lewat dari ini cache diulang dari nol (frame berikutnya), mis. setelah banyak surface sekali pakai
+PACK_MAX_SIDE = 512 # Region yang lebih besar (lantai chunk) mendapat tekstur sendiri
+EVICT_FRAMES = 300 # Tekstur sendiri yang tidak dipakai selama sekian frame dilepas
+EVICT_INTERVAL = 60
+
+class SpriteBatch:
+    """
+    Renderer dunia GPU (opsional). Merekam panggilan blit/fblits seperti Surface dan menggambarnya
+    sebagai quad instanced ke tekstur offscreen, yang diberikan ShaderPipeline ke pass lighting
+    sebagai ganti upload frame hasil render CPU.
+
+    Pixel sumber di-upload sekali: region kecil (frame, stamp, bayangan) di-pack ke halaman cache
+    bersama, jadi quad berurutan umumnya berbagi satu tekstur dan menjadi satu draw call instanced.
+    Varian transparan memakai region frame-nya dengan alpha per instance, varian cermin memakai
+    frame yang tidak di-flip dengan flag flip.
+    """
+
+    def __init__(self, ctx, size):
+        self.ctx = ctx
+        with open('src/shaders/sprite.vert', 'r') as f:
+            vert = f.read()
+        with open('src/shaders/sprite.frag', 'r') as f:
+            frag = f.read()
+        self.program = ctx.program(vertex_shader=vert, fragment_shader=frag)
+        self.program['tex'].value = 0
+        self.locations = [(self.program[name].location, components) for name, components in INSTANCE_FORMAT]
+
+        self.quad = ctx.buffer(np.array([0.0, 0.0, 1.0, 0.0, 0.0, 1.0, 1.0, 1.0], dtype='f4'))
+        self.vao = ctx.vertex_array(self.program, [(self.quad, '2f', 'in_corner')])
+        self.instances = ctx.buffer(reserve=INSTANCE_STRIDE * 1024, dynamic=True)
+
+        self._sources = {} # surface -> (tekstur, u0, v0, u1, v1, mirrored)
+        self._packed = {} # (root, x, y, w, h) -> (tekstur, px, py, u0, v0, u1, v1)
+        self._pages = [] # [tekstur, x, y, tinggi shelf]
+        self._own = {} # surface root -> [tekstur, frame terakhir dipakai]
+        self._reset_pending = False
+        self._frame = 0
+        self._textures = [] # Tekstur per quad yang direkam
+        self._data = []
+        self.pending = False # True di antara begin() dan flush()
+        self.clear_color = (0, 0, 0)
+
+        self.fbo = None
+        self.resize(size)
+
+    def resize(self, size):
+        if self.fbo is not None:
+            self.fbo.release()
+            self.target.release()
+        self.size = size
+        self.target = self.ctx.texture(size, 4)
+        self.target.filter = (moderngl.NEAREST, moderngl.NEAREST)
+        self.fbo = self.ctx.framebuffer(color_attachments=[self.target])
+        self.program['u_screen'].value = size
+
+    # --- Rekam (seperti Surface) -----------------------------------------
+
+    def begin(self, clear_color):
+        self._frame += 1
+        if self._reset_pending:
+            self._reset_cache()
+        elif self._frame % EVICT_INTERVAL == 0:
+            self._evict()
+        self._textures.clear()
+        self._data.clear()
+        self.clear_color = clear_color
+        self.pending = True
+
+    def blit(self, surface, dest, flip=False, tint=(1.0, 1.0, 1.0)):
+        source = self._sources.get(surface)
+        if source is None:
+            source = self._sources[surface] = self._resolve(surface)
+        texture, u0, v0, u1, v1, mirrored = source
+
+        w, h = surface.get_size()
+        alpha = surface.get_alpha()
+        self._textures.append(texture)
+        # int(): pembulatan sama seperti Surface.blit dengan posisi float
+        self._data.append((int(dest[0]), int(dest[1]), w, h, u0, v0, u1, v1,
+                           tint[0], tint[1], tint[2], 1.0 if alpha is None else alpha / 255,
+                           1.0 if mirrored != bool(flip) else 0.0))
+
+    def get_size(self):
+        return self.size
+
+    def fblits(self, blit_sequence):
+        for surface, dest in blit_sequence:
+            self.blit(surface, dest)
+
+    def refresh(self, surface):
+        """Upload ulang surface yang pixel-nya digambar ulang di tempat."""
+        root, x, y, w, h, _ = self._region(surface)
+        slot = self._packed.get((root, x, y, w, h))
+        if slot is not None:
+            slot[0].write(pygame.image.tobytes(self._pixels(root, x, y, w, h), 'RGBA'), viewport=(slot[1], slot[2], w, h))
+        elif root in self._own:
+            self._own[root][0].write(pygame.image.tobytes(root, 'RGBA'))
+
+    # --- Cache tekstur --------------------------------------------------------
+
+    def _region(self, surface):
+        """(surface root, x, y, w, h, mirrored) dari pixel yang ditampilkan surface."""
+        root = surface.get_abs_parent()
+        x, y = surface.get_abs_offset()
+        w, h = surface.get_size()
+        source = FLIP_SOURCES.get(root)
+        if source is None:
+            return root, x, y, w, h, False
+        # Varian cermin: region yang sama dari frame yang tidak di-flip, digambar ter-flip
+        x = root.get_width() - x - w
+        source_x, source_y = source.get_abs_offset()
+        return source.get_abs_parent(), x + source_x, y + source_y, w, h, True
+
+    @staticmethod
+    def _pixels(root, x, y, w, h):
+        if (x, y, w, h) == (0, 0, *root.get_size()):
+            return root
+        return root.subsurface((x, y, w, h))
+
+    def _resolve(self, surface):
+        root, x, y, w, h, mirrored = self._region(surface)
+        if w <= PACK_MAX_SIDE and h <= PACK_MAX_SIDE:
+            key = (root, x, y, w, h)
+            slot = self._packed.get(key)
+            if slot is None:
+                slot = self._packed[key] = self._pack(self._pixels(root, x, y, w, h))
+            texture, _, _, u0, v0, u1, v1 = slot
+            return (texture, u0, v0, u1, v1, mirrored)
+
+        own = self._own.get(root)
+        if own is None:
+            texture = self.ctx.texture(root.get_size(), 4, pygame.image.tobytes(root, 'RGBA'))
+            texture.filter = (moderngl.NEAREST, moderngl.NEAREST)
+            own = self._own[root] = [texture, self._frame]
+        root_w, root_h = root.get_size()
+        return (own[0], x / root_w, y / root_h, (x + w) / root_w, (y + h) / root_h, mirrored)
+
+    def _pack(self, pixels):
+        # Shelf packing dengan padding 1px
+        w, h = pixels.get_size()
+        page = self._pages[-1] if self._pages else None
+        if page is not None and page[1] + w + 1 > CACHE_PAGE_SIZE:
+            page[1], page[2], page[3] = 0, page[2] + page[3], 0 # Shelf berikutnya
+        if page is None or page[2] + h + 1 > CACHE_PAGE_SIZE:
+            texture = self.ctx.texture((CACHE_PAGE_SIZE, CACHE_PAGE_SIZE), 4)
+            texture.filter = (moderngl.NEAREST, moderngl.NEAREST)
+            page = [texture, 0, 0, 0]
+            self._pages.append(page)
+            # Quad yang direkam frame ini mungkin masih memakai halaman lama: ulang dari nol di begin() berikutnya
+            if len(self._pages) > MAX_CACHE_PAGES:
+                self._reset_pending = True
+
+        texture, x, y = page[0], page[1], page[2]
+        texture.write(pygame.image.tobytes(pixels, 'RGBA'), viewport=(x, y, w, h))
+        page[1] += w + 1
+        page[3] = max(page[3], h + 1)
+        size = CACHE_PAGE_SIZE
+        return (texture, x, y, x / size, y / size, (x + w) / size, (y + h) / size)
+
+    def _reset_cache(self):
+        for page in self._pages:
+            page[0].release()
+        self._pages.clear()
+        self._packed.clear()
+        self._sources.clear()
+        self._reset_pending = False
+
+    def _evict(self):
+        stale = [root for root, (_, used) in self._own.items() if self._frame - used > EVICT_FRAMES]
+        if not stale:
+            return
+        released = set()
+        for root in stale:
+            texture = self._own.pop(root)[0]
+            released.add(texture)
+            texture.release()
+        self._sources = {surface: source for surface, source in self._sources.items() if source[0] not in released}
+
+    # --- Gambar ---------------------------------------------------------------
+
+    def flush(self):
+        """Gambar quad yang direkam ke target offscreen dan kembalikan teksturnya."""
+        with profiler.scope('sprite_batch'):
+            previous = self.ctx.fbo
+            self.fbo.use()
+            self.ctx.viewport = (0, 0, self.size[0], self.size[1])
+            r, g, b = self.clear_color
+            self.fbo.clear(r / 255, g / 255, b / 255, 1.0)
+
+            if self._data:
+                data = np.array(self._data, dtype='f4')
+                if data.nbytes > self.instances.size:
+                    self.instances.orphan(data.nbytes * 2)
+                self.instances.write(data)
+
+                self.ctx.enable(moderngl.BLEND)
+                self.ctx.blend_func = (moderngl.SRC_ALPHA, moderngl.ONE_MINUS_SRC_ALPHA, moderngl.ZERO, moderngl.ONE)
+                textures = self._textures
+                own = {entry[0]: entry for entry in self._own.values()}
+                start = 0
+                for end in range(1, len(textures) + 1):
+                    if end < len(textures) and textures[end] is textures[start]:
+                        continue
+                    # Satu draw instanced per deretan quad yang berbagi tekstur
+                    offset = start * INSTANCE_STRIDE
+                    for location, components in self.locations:
+                        self.vao.bind(location, 'f', self.instances, f'{components}f', offset=offset, stride=INSTANCE_STRIDE, divisor=1)
+                        offset += components * 4
+                    texture = textures[start]
+                    texture.use(0)
+                    self.vao.render(moderngl.TRIANGLE_STRIP, vertices=4, instances=end - start)
+                    if texture in own:
+                        own[texture][1] = self._frame
+                    start = end
+                self.ctx.disable(moderngl.BLEND)
+
+            if previous is not None: # None di context standalone (tes/headless)
+                previous.use()
+            self.pending = False
+        return self.target
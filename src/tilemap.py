@@ -1,18 +1,116 @@
 import pygame
 import os
-import random
+import time
+import queue
+import heapq
+import numpy as np
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from .settings import *
 from .utils import load_sprite_sheet
+from .core.obstacle_index import ObstacleIndex
+from . import worldgen
+from .worldgen import EMPTY
 
-class Tile(pygame.sprite.Sprite):
-    def __init__(self, pos, image, groups, z_layer=-1):
+class ChunkFloor(pygame.sprite.Sprite):
+    """
+    Floor of one chunk as a (3, CHUNK_SIZE, CHUNK_SIZE) array (base, decor shadow, decor) of indices into the
+    ChunkManager tile palette instead of a baked chunk-sized surface.
+    draw() blits only the tiles inside the view, layer by layer; on a GPU SpriteBatch the palette
+    sits in one cache page, so the whole floor becomes one instanced run.
+    """
+    render_static = True # Never moves (CameraGroup static layer)
+
+    def __init__(self, pos, tiles, palette, groups, z_layer=-1):
         super().__init__(groups)
-        self.image = image
-        self.rect = self.image.get_rect(topleft=pos)
+        self.tiles = tiles
+        self.palette = palette
+        size = tiles.shape[2] * TILE_SIZE, tiles.shape[1] * TILE_SIZE
+        self.image = pygame.Surface((0, 0))
+        self.rect = pygame.Rect(pos, size)
         self.z_layer = z_layer
 
+    def draw(self, surface, offset):
+        # Visible tile range of this chunk
+        left = self.rect.left - int(offset[0])
+        top = self.rect.top - int(offset[1])
+        width, height = surface.get_size()
+        rows, cols = self.tiles.shape[1:]
+        x0 = max(0, -left // TILE_SIZE)
+        y0 = max(0, -top // TILE_SIZE)
+        x1 = min(cols, (width - left) // TILE_SIZE + 1)
+        y1 = min(rows, (height - top) // TILE_SIZE + 1)
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        palette = self.palette
+        blits = []
+        for layer in self.tiles[:, y0:y1, x0:x1]:
+            ys, xs = np.nonzero(layer != EMPTY)
+            indices = layer[ys, xs].tolist()
+            xs = (xs * TILE_SIZE + (left + x0 * TILE_SIZE)).tolist()
+            ys = (ys * TILE_SIZE + (top + y0 * TILE_SIZE)).tolist()
+            blits += [(palette[i], (x, y)) for i, x, y in zip(indices, xs, ys)]
+        surface.fblits(blits)
+
+class ChunkCache:
+    """
+    LRU cache of unloaded chunks (their sprites and obstacle hitboxes), bounded by an estimated
+    byte budget, so walking back over a chunk border revives it instead of regenerating it.
+    """
+    SPRITE_BYTES = 720 # Measured average per sprite object (rects, dict, group bookkeeping); images are shared
+
+    def __init__(self, budget=CHUNK_CACHE_BUDGET):
+        self.budget = budget
+        self.entries = OrderedDict() # coord -> (sprites, hitboxes, nbytes), oldest first
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def put(self, coord, sprites, hitboxes):
+        nbytes = len(sprites) * self.SPRITE_BYTES + sum(s.tiles.nbytes for s in sprites if isinstance(s, ChunkFloor))
+        self.entries[coord] = (sprites, hitboxes, nbytes)
+        self.bytes += nbytes
+        while self.bytes > self.budget and self.entries:
+            _, (_, _, evicted) = self.entries.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+
+    def take(self, coord):
+        """Remove and return (sprites, hitboxes) of a cached chunk, or None."""
+        entry = self.entries.pop(coord, None)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.bytes -= entry[2]
+        return entry[0], entry[1]
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
 class ChunkManager:
-    def __init__(self, camera_group, obstacles_group=None):
+    """
+    Streams chunks around the player. Generation (floor indices, obstacle placement) is pure array
+    work and runs on a worker pool; results come back through a completion queue and the main thread
+    only creates their sprites, within budget ms per update (at least one chunk).
+    With workers=0 chunks are generated and built on the main thread within the same budget
+    (budget=0: exactly one per update, for deterministic headless runs).
+
+    Scheduling: the target set is only rebuilt when the player's chunk or predicted chunk changes.
+    Queued chunks sit in a set plus a heap ordered by distance to the position predicted from the
+    player's velocity, so chunks ahead of the movement (or dash) load first.
+    """
+
+    def __init__(self, camera_group, obstacles_group=None, workers=CHUNK_WORKERS, budget=CHUNK_BUILD_BUDGET):
         self.camera_group = camera_group
         self.obstacles_group = obstacles_group
         self.tile_size = TILE_SIZE
@@ -21,7 +119,28 @@ class ChunkManager:
         
         # Loaded chunks: {(cx, cy): [sprite1, sprite2, ...]}
         self.active_chunks = {}
-        self.load_queue = [] # Queue of chunk coords to load
+        self.chunk_hitboxes = {} # (cx, cy) -> obstacle hitboxes (kept for the cache)
+        self.cache = ChunkCache()
+        self.wanted = set() # Chunks in the load radius (around the player and the predicted position)
+        self.queued = set() # Chunks waiting to load
+        self._heap = [] # (priority, coord); entries no longer in queued are skipped
+        self._center = None # (player chunk, predicted chunk) the target set was built for
+        self._focus = (0.0, 0.0) # Predicted position in chunk units (priority origin)
+        self._last_pos = None
+        self.budget = budget # ms per update
+        # Time to visible: from entering the target set to being built
+        self._queued_at = {}
+        self.latencies = deque(maxlen=PROFILER_WINDOW)
+
+        # Worker pool: jobs put (epoch, coord, data) on _completed; reset() bumps the epoch so late results are dropped
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix='chunkgen') if workers else None
+        self.in_flight = set() # Coords submitted to the pool, result not built yet
+        self._completed = queue.SimpleQueue()
+        self._epoch = 0
+        
+        # Static collision index for trees/rocks (built per chunk on load, dropped on unload)
+        self.obstacle_index = ObstacleIndex(self.tile_size)
         
         # Load Tilesets (Auto-scaled to TILE_SIZE)
         self.grass_tiles = self._load_tiles("assets/tiles/grass.png")
@@ -35,6 +154,14 @@ class ChunkManager:
             self.grass_tiles = [pygame.Surface((self.tile_size, self.tile_size))]
             self.grass_tiles[0].fill((34, 139, 34))
 
+        # One palette for ChunkFloor indices: each tileset is a contiguous range {name: (start, count)}
+        self.palette = []
+        self.tilesets = {}
+        for name, tiles in (('grass', self.grass_tiles), ('flower', self.flower_tiles), ('paving', self.paving_tiles),
+                            ('rock', self.rock_tiles), ('rock_shadow', self.rock_shadows)):
+            self.tilesets[name] = (len(self.palette), len(tiles))
+            self.palette += tiles
+
     def _load_tiles(self, path):
         if not os.path.exists(path):
             print(f"Warning: Tileset not found at {path}")
@@ -49,146 +176,228 @@ class ChunkManager:
         cy = int(pos[1] // self.chunk_pixel_size)
         return cx, cy
 
+    @staticmethod
+    def is_forest(gx, gy):
+        """True if tile (gx, gy) lies in a dense forest macro region (BIOME_SCALE tiles per side)."""
+        return bool(worldgen.is_forest(gx, gy))
+
+    def tile_bounds(self):
+        """Tile-space (x, y, width, height) covering every loaded chunk, or None."""
+        if not self.active_chunks:
+            return None
+        xs = [c[0] for c in self.active_chunks]
+        ys = [c[1] for c in self.active_chunks]
+        return (min(xs) * self.chunk_size, min(ys) * self.chunk_size,
+                (max(xs) - min(xs) + 1) * self.chunk_size, (max(ys) - min(ys) + 1) * self.chunk_size)
+
+    @property
+    def worst_latency(self):
+        """Worst recent time to visible (seconds)."""
+        return max(self.latencies, default=0.0)
+
     def update(self, player_pos):
-        p_cx, p_cy = self.get_chunk_coord(player_pos)
-        
-        # Target coords in radius
+        x, y = player_pos
+        # Velocity per update; a jump of more than a chunk is a teleport/respawn, not movement
+        vx, vy = 0.0, 0.0
+        if self._last_pos is not None:
+            vx, vy = x - self._last_pos[0], y - self._last_pos[1]
+            if abs(vx) > self.chunk_pixel_size or abs(vy) > self.chunk_pixel_size:
+                vx, vy = 0.0, 0.0
+        self._last_pos = (x, y)
+
+        # Predicted position, at most one chunk ahead (one extra row/column of prefetch)
+        reach = self.chunk_pixel_size
+        ahead = (x + max(-reach, min(reach, vx * CHUNK_PREFETCH_STEPS)),
+                 y + max(-reach, min(reach, vy * CHUNK_PREFETCH_STEPS)))
+        self._focus = (ahead[0] / self.chunk_pixel_size, ahead[1] / self.chunk_pixel_size)
+
+        center = (self.get_chunk_coord(player_pos), self.get_chunk_coord(ahead))
+        if center != self._center:
+            self._center = center
+            self._retarget(center)
+        self._schedule()
+
+    def _retarget(self, center):
+        # Target coords in radius around the player and the predicted position
         target_chunks = set()
-        for dx in range(-LOAD_RADIUS, LOAD_RADIUS + 1):
-            for dy in range(-LOAD_RADIUS, LOAD_RADIUS + 1):
-                target_chunks.add((p_cx + dx, p_cy + dy))
+        for c_x, c_y in set(center):
+            for dx in range(-LOAD_RADIUS, LOAD_RADIUS + 1):
+                for dy in range(-LOAD_RADIUS, LOAD_RADIUS + 1):
+                    target_chunks.add((c_x + dx, c_y + dy))
+        self.wanted = target_chunks
         
         # Unload far chunks
         current_chunks = list(self.active_chunks.keys())
         for coord in current_chunks:
             if coord not in target_chunks:
                 self.unload_chunk(coord)
+        # Queued chunks that left the radius are not worth generating anymore
+        self.queued &= target_chunks
+        self._queued_at = {coord: t for coord, t in self._queued_at.items() if coord in target_chunks}
         
-        # Add chunks to queue if not loaded and not already in queue
+        # Add chunks to queue if not loaded, not already queued and not being generated
+        now = time.perf_counter()
         for coord in target_chunks:
-            if coord not in self.active_chunks and coord not in self.load_queue:
-                self.load_queue.append(coord)
+            if coord not in self.active_chunks and coord not in self.queued and coord not in self.in_flight:
+                # Recently unloaded: revive from the cache (no generation, no new sprites)
+                cached = self.cache.take(coord)
+                if cached is not None:
+                    self.revive_chunk(coord, *cached)
+                else:
+                    self.queued.add(coord)
+                    self._queued_at[coord] = now
         
-        # Sort queue by distance to player to prioritize nearest chunks
-        if self.load_queue:
-            self.load_queue.sort(key=lambda c: (c[0] - p_cx)**2 + (c[1] - p_cy)**2)
-            
-        # Process one chunk per frame to avoid stutter
-        if self.load_queue:
-            next_coord = self.load_queue.pop(0)
-            self.load_chunk(next_coord)
+        # Re-prioritize: nearest to the predicted position first
+        self._heap = [(self._priority(coord), coord) for coord in self.queued]
+        heapq.heapify(self._heap)
+
+    def _priority(self, coord):
+        fx, fy = self._focus
+        return (coord[0] + 0.5 - fx) ** 2 + (coord[1] + 0.5 - fy) ** 2
+
+    def _enqueue(self, coord):
+        self.queued.add(coord)
+        heapq.heappush(self._heap, (self._priority(coord), coord))
+
+    def _pop(self):
+        """Highest-priority queued coord, or None."""
+        while self._heap:
+            _, coord = heapq.heappop(self._heap)
+            if coord in self.queued:
+                self.queued.discard(coord)
+                return coord
+        return None
+
+    def _schedule(self):
+        deadline = time.perf_counter() + self.budget / 1000
+        if self._executor is None:
+            # Generate + build on this thread until the budget is spent (at least one chunk)
+            coord = self._pop()
+            while coord is not None:
+                self.load_chunk(coord)
+                if time.perf_counter() >= deadline:
+                    return
+                coord = self._pop()
+            return
+
+        # Few jobs in flight: queued chunks stay re-prioritizable when the player changes direction
+        while len(self.in_flight) < self.workers * 2:
+            coord = self._pop()
+            if coord is None:
+                break
+            self.in_flight.add(coord)
+            self._executor.submit(self._generate_job, self._epoch, coord)
+        self._build_completed(deadline)
+
+    def load_pending(self):
+        """Load every queued chunk right away (synchronous; preloading)."""
+        coord = self._pop()
+        while coord is not None:
+            self.load_chunk(coord)
+            coord = self._pop()
+
+    def _generate_job(self, epoch, coord):
+        # Worker thread: no pygame sprite/group access here
+        try:
+            data = self.generate_chunk(coord)
+        except Exception as e:
+            print(f"Error: Chunk {coord} generation failed: {e}")
+            data = None # Re-queued when the result is collected
+        self._completed.put((epoch, coord, data))
+
+    def _build_completed(self, deadline):
+        while True:
+            try:
+                epoch, coord, data = self._completed.get_nowait()
+            except queue.Empty:
+                return
+            if epoch != self._epoch:
+                continue
+            self.in_flight.discard(coord)
+            if coord not in self.wanted or coord in self.active_chunks:
+                continue
+            if data is None:
+                self._enqueue(coord)
+                continue
+            self.build_chunk(coord, data)
+            # At least one chunk per update; the rest wait for the next one
+            if time.perf_counter() >= deadline:
+                return
 
     def load_chunk(self, coord):
+        """Generate and build a chunk right away (synchronous path, preloading)."""
+        self.build_chunk(coord, self.generate_chunk(coord))
+
+    def generate_chunk(self, coord):
+        """Pure chunk data (floor tile indices, obstacle placements); safe to run on a worker thread."""
+        # Whole-chunk tile grid: generation is a handful of array ops (see worldgen)
+        gx, gy = worldgen.chunk_grid(coord[0], coord[1], self.chunk_size)
+        return worldgen.floor_layers(gx, gy, self.tilesets), worldgen.objects(gx, gy, self.tile_size)
+
+    def build_chunk(self, coord, data):
+        """Create the sprites of a generated chunk (main thread)."""
         cx, cy = coord
+        tiles, placements = data
         sprites = []
         
-        # 1. Baked Floor Rendering
-        # Create a single surface for the entire chunk's floor
-        baked_surface = pygame.Surface((self.chunk_pixel_size, self.chunk_pixel_size), pygame.SRCALPHA)
-        
-        for ty in range(self.chunk_size):
-            for tx in range(self.chunk_size):
-                gx = cx * self.chunk_size + tx
-                gy = cy * self.chunk_size + ty
-                # Optimized Integer RNG: (gx * 397) ^ (gy * 101) + chunk_seed
-                tile_seed = (gx * 397) ^ (gy * 101)
-                rng = random.Random(tile_seed)
-                
-                # Render logic (Draw directly to baked_surface)
-                base_image = rng.choice(self.grass_tiles)
-                decor_image = None
-                decor_shadow = None
-                
-                # Small Rocks
-                if self.rock_tiles and rng.random() < 0.03:
-                    rock_idx = rng.randint(0, len(self.rock_tiles) - 1)
-                    decor_image = self.rock_tiles[rock_idx]
-                    if self.rock_shadows and rock_idx < len(self.rock_shadows):
-                        decor_shadow = self.rock_shadows[rock_idx]
-                # Paving Stones
-                elif self.paving_tiles and rng.random() < 0.02:
-                    decor_image = rng.choice(self.paving_tiles)
-                # Flower Clustering
-                elif not decor_image:
-                    cluster_scale = 6
-                    patch_seed = ((gx//cluster_scale) * 733) ^ ((gy//cluster_scale) * 199)
-                    patch_rng = random.Random(patch_seed)
-                    if patch_rng.random() < 0.12 and self.flower_tiles:
-                        if rng.random() < 0.35:
-                            decor_image = rng.choice(self.flower_tiles)
-                
-                # Draw to baked surface
-                dest_pos = (tx * self.tile_size, ty * self.tile_size)
-                baked_surface.blit(base_image, dest_pos)
-                if decor_shadow:
-                    baked_surface.blit(decor_shadow, dest_pos)
-                if decor_image:
-                    baked_surface.blit(decor_image, dest_pos)
-
-        # Create ONE sprite for the whole floor chunk
+        # 1. Floor: tile indices only (base, shadow, decor), drawn by ChunkFloor
         world_x = cx * self.chunk_pixel_size
         world_y = cy * self.chunk_pixel_size
-        floor_sprite = Tile((world_x, world_y), baked_surface, [self.camera_group], z_layer=-1)
+        floor_sprite = ChunkFloor((world_x, world_y), tiles, self.palette, [self.camera_group])
         sprites.append(floor_sprite)
 
-        # 2. Entity Spawning (Separate from baked floor for depth sorting)
-        for ty in range(self.chunk_size):
-            for tx in range(self.chunk_size):
-                gx = cx * self.chunk_size + tx
-                gy = cy * self.chunk_size + ty
-                
-                # BIOME LOGIC: Check macro region for forest density
-                biome_scale = 32 # Macro-scale biomes
-                biome_seed = ((gx//biome_scale) * 104729) ^ ((gy//biome_scale) * 7919)
-                biome_rng = random.Random(biome_seed)
-                is_forest = biome_rng.random() < 0.35 
-                
-                # Local RNG for the specific tile/entity slot
-                ent_seed = (gx * 571) ^ (gy * 317)
-                rng = random.Random(ent_seed) 
-                rand_val = rng.random()
-                
-                # Jitter for organic placement (+/- 15px)
-                jitter_x = rng.randint(-15, 15)
-                jitter_y = rng.randint(-15, 15)
-                
-                # Determine Spawn Probabilities on 1x1 Grid
-                if is_forest:
-                    tree_target = 0.22 # Dense enough to cluster but not a solid wall
-                    rock_target = 0.25 # Total 3% rocks
-                else:
-                    tree_target = 0.012 # 1.2% sparse trees
-                    rock_target = 0.03 # 1.8% sparse rocks
-                
-                world_x = gx * self.tile_size + jitter_x
-                world_y = gy * self.tile_size + jitter_y
-                
-                # 1. Trees (Removed per User Request)
-                # if rand_val < tree_target:
-                #     from .entities.tree import Tree
-                #     v_rand = rng.random()
-                #     if v_rand < 0.4: variant = 'big'
-                #     elif v_rand < 0.7: variant = 'medium'
-                #     else: variant = 'small'
-                #     
-                #     sprites.append(Tree((world_x, world_y), [self.camera_group], self.obstacles_group, variant=variant))
-                
-                # 2. Big Rock (Obstacle) (Removed per User Request)
-                # if rand_val < rock_target: 
-                #     from .entities.rock import Rock
-                #     rock = Rock((world_x, world_y), [self.camera_group], self.obstacles_group)
-                #     sprites.append(rock)       
+        # 2. Entity Spawning (Separate from the floor for depth sorting)
+        from .entities.tree import Tree
+        from .entities.rock import Rock
+        hitboxes = []
+        for kind, variant, pos in placements:
+            if kind == 'tree':
+                obstacle = Tree(pos, [self.camera_group], None, variant=variant)
+            else:
+                obstacle = Rock(pos, [self.camera_group], None)
+            sprites.append(obstacle)
+            hitboxes.append(obstacle.hitbox)
+        
+        # Static obstacles go to the collision index instead of obstacles_group
+        self.obstacle_index.add_chunk(coord, hitboxes)
+        self.active_chunks[coord] = sprites
+        self.chunk_hitboxes[coord] = hitboxes
+        queued_at = self._queued_at.pop(coord, None)
+        if queued_at is not None:
+            self.latencies.append(time.perf_counter() - queued_at)
+
+    def revive_chunk(self, coord, sprites, hitboxes):
+        self.camera_group.add(sprites)
+        self.obstacle_index.add_chunk(coord, hitboxes)
         self.active_chunks[coord] = sprites
+        self.chunk_hitboxes[coord] = hitboxes
 
-    def unload_chunk(self, coord):
+    def unload_chunk(self, coord, keep=True):
         if coord in self.active_chunks:
-            for sprite in self.active_chunks[coord]:
+            sprites = self.active_chunks.pop(coord)
+            hitboxes = self.chunk_hitboxes.pop(coord)
+            for sprite in sprites:
                 sprite.kill()
-            del self.active_chunks[coord]
+            if keep:
+                self.cache.put(coord, sprites, hitboxes)
+        self.obstacle_index.remove_chunk(coord)
 
     def reset(self):
         """Clears all active chunks and kills their sprites for a fresh start."""
         coords = list(self.active_chunks.keys())
         for coord in coords:
-            self.unload_chunk(coord)
+            self.unload_chunk(coord, keep=False)
         self.active_chunks.clear()
+        self.chunk_hitboxes.clear()
+        self.cache.clear()
+        self.obstacle_index.clear()
+        self.wanted = set()
+        self.queued.clear()
+        self._heap.clear()
+        self._center = None
+        self._last_pos = None
+        self._queued_at.clear()
+        self.latencies.clear()
+        # Jobs still running belong to the old world
+        self.in_flight.clear()
+        self._epoch += 1
@@ -1,5 +1,6 @@
 import pygame
 import math
+import numpy as np
 
 class Minimap:
     def __init__(self, manager, player):
@@ -27,20 +28,15 @@ class Minimap:
         # Access enemy_sprites via the active scene (GameScene)
         # We assume manager.game.active_scene is GameScene or similar
         scene = self.manager.active_scene
-        if hasattr(scene, 'enemy_sprites'):
-            for enemy in scene.enemy_sprites:
-                # SAFEGUARD: Ignore VFX or non-entities that ended up here
-                if not hasattr(enemy, 'pos') or not hasattr(self.player, 'pos'):
-                    continue
-                    
-                # Relative pos
-                rel = (enemy.pos - self.player.pos) * self.scale
-                dist = rel.magnitude()
-                
-                if dist < self.radius - 4:
-                     # Draw red dot
-                     enemy_pos = (self.radius + rel.x, self.radius + rel.y)
-                     pygame.draw.circle(m_surf, (255, 50, 50), enemy_pos, 3)
+        horde = getattr(scene, 'horde', None)
+        if horde is not None and hasattr(self.player, 'pos'):
+            # Posisi relatif dihitung sekaligus dari array Horde
+            idx = np.flatnonzero(horde.alive)
+            rel = (horde.pos[idx] - (self.player.pos.x, self.player.pos.y)) * self.scale
+            inside = (rel ** 2).sum(axis=1) < (self.radius - 4) ** 2
+            for x, y in (rel[inside] + self.radius).tolist():
+                # Draw red dot
+                pygame.draw.circle(m_surf, (255, 50, 50), (x, y), 3)
 
         # 4. Chests (Interactables)
         if hasattr(scene, 'interactable_sprites'):
@@ -0,0 +1,95 @@
+import pygame
+from ..core import profiler
+from ..settings import PROFILER_WINDOW, SIM_RATE
+
+# Urutan tumpukan (bawah ke atas) dan warna scope profiler
+SCOPE_COLORS = {
+    'camera_update': (80, 160, 255),
+    'enemy_ai': (255, 90, 90),
+    'collision': (255, 170, 60),
+    'chunks': (120, 220, 120),
+    'network': (200, 120, 255),
+    'custom_draw': (60, 220, 220),
+    'draw_ui': (240, 240, 120),
+    'texture_upload': (255, 120, 200),
+    'sprite_batch': (255, 200, 150),
+    'shader': (170, 170, 255),
+    'present': (130, 130, 130),
+}
+OTHER_COLOR = (200, 200, 200)
+FRAME_COLOR = (60, 60, 70)
+
+class ProfilerGraph:
+    """
+    Grafik frame time bertumpuk dari window profiler.
+    Surface grafik digeser ke kiri dan hanya frame baru yang digambar sebagai kolom baru.
+    """
+
+    def __init__(self, height=100, column=2):
+        self.column = column
+        self.width = PROFILER_WINDOW * column
+        self.height = height
+        self.budget_ms = 1000 / SIM_RATE
+        self.scale = height / (self.budget_ms * 2) # Puncak grafik = dua kali budget frame
+        self.surface = pygame.Surface((self.width, height), pygame.SRCALPHA)
+        self.drawn = profiler.frame_count
+        self.font = pygame.font.SysFont("arial", 14)
+        self.legend = []
+        self.legend_age = 0
+
+    def _draw_column(self, x, frame):
+        self.surface.fill((0, 0, 0, 0), (x, 0, self.column, self.height))
+        total = frame.get('frame', 0.0)
+        pygame.draw.rect(self.surface, FRAME_COLOR, (x, self.height - total * self.scale, self.column, total * self.scale))
+
+        y = self.height
+        stack = [(frame[name], color) for name, color in SCOPE_COLORS.items() if frame.get(name)]
+        stack += [(ms, OTHER_COLOR) for name, ms in frame.items() if name not in SCOPE_COLORS and name != 'frame']
+        for ms, color in stack:
+            h = ms * self.scale
+            pygame.draw.rect(self.surface, color, (x, y - h, self.column, h))
+            y -= h
+
+    def _update_graph(self):
+        new = min(profiler.frame_count - self.drawn, len(profiler.history))
+        self.drawn = profiler.frame_count
+        if new <= 0:
+            return
+        self.surface.scroll(-new * self.column, 0)
+        frames = list(profiler.history)[-new:]
+        for n, frame in enumerate(frames):
+            self._draw_column(self.width - (new - n) * self.column, frame)
+
+    def _update_legend(self):
+        # Teks di-render ulang beberapa kali per detik, tidak setiap frame
+        self.legend_age -= 1
+        if self.legend_age > 0:
+            return
+        self.legend_age = 15
+        averages = profiler.averages()
+        names = [name for name in SCOPE_COLORS if name in averages]
+        names += sorted(name for name in averages if name not in SCOPE_COLORS and name != 'frame')
+        self.legend = [(SCOPE_COLORS.get(name, OTHER_COLOR), self.font.render(f"{name} {averages[name]:.2f}ms", True, (255, 255, 255)))
+                       for name in names]
+        if 'frame' in averages:
+            self.legend.append((FRAME_COLOR, self.font.render(f"frame {averages['frame']:.2f}ms", True, (255, 255, 255))))
+
+    def draw(self, surf, pos):
+        """Gambar grafik + legenda di pos. Mengembalikan tinggi yang terpakai."""
+        self._update_graph()
+        self._update_legend()
+        x, y = pos
+
+        pygame.draw.rect(surf, (0, 0, 0, 150), (x, y, self.width + 10, self.height + 10))
+        surf.blit(self.surface, (x + 5, y + 5))
+        # Garis budget (satu langkah simulasi)
+        budget_y = y + 5 + self.height - self.budget_ms * self.scale
+        pygame.draw.line(surf, (255, 255, 255), (x + 5, budget_y), (x + 5 + self.width, budget_y))
+
+        legend_y = y + self.height + 14
+        for color, text in self.legend:
+            pygame.draw.rect(surf, (0, 0, 0, 150), (x, legend_y, text.get_width() + 24, 16))
+            pygame.draw.rect(surf, color, (x + 4, legend_y + 4, 8, 8))
+            surf.blit(text, (x + 18, legend_y))
+            legend_y += 17
+        return legend_y - y
@@ -1,48 +1,210 @@
+import hashlib
+import json
+import os
+import struct
 import pygame
+from .settings import SPRITE_CACHE_DIR, ATLAS_DIR
 
 # Caching loaded sheets to prevent disk I/O lag on every spawn
 _SPRITE_CACHE = {}
 
-def load_sprite_sheet(path, frame_width, frame_height, scale=1, trim=False):
-    """
-    Load a sprite sheet and return a list of individual frame surfaces.
-    If trim is True, it crops empty space around the non-transparent pixels.
-    """
-    # Check Cache
-    cache_key = (path, frame_width, frame_height, scale, trim)
-    if cache_key in _SPRITE_CACHE:
-        return _SPRITE_CACHE[cache_key]
+# On-disk cache of processed (trimmed/scaled) frames: header, then (width, height) per frame,
+# then the raw RGBA bytes of every frame back to back
+_DISK_MAGIC = b'SPR1'
+_DISK_HEADER = struct.Struct('<4sI') # magic, frame count
+_DISK_FRAME = struct.Struct('<HH')
 
+def _disk_cache_path(path, frame_width, frame_height, scale, trim):
     try:
-        sheet = pygame.image.load(path).convert_alpha()
-    except FileNotFoundError:
-        print(f"Error: Could not load sprite sheet at {path}")
-        return []
+        stat = os.stat(path)
+    except OSError:
+        return None
+    # mtime/size in the key: editing the PNG invalidates the entry
+    key = f"{os.path.abspath(path)}|{frame_width}|{frame_height}|{scale}|{trim}|{stat.st_mtime_ns}|{stat.st_size}"
+    return os.path.join(SPRITE_CACHE_DIR, hashlib.sha1(key.encode()).hexdigest() + '.bin')
+
+def _read_disk_cache(cache_path):
+    try:
+        with open(cache_path, 'rb') as f:
+            data = memoryview(f.read())
+        magic, count = _DISK_HEADER.unpack_from(data)
+        if magic != _DISK_MAGIC:
+            return None
+        offset = _DISK_HEADER.size
+        sizes = []
+        for _ in range(count):
+            sizes.append(_DISK_FRAME.unpack_from(data, offset))
+            offset += _DISK_FRAME.size
 
+        convert = pygame.display.get_surface() is not None
+        frames = []
+        for size in sizes:
+            end = offset + size[0] * size[1] * 4
+            # frombuffer only references the bytes; convert/copy gives the frame its own pixels
+            frame = pygame.image.frombuffer(data[offset:end], size, 'RGBA')
+            frames.append(frame.convert_alpha() if convert else frame.copy())
+            offset = end
+        return frames
+    except (OSError, struct.error, ValueError):
+        return None # Missing or corrupt entry: decode the PNG again
+
+def _write_disk_cache(cache_path, frames):
+    parts = [_DISK_HEADER.pack(_DISK_MAGIC, len(frames))]
+    parts += [_DISK_FRAME.pack(*frame.get_size()) for frame in frames]
+    parts += [pygame.image.tobytes(frame, 'RGBA') for frame in frames]
+    try:
+        os.makedirs(SPRITE_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(b''.join(parts))
+        os.replace(tmp_path, cache_path) # Atomic: a reader never sees a half-written file
+    except OSError:
+        pass # Read-only install: just run without the disk cache
+
+def slice_sheet(sheet, frame_width, frame_height, scale=1, trim=False):
+    """
+    Cut a loaded sheet into frames (optionally trimmed and scaled).
+    Returns (frames, offsets); offsets are the scaled top-left of each trimmed frame inside its untrimmed cell.
+    """
     sheet_width, sheet_height = sheet.get_size()
     frames = []
+    offsets = []
 
     for y in range(0, sheet_height, frame_height):
         for x in range(0, sheet_width, frame_width):
             frame = pygame.Surface((frame_width, frame_height), pygame.SRCALPHA)
             frame.blit(sheet, (0, 0), (x, y, frame_width, frame_height))
-            
+            offset = (0, 0)
+
             if trim:
                 # Find the bounding box of the non-transparent pixels
                 rect = frame.get_bounding_rect()
                 if rect.width > 0 and rect.height > 0:
                     frame = frame.subsurface(rect).copy()
+                    offset = (int(rect.x * scale), int(rect.y * scale))
 
             if scale != 1:
                 frame = pygame.transform.scale(frame, (int(frame.get_width() * scale), int(frame.get_height() * scale)))
-            
+
             frames.append(frame)
-    
+            offsets.append(offset)
+
+    return frames, offsets
+
+def load_sprite_sheet(path, frame_width, frame_height, scale=1, trim=False):
+    """
+    Load a sprite sheet and return a list of individual frame surfaces.
+    If trim is True, it crops empty space around the non-transparent pixels.
+    """
+    # Check Cache
+    cache_key = (path, frame_width, frame_height, scale, trim)
+    if cache_key in _SPRITE_CACHE:
+        return _SPRITE_CACHE[cache_key]
+
+    cache_path = _disk_cache_path(path, frame_width, frame_height, scale, trim)
+    if cache_path:
+        frames = _read_disk_cache(cache_path)
+        if frames is not None:
+            _SPRITE_CACHE[cache_key] = frames
+            return frames
+
+    try:
+        sheet = pygame.image.load(path).convert_alpha()
+    except FileNotFoundError:
+        print(f"Error: Could not load sprite sheet at {path}")
+        return []
+
+    frames, _ = slice_sheet(sheet, frame_width, frame_height, scale, trim)
+
     # Store in Cache
     _SPRITE_CACHE[cache_key] = frames
+    if cache_path:
+        _write_disk_cache(cache_path, frames)
     
     return frames
 
+ATLAS_VERSION = 1
+
+def load_atlas(atlas_dir=ATLAS_DIR):
+    """
+    Register the frames of a packed atlas (built by tools/atlas_builder.py) in the sprite cache,
+    so load_sprite_sheet returns views into a few large pages instead of loading each sheet.
+    Sheets whose PNG changed since the build are skipped and load the normal way.
+    Returns the number of sheets registered.
+    """
+    try:
+        with open(os.path.join(atlas_dir, 'index.json')) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return 0
+    if index.get('version') != ATLAS_VERSION:
+        return 0
+
+    try:
+        # A page is a one-frame sheet, so it also goes through the on-disk cache (no PNG decode when warm)
+        pages = [load_sprite_sheet(os.path.join(atlas_dir, name), w, h) for name, (w, h) in zip(index['pages'], index['page_sizes'])]
+        if not all(pages):
+            print(f"Error: Atlas pages missing in {atlas_dir}, rebuild with tools/atlas_builder.py")
+            return 0
+        # Identical frames were stored once, so sheets sharing them share the same surface
+        frames = [pages[frame['page']][0].subsurface(frame['rect']) for frame in index['frames']]
+    except (KeyError, IndexError, TypeError, ValueError):
+        print(f"Error: Atlas index in {atlas_dir} is invalid, rebuild with tools/atlas_builder.py")
+        return 0
+
+    registered = 0
+    for sheet in index['sheets']:
+        try:
+            stat = os.stat(sheet['path'])
+        except OSError:
+            continue
+        if [stat.st_mtime_ns, stat.st_size] != sheet['source']:
+            continue
+        frame_width, frame_height = sheet['frame_size']
+        cache_key = (sheet['path'], frame_width, frame_height, sheet['scale'], sheet['trim'])
+        _SPRITE_CACHE[cache_key] = [frames[i] for i in sheet['frames']]
+        registered += 1
+    return registered
+
+# Animation variant bits, combined into an index into the list returned by animation_variants
+FLIPPED = 1 # Mirrored horizontally
+FADED = 2 # Translucent (hurt/flash blink)
+_VARIANT_CACHE = {}
+FLIP_SOURCES = {} # Mirrored frame -> the frame it was flipped from (lets the GPU sprite batch flip instead)
+
+def animation_variants(frames, flags=FLIPPED | FADED, faded_alpha=0):
+    """
+    Precompute variants of an animation clip once, so entities pick a variant by index
+    instead of flipping/copying/set_alpha-ing surfaces every frame.
+    Returns a list of 4 frame lists indexed by variant bits (0 = the original frames);
+    combinations using bits outside flags are None.
+    Faded variants are subsurfaces that share pixels with their source, so they cost no extra pixel memory.
+    """
+    cache_key = (id(frames), flags, faded_alpha)
+    if cache_key in _VARIANT_CACHE:
+        return _VARIANT_CACHE[cache_key]
+
+    variants = [None] * 4
+    variants[0] = frames
+    # Ascending order: every combination is derived from one already built (with one bit fewer)
+    for bits in range(1, 4):
+        if bits & ~flags:
+            continue
+        if bits & FADED:
+            faded = []
+            for frame in variants[bits & ~FADED]:
+                view = frame.subsurface(frame.get_rect())
+                view.set_alpha(faded_alpha)
+                faded.append(view)
+            variants[bits] = faded
+        else:
+            variants[bits] = [pygame.transform.flip(frame, True, False) for frame in frames]
+            for frame, mirrored in zip(frames, variants[bits]):
+                FLIP_SOURCES[mirrored] = frame
+
+    _VARIANT_CACHE[cache_key] = variants
+    return variants
+
 def debug_log(*args, **kwargs):
     """Prints to console only if game.debug_mode is global and enabled."""
     import __main__
@@ -1,4 +1,4 @@
-from .particles import GhostSprite, SmokeParticle, WalkParticle, HitSpark
+from .particles import HitSpark, ParticleSystem, active_particles
 from .combat import DeathEffect, SlashEffect
 # ExperienceGem moved to src.items
 from .magic import Fireball, FireBlast
@@ -1,43 +1,10 @@
 import pygame
 import math
-import random
-
-class AuraParticle(pygame.sprite.Sprite):
-    def __init__(self, pos, groups, aura_radius):
-        super().__init__(groups)
-        self.z_layer = 1
-        # Random position within radius
-        angle = random.uniform(0, 360)
-        dist = random.uniform(0, aura_radius)
-        pos_offset = pygame.math.Vector2()
-        pos_offset.from_polar((dist, angle))
-            
-        self.pos = pygame.math.Vector2(pos) + pos_offset
-        self.velocity = pygame.math.Vector2(random.uniform(-0.3, 0.3), -random.uniform(0.5, 1.2))
-        self.life = 1.0
-        self.decay = random.uniform(0.015, 0.03)
-        self.color = [255, 255, 180] # Pale Gold
-        
-        # Super small particles (1px radius = 2px size)
-        size = 1
-        self.image = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, (*self.color, 255), (size, size), size)
-        self.rect = self.image.get_rect(center=self.pos)
-
-    def update(self, dt):
-        self.life -= self.decay * dt * 60
-        if self.life <= 0:
-            self.kill()
-            return
-            
-        self.pos += self.velocity * dt * 60
-        self.rect.center = (round(self.pos.x), round(self.pos.y))
-        
-        # Fade out (Max alpha 180 for subtlety)
-        alpha = int(180 * self.life)
-        self.image.set_alpha(alpha)
+from .particles.system import active_particles
 
 class AuraSprite(pygame.sprite.Sprite):
+    dynamic_image = True # image is redrawn in place every frame (GPU batch re-uploads it)
+
     def __init__(self, groups, target, aura_radius, color=(255, 215, 0, 80)):
         self.z_layer = 0 # Draw below player
         super().__init__(groups)
@@ -108,7 +75,9 @@ class AuraSprite(pygame.sprite.Sprite):
         self.particle_timer += dt * 60
         if self.particle_timer > 15:
             self.particle_timer = 0
-            AuraParticle(self.rect.center, self.groups(), self.aura_radius * 0.7)
+            particles = active_particles()
+            if particles is not None:
+                particles.aura.spawn(self.rect.center, self.aura_radius * 0.7)
 
         # Composite Rendering
         center = self.surf_size // 2
@@ -2,12 +2,13 @@ import pygame
 import math
 import random
 from ..settings import *
+from ..core.pool import PooledSprite
 
-class DeathEffect(pygame.sprite.Sprite):
+class DeathEffect(PooledSprite):
     _CACHED_FRAMES = None
 
-    def __init__(self, pos, groups):
-        super().__init__(groups)
+    def reset(self, pos, groups):
+        self.add(groups)
         self.z_layer = 1
         
         if DeathEffect._CACHED_FRAMES is None:
@@ -2,13 +2,14 @@ import pygame
 import math
 import random
 from ..settings import *
-from .particles import SmokeParticle
+from ..core import sim_clock
 
 class Fireball(pygame.sprite.Sprite):
-    def __init__(self, pos, groups, direction_vec, player, obstacle_sprites, enemy_sprites, damage=None, speed=None):
+    def __init__(self, pos, groups, direction_vec, player, obstacle_sprites, enemy_sprites, damage=None, speed=None, obstacle_index=None):
         super().__init__(groups)
         self.player = player
         self.obstacle_sprites = obstacle_sprites
+        self.obstacle_index = obstacle_index
         self.enemy_sprites = enemy_sprites
         self.z_layer = 2
         
@@ -27,7 +28,7 @@ class Fireball(pygame.sprite.Sprite):
         self.light_radius = 0.08 # Barely visible glow (legacy)
         
         # Life safety
-        self.spawn_time = pygame.time.get_ticks()
+        self.spawn_time = sim_clock.get_ticks()
         self.lifetime = 2000 # 2 seconds max life
         
     def update(self, dt):
@@ -35,15 +36,17 @@ class Fireball(pygame.sprite.Sprite):
         self.rect.center = (round(self.pos.x), round(self.pos.y))
         
         # Kill if too old
-        if pygame.time.get_ticks() - self.spawn_time > self.lifetime:
+        if sim_clock.get_ticks() - self.spawn_time > self.lifetime:
             self.kill()
             return
 
-        # Custom collision check for obstacles (using hitboxes)
-        # Custom collision check for obstacles (using hitboxes)
-        # 1. Obstacles - OPTIMIZED
-        # Use spritecollide to get candidate obstacles (C-optimized AABB check)
-        # This prevents iterating 4000+ trees in Python
+        # 1. Obstacles
+        # Static trees/rocks: constant-time tile lookup in the chunk collision index
+        if self.obstacle_index is not None and self.obstacle_index.query(self.rect):
+            self.explode()
+            return
+
+        # Dynamic obstacles (chests): spritecollide broad phase, then hitbox check
         candidate_obstacles = pygame.sprite.spritecollide(self, self.obstacle_sprites, False)
         
         for obstacle in candidate_obstacles:
@@ -60,13 +63,13 @@ class Fireball(pygame.sprite.Sprite):
                 if enemy.hitbox.colliderect(self.rect):
                     enemy.health -= self.damage
                     enemy.is_hurting = True
-                    enemy.hurt_time = pygame.time.get_ticks()
+                    enemy.hurt_time = sim_clock.get_ticks()
                     kb_dir = (enemy.pos - self.pos).normalize() if (enemy.pos - self.pos).magnitude() > 0 else self.direction
                     enemy.knockback_vector = kb_dir * 40
                     
                     if hasattr(self.player, 'game'):
                         self.player.game.is_hit_stopped = True
-                        self.player.game.hit_stop_timer = pygame.time.get_ticks()
+                        self.player.game.hit_stop_timer = sim_clock.get_ticks()
                     
                     self.explode()
                     return
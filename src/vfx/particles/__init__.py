@@ -1,5 +1,3 @@
-from .ghost import GhostSprite
-from .smoke import SmokeParticle, WalkParticle
 from .spark import HitSpark
-from .loot import LootParticle
-from .slash_spark import SlashSpark
+from .emitter import ParticleEmitter
+from .system import ParticleSystem, active_particles
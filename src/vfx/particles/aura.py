@@ -0,0 +1,27 @@
+import pygame
+import numpy as np
+from .emitter import ParticleEmitter
+
+class AuraEmitter(ParticleEmitter):
+    """Tiny pale gold motes rising inside the aura (max alpha 180 for subtlety)."""
+
+    def __init__(self, groups):
+        super().__init__(groups, z_layer=1, max_alpha=180)
+        self.stamp_index('mote', self._bake)
+
+    @staticmethod
+    def _bake():
+        # Super small particles (1px radius = 2px size)
+        size = 1
+        surf = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
+        pygame.draw.circle(surf, (255, 255, 180, 255), (size, size), size) # Pale Gold
+        return surf
+
+    def spawn(self, pos, aura_radius, count=1):
+        # Random position within radius
+        angle = np.random.uniform(0, 2 * np.pi, count)
+        dist = np.random.uniform(0, aura_radius, count)
+        offset = np.column_stack((np.cos(angle), np.sin(angle))) * dist[:, None]
+        vel = np.column_stack((np.random.uniform(-0.3, 0.3, count), -np.random.uniform(0.5, 1.2, count)))
+        fade = np.random.uniform(0.015, 0.03, count) * 60
+        self.emit(np.asarray(pos, dtype=np.float64) + offset, vel, fade)
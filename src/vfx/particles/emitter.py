@@ -0,0 +1,121 @@
+import numpy as np
+import pygame
+
+class ParticleEmitter(pygame.sprite.Sprite):
+    """
+    Vectorized particle emitter: one sprite holding every particle of one kind in NumPy arrays
+    (position, velocity, life, fade rate, stamp index), updated in a single step per frame.
+
+    Particles are drawn as a batch (Surface.fblits) from pre-rendered stamps. Each stamp is baked
+    at alpha_levels transparency levels, so fading only picks a different surface instead of calling
+    set_alpha per particle. Life runs from 1 to 0; alpha is max_alpha * life (quantized).
+
+    CameraGroup culls/sorts the emitter by its rect (bounding box of live particles) and calls draw().
+    """
+
+    def __init__(self, groups, z_layer=0, max_alpha=255, alpha_levels=16, gravity=0.0, capacity=256):
+        super().__init__(groups)
+        self.z_layer = z_layer
+        self.max_alpha = max_alpha
+        self.alpha_levels = alpha_levels
+        self.gravity = gravity
+
+        self.stamps = [] # stamps[index][level] -> Surface
+        self.stamp_half = np.zeros((0, 2)) # Half size per stamp (particle position is the stamp center)
+        self._stamp_keys = {}
+
+        self.count = 0
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.life = np.zeros(capacity)
+        self.fade = np.zeros(capacity)
+        self.stamp = np.zeros(capacity, dtype=np.int64)
+
+        self.image = pygame.Surface((0, 0))
+        self.rect = pygame.Rect(0, 0, 0, 0)
+
+    def stamp_index(self, key, build):
+        """Index of the stamp registered under key, baking build() on first use."""
+        index = self._stamp_keys.get(key)
+        if index is None:
+            surface = build()
+            levels = []
+            for level in range(self.alpha_levels):
+                # Views share the stamp's pixels; only the surface alpha differs
+                baked = surface.subsurface(surface.get_rect())
+                baked.set_alpha(round(self.max_alpha * (level + 1) / self.alpha_levels))
+                levels.append(baked)
+            index = self._stamp_keys[key] = len(self.stamps)
+            self.stamps.append(levels)
+            self.stamp_half = np.vstack((self.stamp_half, np.array(surface.get_size(), dtype=np.float64) / 2))
+        return index
+
+    def clear_stamps(self):
+        self.stamps = []
+        self.stamp_half = np.zeros((0, 2))
+        self._stamp_keys.clear()
+        self.count = 0
+
+    def emit(self, pos, vel, fade, stamp=0):
+        """Add N particles. pos/vel: (N, 2) or (2,); fade: life lost per second; stamp: index per particle."""
+        pos = np.atleast_2d(np.asarray(pos, dtype=np.float64))
+        n = len(pos)
+        if not n:
+            return
+        if self.count + n > len(self.life):
+            self._grow(self.count + n)
+        end = self.count + n
+        self.pos[self.count:end] = pos
+        self.vel[self.count:end] = vel
+        self.life[self.count:end] = 1.0
+        self.fade[self.count:end] = fade
+        self.stamp[self.count:end] = stamp
+        self.count = end
+
+    def _grow(self, needed):
+        capacity = max(needed, len(self.life) * 2)
+        for name in ('pos', 'vel', 'life', 'fade', 'stamp'):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def update(self, dt):
+        n = self.count
+        if not n:
+            self.rect.size = (0, 0)
+            return
+
+        step = dt * 60
+        vel = self.vel[:n]
+        if self.gravity:
+            vel[:, 1] += self.gravity * step
+        self.pos[:n] += vel * step
+        self.life[:n] -= self.fade[:n] * dt
+
+        # Compact: drop dead particles, keep order
+        alive = self.life[:n] > 0
+        if not alive.all():
+            keep = np.flatnonzero(alive)
+            n = self.count = len(keep)
+            for array in (self.pos, self.vel, self.life, self.fade, self.stamp):
+                array[:n] = array[keep]
+            if not n:
+                self.rect.size = (0, 0)
+                return
+
+        # Bounding box for camera culling/sorting
+        half = self.stamp_half[self.stamp[:n]]
+        low = (self.pos[:n] - half).min(axis=0)
+        high = (self.pos[:n] + half).max(axis=0)
+        self.rect.update(int(low[0]), int(low[1]), int(high[0] - low[0]) + 1, int(high[1] - low[1]) + 1)
+
+    def draw(self, surface, offset):
+        n = self.count
+        if not n:
+            return
+        level = np.minimum((self.life[:n] * self.alpha_levels).astype(np.int64), self.alpha_levels - 1)
+        stamp = self.stamp[:n]
+        topleft = np.rint(self.pos[:n] - self.stamp_half[stamp] - (offset[0], offset[1])).astype(np.int64)
+        stamps = self.stamps
+        surface.fblits([(stamps[s][l], (x, y)) for s, l, (x, y) in zip(stamp.tolist(), level.tolist(), topleft.tolist())])
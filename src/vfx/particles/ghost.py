@@ -1,17 +1,19 @@
-import pygame
+from .emitter import ParticleEmitter
 
-class GhostSprite(pygame.sprite.Sprite):
-    def __init__(self, pos, image, groups):
-        super().__init__(groups)
-        self.image = image.copy()
-        self.rect = self.image.get_rect(topleft=pos)
-        self.alpha = 200
-        self.decay_rate = 300 
-        self.z_layer = 1
-        
-    def update(self, dt):
-        self.alpha -= self.decay_rate * dt
-        if self.alpha <= 0:
-            self.kill()
-        else:
-            self.image.set_alpha(int(self.alpha))
+class GhostTrail(ParticleEmitter):
+    """
+    Dash afterimages. Each ghost is a stamp of the sprite frame it copies; frames are baked
+    lazily (8 alpha levels) and shared by every ghost of that frame.
+    """
+    MAX_STAMPS = 64
+
+    def __init__(self, groups):
+        super().__init__(groups, z_layer=1, max_alpha=200, alpha_levels=8)
+
+    def spawn(self, topleft, image):
+        # New frames (e.g. a new Player instance) keep arriving: drop the cache once nothing references it
+        if len(self.stamps) >= self.MAX_STAMPS and not self.count:
+            self.clear_stamps()
+        stamp = self.stamp_index(image, image.copy)
+        w, h = image.get_size()
+        self.emit((topleft[0] + w / 2, topleft[1] + h / 2), (0, 0), 300 / 200, stamp)
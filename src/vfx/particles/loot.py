@@ -1,33 +1,26 @@
 import pygame
-import random
+import numpy as np
+from .emitter import ParticleEmitter
 
-class LootParticle(pygame.sprite.Sprite):
-    def __init__(self, pos, groups):
-        super().__init__(groups)
-        self.z_layer = 4 # Above most things
-        
-        size = random.randint(4, 7)
-        self.image = pygame.Surface((size, size))
-        # Gold/Yellow variations
-        c = random.randint(200, 255)
-        self.image.fill((c, 215, 0))
-        
-        self.rect = self.image.get_rect(center=pos)
-        self.pos = pygame.math.Vector2(self.rect.center)
-        
+class LootEmitter(ParticleEmitter):
+    """Gold flakes bursting upwards (chest loot), pulled down by gravity."""
+    SIZES = range(4, 8)
+    SHADES = (200, 211, 222, 233, 244, 255) # Gold/Yellow variations
+
+    def __init__(self, groups):
+        super().__init__(groups, z_layer=4, gravity=0.1) # Above most things
+        for size in self.SIZES:
+            for c in self.SHADES:
+                self.stamp_index((size, c), lambda size=size, c=c: self._bake(size, c))
+
+    @staticmethod
+    def _bake(size, c):
+        surf = pygame.Surface((size, size))
+        surf.fill((c, 215, 0))
+        return surf
+
+    def spawn(self, pos, count=1):
         # Burst upwards
-        self.velocity = pygame.math.Vector2(random.uniform(-2, 2), random.uniform(-4, -1))
-        self.alpha = 255
-        self.fade_speed = random.uniform(200, 400)
-        self.gravity = 0.1
-        
-    def update(self, dt):
-        self.velocity.y += self.gravity * dt * 60
-        self.pos += self.velocity * dt * 60
-        self.rect.center = (round(self.pos.x), round(self.pos.y))
-        
-        self.alpha -= self.fade_speed * dt
-        if self.alpha <= 0:
-            self.kill()
-        else:
-            self.image.set_alpha(int(self.alpha))
+        vel = np.column_stack((np.random.uniform(-2, 2, count), np.random.uniform(-4, -1, count)))
+        fade = np.random.uniform(200, 400, count) / 255
+        self.emit(np.tile(pos, (count, 1)), vel, fade, np.random.randint(0, len(self.stamps), count))
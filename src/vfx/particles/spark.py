@@ -1,10 +1,11 @@
 import pygame
+from ...core.pool import PooledSprite
 
-class HitSpark(pygame.sprite.Sprite):
+class HitSpark(PooledSprite):
     _CACHED_FRAMES = None
 
-    def __init__(self, pos, groups):
-        super().__init__(groups)
+    def reset(self, pos, groups):
+        self.add(groups)
         self.z_layer = 3 
         
         if HitSpark._CACHED_FRAMES is None:
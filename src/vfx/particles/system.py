@@ -0,0 +1,29 @@
+from .aura import AuraEmitter
+from .smoke import SmokeEmitter, WalkEmitter
+from .loot import LootEmitter
+from .slash_spark import SlashSparkEmitter
+from .ghost import GhostTrail
+
+class ParticleSystem:
+    """Satu emitter per jenis partikel, masing-masing satu sprite di groups (camera_group) scene."""
+
+    def __init__(self, groups):
+        self.aura = AuraEmitter(groups)
+        self.smoke = SmokeEmitter(groups)
+        self.walk = WalkEmitter(groups)
+        self.loot = LootEmitter(groups)
+        self.slash_spark = SlashSparkEmitter(groups)
+        self.ghost = GhostTrail(groups)
+
+    def __iter__(self):
+        return iter((self.aura, self.smoke, self.walk, self.loot, self.slash_spark, self.ghost))
+
+    @property
+    def count(self):
+        return sum(emitter.count for emitter in self)
+
+def active_particles():
+    """ParticleSystem milik scene aktif (None di luar GameScene)."""
+    import __main__
+    game = getattr(__main__, 'game', None)
+    return getattr(getattr(game, 'active_scene', None), 'particles', None)
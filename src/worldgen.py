@@ -0,0 +1,130 @@
+"""
+Deterministic world generation over whole chunk grids with NumPy.
+
+Every decision is a pure function of the world tile coordinate (an integer hash, one salt per
+decision), so a chunk looks the same no matter when, where or in which order it is generated.
+"""
+import numpy as np
+from .settings import CHUNK_SIZE, BIOME_SCALE
+
+EMPTY = -1 # No tile in this floor layer
+
+# One independent hash stream per decision
+SALT_BASE = 1
+SALT_ROCK = 2
+SALT_ROCK_KIND = 3
+SALT_PAVING = 4
+SALT_PAVING_KIND = 5
+SALT_PATCH = 6
+SALT_FLOWER = 7
+SALT_FLOWER_KIND = 8
+SALT_BIOME = 9
+SALT_OBJECT = 10
+SALT_VARIANT = 11
+SALT_JITTER_X = 12
+SALT_JITTER_Y = 13
+
+FLOWER_PATCH = 6 # Tiles per side of a flower patch cell
+SPAWN_CLEAR = 2 # Tiles around the origin kept free of trees/rocks
+JITTER = 15 # Max object offset from its tile corner (px)
+TREE_VARIANTS = ('big', 'medium', 'small')
+TREE_VARIANT_ODDS = (0.4, 0.7) # Cumulative: big < 0.4 <= medium < 0.7 <= small
+
+def chunk_grid(cx, cy, size=CHUNK_SIZE):
+    """World tile coordinates (gx, gy) of a chunk, as broadcastable (1, size) and (size, 1) arrays."""
+    gx = np.arange(cx * size, (cx + 1) * size, dtype=np.int64)[None, :]
+    gy = np.arange(cy * size, (cy + 1) * size, dtype=np.int64)[:, None]
+    return gx, gy
+
+def hash2(gx, gy, salt):
+    """
+    uint32 hash of integer tile coordinates (scalars or arrays, broadcast).
+    salt may be a sequence: all streams are hashed in one pass and stacked on a leading axis.
+    """
+    shape = np.broadcast(gx, gy).shape
+    # At least 1-d: NumPy only wraps uint32 overflow silently on arrays
+    x = np.atleast_1d(np.asarray(gx, dtype=np.int64)).astype(np.uint32)
+    y = np.atleast_1d(np.asarray(gy, dtype=np.int64)).astype(np.uint32)
+    key = x * np.uint32(0x8DA6B343) ^ y * np.uint32(0xD8163841)
+    salts = (np.atleast_1d(np.asarray(salt, dtype=np.uint64)) * 0x9E3779B9 & 0xFFFFFFFF).astype(np.uint32)
+    h = key[None] ^ salts.reshape((-1,) + (1,) * key.ndim)
+    # murmur3 finalizer: every input bit affects every output bit
+    h ^= h >> np.uint32(16)
+    h *= np.uint32(0x85EBCA6B)
+    h ^= h >> np.uint32(13)
+    h *= np.uint32(0xC2B2AE35)
+    h ^= h >> np.uint32(16)
+    return h.reshape(shape) if np.ndim(salt) == 0 else h.reshape((len(salts),) + shape)
+
+def to_unit(h):
+    """Hash -> float in [0, 1)."""
+    return h * (1.0 / 2 ** 32)
+
+def to_index(h, count):
+    """Hash -> index in [0, count)."""
+    return (h % np.uint32(max(count, 1))).astype(np.int64)
+
+def is_forest(gx, gy):
+    """True where tile (gx, gy) lies in a dense forest macro region (BIOME_SCALE tiles per side)."""
+    return to_unit(hash2(np.floor_divide(gx, BIOME_SCALE), np.floor_divide(gy, BIOME_SCALE), SALT_BIOME)) < 0.35
+
+def floor_layers(gx, gy, tilesets):
+    """
+    Floor tile indices for a grid of tiles: int16 array (3, rows, cols) of base, decor shadow, decor.
+    tilesets: {name: (palette start, count)} for 'grass', 'flower', 'paving', 'rock', 'rock_shadow'.
+    """
+    grass_start, grass_count = tilesets['grass']
+    flower_start, flower_count = tilesets['flower']
+    paving_start, paving_count = tilesets['paving']
+    rock_start, rock_count = tilesets['rock']
+    shadow_start, shadow_count = tilesets['rock_shadow']
+
+    base_h, rock_h, rock_kind_h, paving_h, paving_kind_h, flower_h, flower_kind_h = hash2(
+        gx, gy, (SALT_BASE, SALT_ROCK, SALT_ROCK_KIND, SALT_PAVING, SALT_PAVING_KIND, SALT_FLOWER, SALT_FLOWER_KIND))
+    tiles = np.full((3,) + base_h.shape, EMPTY, dtype=np.int16)
+    base, shadow, decor = tiles
+    base[...] = grass_start + to_index(base_h, grass_count)
+
+    # Small Rocks (3%), else Paving Stones (2%), else flowers inside flower patches
+    rock = (to_unit(rock_h) < 0.03) & (rock_count > 0)
+    paving = ~rock & (to_unit(paving_h) < 0.02) & (paving_count > 0)
+    patch = to_unit(hash2(np.floor_divide(gx, FLOWER_PATCH), np.floor_divide(gy, FLOWER_PATCH), SALT_PATCH)) < 0.12
+    flower = ~rock & ~paving & patch & (to_unit(flower_h) < 0.35) & (flower_count > 0)
+
+    rock_kind = to_index(rock_kind_h, rock_count)
+    decor[rock] = (rock_start + rock_kind)[rock]
+    decor[paving] = (paving_start + to_index(paving_kind_h, paving_count))[paving]
+    decor[flower] = (flower_start + to_index(flower_kind_h, flower_count))[flower]
+    shadowed = rock & (rock_kind < shadow_count)
+    shadow[shadowed] = (shadow_start + rock_kind)[shadowed]
+    return tiles
+
+def objects(gx, gy, tile_size):
+    """
+    Trees and big rocks for a grid of tiles, in row-major tile order.
+    Returns a list of ('tree', variant, (x, y)) / ('rock', None, (x, y)) with world pixel positions.
+    """
+    roll_h, variant_h, jitter_x_h, jitter_y_h = hash2(gx, gy, (SALT_OBJECT, SALT_VARIANT, SALT_JITTER_X, SALT_JITTER_Y))
+    forest = is_forest(gx, gy)
+    roll = to_unit(roll_h)
+    # Forest: dense enough to cluster but not a solid wall; elsewhere sparse trees/rocks
+    tree = roll < np.where(forest, 0.22, 0.012)
+    rock = ~tree & (roll < np.where(forest, 0.25, 0.03))
+    # Keep the spawn point clear so the player never starts inside a tree
+    clear = (np.abs(gx) <= SPAWN_CLEAR) & (np.abs(gy) <= SPAWN_CLEAR)
+    tree &= ~clear
+    rock &= ~clear
+
+    x = gx * tile_size + to_index(jitter_x_h, 2 * JITTER + 1) - JITTER
+    y = gy * tile_size + to_index(jitter_y_h, 2 * JITTER + 1) - JITTER
+    variant = np.searchsorted(TREE_VARIANT_ODDS, to_unit(variant_h), side='right')
+
+    rows, cols = np.nonzero(tree | rock)
+    placed = []
+    for is_tree, variant_index, px, py in zip(tree[rows, cols].tolist(), variant[rows, cols].tolist(),
+                                              x[rows, cols].tolist(), y[rows, cols].tolist()):
+        if is_tree:
+            placed.append(('tree', TREE_VARIANTS[variant_index], (px, py)))
+        else:
+            placed.append(('rock', None, (px, py)))
+    return placed
@@ -0,0 +1,161 @@
+"""
+Bangun atlas tekstur: semua frame sprite (karakter, musuh, tile, peti, ikon upgrade) yang sudah
+di-trim & di-scale dipak ke beberapa halaman besar + index.json.
+
+    python tools/atlas_builder.py                 # tulis ke ATLAS_DIR (assets/atlas)
+    python tools/atlas_builder.py --page-size 4096
+
+Daftar sheet diambil dari loader game sendiri (boot headless, semua karakter & tipe musuh),
+jadi parameter frame/scale/trim selalu sama dengan yang dipakai runtime. Frame yang identik per byte
+disimpan sekali. Saat start, utils.load_atlas() mendaftarkan frame atlas ke cache sprite;
+sheet yang PNG-nya berubah sejak build dimuat dengan cara biasa. Output tidak di-commit.
+
+Format index.json:
+    pages:  nama file halaman (PNG), page_sizes: [w, h] per halaman
+    frames: {page, rect [x, y, w, h] px, uv [u0, v0, u1, v1]}
+    sheets: {path, frame_size, scale, trim, source [mtime_ns, size], frames [id frame], pivots [[x, y]]}
+            pivot = pusat sel asli (sebelum trim) relatif ke pojok kiri atas frame, dalam px.
+"""
+import os
+import sys
+import json
+import hashlib
+import argparse
+
+# Root workspace di python path agar bisa import src
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+DEFAULT_ROOTS = ['assets/Characters', 'assets/tiles', 'assets/Animated Chests', 'assets/Upgrades']
+PADDING = 2 # Jarak antar frame (cegah bleeding saat sampling tekstur)
+
+def collect_sheets():
+    """Jalankan loader aset game secara headless, kembalikan key load_sprite_sheet yang terpakai."""
+    import pygame
+    from src.main import GameManager
+    from src.settings import CHARACTER_DATA, ENEMY_DATA
+    from src.entities.horde import EnemyType
+    from src.entities.remote_player import RemotePlayer
+    from src.entities.interactables.chest import Chest
+    from src.scenes.char_select import CharacterSelectionScene
+    from src import utils
+
+    game = GameManager(headless=True)
+    # Kosongkan sheet dari atlas lama agar hanya yang benar-benar dimuat game yang ikut
+    utils._SPRITE_CACHE.clear()
+    CharacterSelectionScene(game) # Pratinjau karakter
+    for char_type in CHARACTER_DATA:
+        game.selected_character = char_type
+        game.start_headless() # Player, tile chunk, pohon
+        RemotePlayer('atlas', [], char_type)
+    for type_id, key in enumerate(ENEMY_DATA):
+        EnemyType(type_id, key)
+    Chest((0, 0), [pygame.sprite.Group()])
+    return list(utils._SPRITE_CACHE)
+
+def under_roots(path, roots):
+    path = os.path.normpath(path)
+    return any(os.path.commonpath([path, os.path.normpath(root)]) == os.path.normpath(root) for root in roots)
+
+def pack(sizes, page_size):
+    """Shelf packing (frame tertinggi dulu). sizes: [(w, h)] -> [(page, x, y)] urut sesuai input."""
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    placements = [None] * len(sizes)
+    page, x, y, shelf_h = 0, 0, 0, 0
+    for i in order:
+        w, h = sizes[i]
+        if w + PADDING > page_size or h + PADDING > page_size:
+            raise ValueError(f"Frame {w}x{h} lebih besar dari halaman atlas {page_size}px")
+        if x + w + PADDING > page_size: # Rak baru
+            x, y, shelf_h = 0, y + shelf_h, 0
+        if y + h + PADDING > page_size: # Halaman baru
+            page, x, y, shelf_h = page + 1, 0, 0, 0
+        placements[i] = (page, x, y)
+        x += w + PADDING
+        shelf_h = max(shelf_h, h + PADDING)
+    return placements
+
+def build(out_dir, roots, page_size):
+    import pygame
+    from src.utils import slice_sheet, ATLAS_VERSION
+
+    keys = [key for key in collect_sheets() if under_roots(key[0], roots)]
+
+    unique = [] # Surface frame unik
+    by_hash = {}
+    sheets = []
+    for path, frame_width, frame_height, scale, trim in keys:
+        sheet = pygame.image.load(path).convert_alpha()
+        frames, offsets = slice_sheet(sheet, frame_width, frame_height, scale, trim)
+        ids = []
+        pivots = []
+        for frame, (ox, oy) in zip(frames, offsets):
+            digest = hashlib.sha1(pygame.image.tobytes(frame, 'RGBA') + bytes(str(frame.get_size()), 'ascii')).digest()
+            if digest not in by_hash:
+                by_hash[digest] = len(unique)
+                unique.append(frame)
+            ids.append(by_hash[digest])
+            pivots.append([frame_width * scale / 2 - ox, frame_height * scale / 2 - oy])
+        stat = os.stat(path)
+        sheets.append({
+            'path': path,
+            'frame_size': [frame_width, frame_height],
+            'scale': scale,
+            'trim': trim,
+            'source': [stat.st_mtime_ns, stat.st_size],
+            'frames': ids,
+            'pivots': pivots,
+        })
+
+    placements = pack([frame.get_size() for frame in unique], page_size)
+    page_count = max((page for page, _, _ in placements), default=-1) + 1
+    # Halaman dipotong ke area terpakai (halaman terakhir biasanya jauh dari penuh: decode lebih cepat)
+    extents = [[0, 0] for _ in range(page_count)]
+    for frame, (page, x, y) in zip(unique, placements):
+        w, h = frame.get_size()
+        extents[page][0] = max(extents[page][0], x + w)
+        extents[page][1] = max(extents[page][1], y + h)
+    pages = [pygame.Surface(size, pygame.SRCALPHA) for size in extents]
+    index_frames = []
+    for frame, (page, x, y) in zip(unique, placements):
+        pages[page].blit(frame, (x, y))
+        w, h = frame.get_size()
+        page_w, page_h = extents[page]
+        index_frames.append({
+            'page': page,
+            'rect': [x, y, w, h],
+            'uv': [x / page_w, y / page_h, (x + w) / page_w, (y + h) / page_h],
+        })
+
+    os.makedirs(out_dir, exist_ok=True)
+    page_names = []
+    for n, surface in enumerate(pages):
+        name = f"page{n}.png"
+        pygame.image.save(surface, os.path.join(out_dir, name))
+        page_names.append(name)
+    with open(os.path.join(out_dir, 'index.json'), 'w') as f:
+        json.dump({'version': ATLAS_VERSION, 'pages': page_names, 'page_sizes': extents,
+                   'frames': index_frames, 'sheets': sheets}, f)
+
+    total = sum(len(sheet['frames']) for sheet in sheets)
+    print(f"[ATLAS] {len(sheets)} sheet, {total} frame ({len(unique)} unik) -> {page_count} halaman di {out_dir}")
+    missing = [root for root in roots if not os.path.isdir(root)]
+    if missing:
+        print(f"[ATLAS] Folder tidak ada (dilewati): {', '.join(missing)}")
+
+def main():
+    from src.settings import ATLAS_DIR, ATLAS_PAGE_SIZE
+
+    parser = argparse.ArgumentParser(description="Bangun atlas tekstur sprite.")
+    parser.add_argument('--out', default=ATLAS_DIR, help="Folder output (relatif ke root)")
+    parser.add_argument('--page-size', type=int, default=ATLAS_PAGE_SIZE)
+    parser.add_argument('--roots', nargs='*', default=DEFAULT_ROOTS, help="Folder aset yang dipak")
+    args = parser.parse_args()
+
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    os.chdir(ROOT) # Path aset relatif terhadap root
+    build(args.out, args.roots, args.page_size)
+
+if __name__ == "__main__":
+    main()